@@ -0,0 +1,100 @@
+"""
+Benchmark américaines et barrières : temps pour atteindre une précision fixée.
+
+- EDP put américain : Brennan–Schwartz vs SOR projeté, grille raffinée
+  jusqu'à |erreur| < tol (référence binomiale CRR à 4000 pas) ;
+- Longstaff–Schwartz (50 dates) : M nécessaire pour un IC 95% < tol_mc ;
+- call down-and-out : EDP sur grille [B, Smax] vs Monte Carlo avec correction
+  de pont brownien, erreur vs formule fermée.
+
+    python benchmarks/bench_american.py [tol]
+"""
+import pathlib
+import sys
+import time
+
+import numpy as np
+from scipy.stats import norm
+
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parents[1] / "src"))
+
+from models.gbm import GBM  # noqa: E402
+from pricing.black_scholes import bs_call  # noqa: E402
+from pricing.monte_carlo import lsm_price_american, mc_price_barrier  # noqa: E402
+from pricing.pde_solver import crank_nicolson_bs  # noqa: E402
+
+S0, K, T, r, sigma = 100.0, 100.0, 1.0, 0.05, 0.2
+
+
+def _binomial_put(n=4000):
+    dt = T / n
+    u = np.exp(sigma * np.sqrt(dt))
+    p = (np.exp(r * dt) - 1 / u) / (u - 1 / u)
+    S = S0 * u ** np.arange(n, -n - 1, -2)
+    V = np.maximum(K - S, 0.0)
+    for _ in range(n):
+        S = S[:-1] / u
+        V = np.maximum(np.exp(-r * dt) * (p * V[:-1] + (1 - p) * V[1:]), K - S)
+    return V[0]
+
+
+def _timed(func):
+    t0 = time.perf_counter()
+    out = func()
+    return out, time.perf_counter() - t0
+
+
+def pde_american(tol):
+    ref = _binomial_put()
+    print(f"put américain, référence binomiale {ref:.5f}, tolérance {tol:g}")
+    for method in ("brennan_schwartz", "psor"):
+        for M_S in (50, 100, 200, 400, 800):
+            (S, V), dt = _timed(lambda: crank_nicolson_bs(4 * K, K, T, r, sigma, M_S=M_S, M_T=M_S,
+                                                          option="put", american=True, early_exercise=method))
+            err = abs(np.interp(S0, S, V) - ref)
+            if err < tol:
+                break
+        print(f"  EDP {method:<17} M_S=M_T={M_S:<4} err={err:.1e}  {dt * 1e3:9.1f} ms")
+
+
+def lsm(tol_mc):
+    model = GBM(r, sigma, S0)
+    M = 10_000
+    while True:
+        (price, ci), dt = _timed(lambda: lsm_price_american(model, K, T, r, M, n_exercise=50, random_state=1))
+        if ci < tol_mc or M >= 1_600_000:
+            break
+        M *= 4
+    print(f"  LSM 50 dates M={M:<9,} prix={price:.4f} ± {ci:.4f}  {dt * 1e3:9.1f} ms")
+
+
+def barrier(tol, B=90.0, sig=0.25):
+    lam = (r + 0.5 * sig ** 2) / sig ** 2
+    y = np.log(B ** 2 / (S0 * K)) / (sig * np.sqrt(T)) + lam * sig * np.sqrt(T)
+    ref = bs_call(S0, K, T, r, sig) - (S0 * (B / S0) ** (2 * lam) * norm.cdf(y)
+                                        - K * np.exp(-r * T) * (B / S0) ** (2 * lam - 2)
+                                        * norm.cdf(y - sig * np.sqrt(T)))
+    print(f"\ncall down-and-out B={B}, formule fermée {ref:.5f}")
+    for M_S in (50, 100, 200, 400, 800):
+        (S, V), dt = _timed(lambda: crank_nicolson_bs(4 * K, K, T, r, sig, M_S=M_S, M_T=M_S, option="call",
+                                                      barrier=B, barrier_type="down-and-out"))
+        err = abs(np.interp(S0, S, V) - ref)
+        if err < tol:
+            break
+    print(f"  EDP barrière  M_S=M_T={M_S:<4} err={err:.1e}  {dt * 1e3:9.1f} ms")
+    model = GBM(r, sig, S0)
+    for correction in (True, False):
+        (price, ci), dt = _timed(lambda: mc_price_barrier(model, K, B, T, r, 200_000, N=50, random_state=1,
+                                                          bridge_correction=correction))
+        label = "MC pont brownien" if correction else "MC discret"
+        print(f"  {label:<17} N=50 M=200,000 biais={price - ref:+.4f} ± {ci:.4f}  {dt * 1e3:9.1f} ms")
+
+
+def main(tol=1e-3):
+    pde_american(tol)
+    lsm(2e-2)
+    barrier(tol)
+
+
+if __name__ == "__main__":
+    main(float(sys.argv[1]) if len(sys.argv) > 1 else 1e-3)
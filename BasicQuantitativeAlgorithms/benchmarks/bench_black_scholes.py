@@ -0,0 +1,68 @@
+"""
+Benchmark : valorisation d'une chaîne d'options, boucle scalaire vs passe vectorisée.
+
+    python benchmarks/bench_black_scholes.py [n_contrats]
+"""
+import pathlib
+import sys
+import math
+import time
+
+import numpy as np
+
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parents[1] / "src"))
+
+from pricing.black_scholes import bs_call  # noqa: E402
+from pricing.greeks import bs_greeks, greeks_fd  # noqa: E402
+
+
+def _bs_call_scalar(S0, K, T, r, sigma):
+    # implémentation scalaire d'origine (math.erf), référence de comparaison
+    N = lambda x: 0.5 * (1.0 + math.erf(x / math.sqrt(2.0)))  # noqa: E731
+    if T <= 0 or sigma <= 0:
+        return max(0.0, S0 - K)
+    d1 = (math.log(S0 / K) + (r + 0.5 * sigma * sigma) * T) / (sigma * math.sqrt(T))
+    d2 = d1 - sigma * math.sqrt(T)
+    return S0 * N(d1) - K * math.exp(-r * T) * N(d2)
+
+
+def _chain(n, seed=0):
+    rng = np.random.default_rng(seed)
+    K = rng.uniform(50.0, 150.0, n)
+    T = rng.uniform(0.05, 2.0, n)
+    sigma = rng.uniform(0.1, 0.5, n)
+    return K, T, sigma
+
+
+def main(n=100_000):
+    S0, r = 100.0, 0.02
+    K, T, sigma = _chain(n)
+    n_loop = min(n, 20_000)
+
+    t0 = time.perf_counter()
+    for k, t, s in zip(K[:n_loop], T[:n_loop], sigma[:n_loop]):
+        _bs_call_scalar(S0, float(k), float(t), r, float(s))
+    loop_rate = n_loop / (time.perf_counter() - t0)
+
+    t0 = time.perf_counter()
+    bs_call(S0, K, T, r, sigma)
+    vec_rate = n / (time.perf_counter() - t0)
+
+    n_fd = min(n, 5_000)
+    t0 = time.perf_counter()
+    for k, t, s in zip(K[:n_fd], T[:n_fd], sigma[:n_fd]):
+        greeks_fd(S0, float(k), float(t), r, float(s))
+    fd_rate = n_fd / (time.perf_counter() - t0)
+
+    t0 = time.perf_counter()
+    bs_greeks(S0, K, T, r, sigma)
+    greeks_rate = n / (time.perf_counter() - t0)
+
+    print(f"bs_call  boucle scalaire : {loop_rate:14,.0f} contrats/s")
+    print(f"bs_call  vectorisé       : {vec_rate:14,.0f} contrats/s  (x{vec_rate / loop_rate:.0f})")
+    print(f"greeks_fd boucle         : {fd_rate:14,.0f} contrats/s")
+    print(f"bs_greeks vectorisé      : {greeks_rate:14,.0f} contrats/s  (x{greeks_rate / fd_rate:.0f})")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
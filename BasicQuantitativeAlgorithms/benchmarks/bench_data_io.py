@@ -0,0 +1,74 @@
+"""
+Benchmark accès disque par blocs : temps et pic mémoire (tracemalloc) des
+estimateurs en mémoire (np.load puis gbm_mle_from_prices, var_cvar_from_prices)
+vs en flux (stream_gbm_mle, stream_var_cvar) quand l'historique grandit, et
+simulate vs simulate_to_file.
+
+    python benchmarks/bench_data_io.py [n_max]
+"""
+import pathlib
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parents[1] / "src"))
+
+from calibration.likelihood import gbm_mle_from_prices  # noqa: E402
+from data_io import append_prices, simulate_to_file, stream_gbm_mle, stream_var_cvar  # noqa: E402
+from models.gbm import GBM  # noqa: E402
+from risk.var import var_cvar_from_prices  # noqa: E402
+
+
+def _measure(func):
+    tracemalloc.start()
+    t0 = time.perf_counter()
+    try:
+        func()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return time.perf_counter() - t0, peak / 2 ** 20
+
+
+def _write_history(path, n, block=1_000_000):
+    rng = np.random.default_rng(0)
+    last = 0.0
+    for i in range(0, n, block):
+        lr = 1e-4 * rng.standard_normal(min(block, n - i))
+        log_p = last + np.cumsum(lr)
+        last = log_p[-1]
+        append_prices(path, 100.0 * np.exp(log_p))
+
+
+def main(n_max=16_000_000):
+    with tempfile.TemporaryDirectory() as tmp:
+        n = 1_000_000
+        while n <= n_max:
+            path = pathlib.Path(tmp) / f"hist_{n}.bin"
+            _write_history(path, n)
+            cases = [
+                ("en mémoire", lambda: (gbm_mle_from_prices(np.fromfile(path), 1e-4),
+                                        var_cvar_from_prices(np.fromfile(path), 1, 0.99))),
+                ("en flux", lambda: (stream_gbm_mle(path, 1e-4), stream_var_cvar(path, 1, 0.99))),
+            ]
+            for label, func in cases:
+                dt, peak = _measure(func)
+                print(f"n={n:>11,}  {label:<11} {dt * 1e3:9.1f} ms  pic={peak:8.1f} Mo")
+            path.unlink()
+            n *= 4
+
+        print("\nsimulation GBM, N = 252 :")
+        model = GBM(0.05, 0.2, 100.0)
+        for M in (20_000, 80_000):
+            dt, peak = _measure(lambda: model.simulate(1.0, 252, M, random_state=1))
+            print(f"M={M:>7,}  simulate          {dt * 1e3:9.1f} ms  pic={peak:8.1f} Mo")
+            dt, peak = _measure(lambda: simulate_to_file(model, pathlib.Path(tmp) / "paths.npy", 1.0, 252, M,
+                                                         chunk_size=10_000, random_state=1))
+            print(f"M={M:>7,}  simulate_to_file  {dt * 1e3:9.1f} ms  pic={peak:8.1f} Mo")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 16_000_000)
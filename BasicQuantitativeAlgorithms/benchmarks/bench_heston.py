@@ -0,0 +1,60 @@
+"""
+Benchmark Heston : boucle Python d'origine (Euler, temporaires à chaque pas)
+vs moteur par blocs en place (euler / log_euler / qe), en trajectoires·pas par seconde.
+
+    python benchmarks/bench_heston.py [M]
+"""
+import pathlib
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parents[1] / "src"))
+
+from models.heston import Heston  # noqa: E402
+
+PARAMS = dict(kappa=1.5, theta=0.04, xi=0.9, rho=-0.7, v0=0.04, S0=100.0)
+REF_ATM_CALL = 5.98671   # T = 1, r = 0, K = 100
+
+
+def _heston_loop(kappa, theta, xi, rho, v0, S0, T, N, M, random_state=None):
+    # implémentation d'origine (matrices S et v complètes, temporaires à chaque pas)
+    rng = np.random.default_rng(random_state)
+    dt = T / N
+    S = np.empty((M, N + 1))
+    v = np.empty((M, N + 1))
+    S[:, 0], v[:, 0] = S0, v0
+    for k in range(N):
+        Z1 = rng.normal(0.0, 1.0, size=M)
+        Z2 = rng.normal(0.0, 1.0, size=M)
+        dW1 = np.sqrt(dt) * Z1
+        dW2 = np.sqrt(dt) * (rho * Z1 + np.sqrt(max(1.0 - rho ** 2, 0.0)) * Z2)
+        v_prev = np.maximum(v[:, k], 0.0)
+        v[:, k + 1] = np.maximum(v_prev + kappa * (theta - v_prev) * dt + xi * np.sqrt(v_prev) * dW2, 0.0)
+        S[:, k + 1] = S[:, k] + np.sqrt(v_prev) * S[:, k] * dW1
+    return S
+
+
+def main(M=100_000, N=252):
+    t0 = time.perf_counter()
+    _heston_loop(**PARAMS, T=1.0, N=N, M=M, random_state=0)
+    base = M * N / (time.perf_counter() - t0)
+    label = "boucle d'origine"
+    print(f"{label:<22} {base:14,.0f} traj·pas/s")
+    for scheme in ("euler", "log_euler", "qe"):
+        model = Heston(**PARAMS, scheme=scheme)
+        t0 = time.perf_counter()
+        model.simulate(T=1.0, N=N, M=M, random_state=0)
+        rate = M * N / (time.perf_counter() - t0)
+        print(f"{'simulate ' + scheme:<22} {rate:14,.0f} traj·pas/s  (x{rate / base:.2f})")
+
+    print("\nErreur de prix ATM à pas larges (M = 200 000) :")
+    for scheme, n_steps in (("euler", 252), ("log_euler", 52), ("qe", 4), ("qe", 12)):
+        ST = Heston(**PARAMS, scheme=scheme).simulate_terminal(T=1.0, N=n_steps, M=200_000, random_state=1)
+        price = np.maximum(ST - 100.0, 0.0).mean()
+        print(f"  {scheme:<10} N={n_steps:<4} prix={price:8.4f}  erreur={price - REF_ATM_CALL:+.4f}")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
@@ -0,0 +1,62 @@
+"""
+Benchmark : Crank–Nicolson factorisé (tridiagonal, O(M_S·M_T)) vs résolution
+dense à chaque pas (O(M_S³·M_T)), en fonction de M_S et M_T.
+
+    python benchmarks/bench_pde.py
+"""
+import pathlib
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parents[1] / "src"))
+
+from pricing.black_scholes import bs_call  # noqa: E402
+from pricing.pde_solver import crank_nicolson_bs  # noqa: E402
+
+
+def _crank_nicolson_dense(Smax, K, T, r, sigma, M_S=200, M_T=200):
+    # implémentation d'origine (matrice dense reconstruite et résolue à chaque pas), call
+    dt = T / M_T
+    S = np.linspace(0.0, Smax, M_S + 1)
+    V = np.maximum(S - K, 0.0)
+    i = np.arange(1, M_S)
+    alpha = 0.25 * dt * (sigma**2 * i**2 - r * i)
+    beta = -0.5 * dt * (sigma**2 * i**2 + r)
+    gamma = 0.25 * dt * (sigma**2 * i**2 + r * i)
+    for n in range(M_T, 0, -1):
+        t = (n - 1) * dt
+        rhs = (1.0 + beta) * V[1:-1] + alpha * V[0:-2] + gamma * V[2:]
+        Vmax = Smax - K * np.exp(-r * (T - t))
+        rhs[-1] += gamma[-1] * Vmax
+        A = np.zeros((M_S - 1, M_S - 1))
+        np.fill_diagonal(A, 1.0 - beta)
+        np.fill_diagonal(A[1:], -alpha[1:])
+        np.fill_diagonal(A[:, 1:], -gamma[:-1])
+        V[1:-1] = np.linalg.solve(A, rhs)
+        V[0], V[-1] = 0.0, Vmax
+    return S, V
+
+
+def _time(fun, *args, **kw):
+    t0 = time.perf_counter()
+    out = fun(*args, **kw)
+    return time.perf_counter() - t0, out
+
+
+def main():
+    S0, K, T, r, sigma = 100.0, 100.0, 1.0, 0.02, 0.2
+    ref = bs_call(S0, K, T, r, sigma)
+    print(f"{'M_S':>6} {'M_T':>6} {'dense (s)':>10} {'tridiag (s)':>12} {'erreur prix':>12}")
+    for M_S, M_T in [(200, 200), (400, 400), (800, 800), (1600, 1600), (5000, 5000)]:
+        dense = "-"
+        if M_S <= 800:
+            dense = f"{_time(_crank_nicolson_dense, 4 * S0, K, T, r, sigma, M_S, M_T)[0]:10.3f}"
+        elapsed, (S, V) = _time(crank_nicolson_bs, 4 * S0, K, T, r, sigma, M_S, M_T)
+        err = abs(np.interp(S0, S, V) - ref)
+        print(f"{M_S:>6} {M_T:>6} {dense:>10} {elapsed:12.3f} {err:12.2e}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+"""
+Benchmark simulate_gbm : boucle Euler d'origine vs schémas vectorisés
+(exact / euler / milstein, float64 et float32), en trajectoires·pas par seconde.
+
+    python benchmarks/bench_simulation.py [M]
+"""
+import pathlib
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parents[1]))
+
+from src.simulation import simulate_gbm  # noqa: E402
+
+PARAMS = dict(mu=0.05, sigma=0.2, S0=100.0, T=1.0)
+
+
+def _euler_loop(mu, sigma, S0, T, N, M, random_state=None):
+    # implémentation d'origine (une opération numpy par pas)
+    dt = T / N
+    rng = np.random.default_rng(random_state)
+    S = np.empty((M, N + 1))
+    S[:, 0] = S0
+    for k in range(N):
+        dW = rng.normal(0.0, np.sqrt(dt), size=M)
+        S[:, k + 1] = S[:, k] + mu * S[:, k] * dt + sigma * S[:, k] * dW
+    return S
+
+
+def main(M=100_000, N=252):
+    t0 = time.perf_counter()
+    ref = _euler_loop(**PARAMS, N=N, M=M, random_state=0)
+    base = M * N / (time.perf_counter() - t0)
+    label = "boucle euler"
+    print(f"{label:<22} {base:14,.0f} traj·pas/s")
+    for method in ("exact", "euler", "milstein"):
+        for dtype in (np.float64, np.float32):
+            t0 = time.perf_counter()
+            _, S = simulate_gbm(**PARAMS, N=N, M=M, method=method, random_state=0, dtype=dtype)
+            rate = M * N / (time.perf_counter() - t0)
+            name = f"{method} {np.dtype(dtype).name}"
+            print(f"{name:<22} {rate:14,.0f} traj·pas/s  (x{rate / base:.2f}, {S.nbytes / 2**20:,.0f} Mo)")
+    _, S = simulate_gbm(**PARAMS, N=N, M=M, method="euler", random_state=0)
+    print(f"\nécart max euler vectorisé / boucle : {np.max(np.abs(S - ref) / ref):.2e} (relatif)")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
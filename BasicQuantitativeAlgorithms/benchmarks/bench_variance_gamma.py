@@ -0,0 +1,58 @@
+"""
+Benchmark Variance Gamma : boucle Python d'origine (un tirage gamma + normal
+par pas) vs simulation en bloc (cumsum) pour les deux échantillonneurs, et
+tirage terminal exact vs somme des N pas, en trajectoires·pas par seconde.
+
+    python benchmarks/bench_variance_gamma.py [M]
+"""
+import pathlib
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parents[1] / "src"))
+
+from models.variance_gamma import VarianceGamma  # noqa: E402
+
+PARAMS = dict(theta=-0.14, sigma=0.12, nu=0.2, S0=100.0)
+
+
+def _vg_loop(theta, sigma, nu, S0, T, N, M, random_state=None):
+    # implémentation d'origine (colonne par colonne)
+    rng = np.random.default_rng(random_state)
+    dt = T / N
+    X = np.zeros((M, N + 1))
+    for k in range(N):
+        dG = rng.gamma(shape=dt / nu, scale=nu, size=M)
+        dW = rng.normal(0.0, 1.0, size=M)
+        X[:, k + 1] = X[:, k] + theta * dG + sigma * np.sqrt(dG) * dW
+    return S0 * np.exp(X)
+
+
+def main(M=100_000, N=252):
+    t0 = time.perf_counter()
+    _vg_loop(**PARAMS, T=1.0, N=N, M=M, random_state=0)
+    base = M * N / (time.perf_counter() - t0)
+    label = "boucle d'origine"
+    print(f"{label:<22} {base:14,.0f} traj·pas/s")
+    model = VarianceGamma(**PARAMS)
+    for sampler in ("gamma", "dog"):
+        t0 = time.perf_counter()
+        model.simulate(T=1.0, N=N, M=M, random_state=0, sampler=sampler)
+        rate = M * N / (time.perf_counter() - t0)
+        print(f"{'simulate ' + sampler:<22} {rate:14,.0f} traj·pas/s  (x{rate / base:.2f})")
+
+    print(f"\nS_T seul (M = {M:,}) :")
+    t0 = time.perf_counter()
+    _vg_loop(**PARAMS, T=1.0, N=N, M=M, random_state=0)
+    t_loop = time.perf_counter() - t0
+    for sampler in ("gamma", "dog"):
+        t0 = time.perf_counter()
+        model.simulate_terminal(T=1.0, N=N, M=M, random_state=0, sampler=sampler)
+        t_exact = time.perf_counter() - t0
+        print(f"  terminal exact {sampler:<6} {t_exact * 1e3:8.1f} ms  (x{t_loop / t_exact:.0f} vs {N} pas en boucle)")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
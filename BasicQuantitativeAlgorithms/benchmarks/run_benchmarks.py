@@ -0,0 +1,202 @@
+"""
+Suite de benchmarks : débit, percentiles de latence et pic mémoire pour les
+modèles, pricers et calibrateurs, à plusieurs tailles de problème.
+
+    python benchmarks/run_benchmarks.py                       # tailles small, medium
+    python benchmarks/run_benchmarks.py --sizes small medium large --repeat 7
+    python benchmarks/run_benchmarks.py --output results.json --save-baseline baseline.json
+    python benchmarks/run_benchmarks.py --baseline baseline.json --threshold 0.25
+    python benchmarks/run_benchmarks.py --filter heston
+
+Chaque cas est exécuté une fois à blanc, puis 'repeat' fois (latences p50 /
+p90 / max, débit = unités de travail / latence médiane), puis une dernière
+fois sous tracemalloc (pic mémoire Python + numpy). Avec --baseline, un cas
+dont la latence médiane dépasse celle de la référence de plus de 'threshold'
+(relatif) est signalé comme régression et le code de sortie vaut 1.
+"""
+import argparse
+import json
+import pathlib
+import platform
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timezone
+
+import numpy as np
+
+ROOT = pathlib.Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "src"))
+
+from functools import partial  # noqa: E402
+
+from calibration.likelihood import gbm_mle_from_prices, negative_log_likelihood  # noqa: E402
+from calibration.moments import calibrate_heston_moments  # noqa: E402
+from calibration.optimization import calibrate_model, implied_vol  # noqa: E402
+from calibration.surface import calibrate_heston_surface, heston_surface_prices  # noqa: E402
+from models.gbm import GBM  # noqa: E402
+from models.heston import Heston  # noqa: E402
+from models.variance_gamma import VarianceGamma  # noqa: E402
+from pricing.black_scholes import bs_call  # noqa: E402
+from pricing.fourier import cos_price  # noqa: E402
+from pricing.greeks import bs_greeks, greeks_fd  # noqa: E402
+from pricing.monte_carlo import mc_price_european  # noqa: E402
+from pricing.pde_solver import crank_nicolson_bs  # noqa: E402
+
+# facteur d'échelle des tailles de problème
+SIZES = {"small": 0.1, "medium": 1.0, "large": 4.0}
+HESTON = dict(kappa=1.5, theta=0.04, xi=0.5, rho=-0.7, v0=0.04)
+
+
+def _cases(scale: float):
+    """Liste de (nom, paramètres, unités de travail, libellé d'unité, fonction)."""
+    M = max(1000, int(100_000 * scale))
+    N = 252
+    n_opt = max(100, int(100_000 * scale))
+    rng = np.random.default_rng(0)
+    K = rng.uniform(60.0, 140.0, n_opt)
+    T = rng.uniform(0.1, 2.0, n_opt)
+    gbm = GBM(0.02, 0.2, 100.0)
+    heston = Heston(**HESTON, S0=100.0, mu=0.02, scheme="qe")
+    vg = VarianceGamma(theta=-0.14, sigma=0.12, nu=0.2, S0=100.0, mu=0.02)
+    M_paths = max(100, M // 10)
+    prices = bs_call(100.0, K, T, 0.02, 0.25)
+
+    K_s = np.tile(np.linspace(80.0, 120.0, 9), 4)
+    T_s = np.repeat([0.25, 0.5, 1.0, 2.0], 9)
+    quotes, _ = heston_surface_prices(np.array([2.0, 0.05, 0.6, -0.6, 0.03]), 100.0, K_s, T_s, 0.02)
+    _, S_hist = GBM(0.05, 0.2, 100.0).simulate(1.0, max(250, int(5000 * scale)), 1, random_state=1)
+    hist = S_hist[0]
+    n_ret = max(500, int(20_000 * scale))
+    log_ret = 0.01 * rng.standard_normal(n_ret)
+    M_S = max(100, int(400 * scale ** 0.5))
+    n_series = max(50, int(2000 * scale))
+    panel = np.exp(np.cumsum(0.01 * rng.standard_normal((n_series, 500)), axis=1))
+    panel[::3, 250:] = np.nan                      # séries de longueurs différentes
+    panel_ret = np.diff(np.log(panel), axis=1)
+    panel_obj = partial(negative_log_likelihood, log_returns=panel_ret, jac=True)
+    theta_panel = np.tile([0.0, 0.02], (n_series, 1))
+
+    return [
+        ("gbm.simulate", f"M={M_paths} N={N}", M_paths * N, "traj·pas",
+         lambda: gbm.simulate(1.0, N, M_paths, random_state=1)),
+        ("heston.simulate", f"M={M_paths} N={N} qe", M_paths * N, "traj·pas",
+         lambda: heston.simulate(1.0, N, M_paths, random_state=1)),
+        ("vg.simulate", f"M={M_paths} N={N}", M_paths * N, "traj·pas",
+         lambda: vg.simulate(1.0, N, M_paths, random_state=1)),
+        ("mc_price_european.gbm", f"M={M}", M, "traj",
+         lambda: mc_price_european(gbm, 100.0, 1.0, 0.02, M, random_state=1, control_variate=True)),
+        ("mc_price_european.heston", f"M={M // 4} N=50 qe", M // 4 * 50, "traj·pas",
+         lambda: mc_price_european(heston, 100.0, 1.0, 0.02, M // 4, N=50, random_state=1)),
+        ("crank_nicolson_bs", f"M_S={M_S} M_T={M_S}", M_S * M_S, "nœuds",
+         lambda: crank_nicolson_bs(400.0, 100.0, 1.0, 0.02, 0.25, M_S=M_S, M_T=M_S)),
+        ("bs_call", f"n={n_opt}", n_opt, "options",
+         lambda: bs_call(100.0, K, T, 0.02, 0.25)),
+        ("bs_greeks", f"n={n_opt}", n_opt, "options",
+         lambda: bs_greeks(100.0, K, T, 0.02, 0.25)),
+        ("greeks_fd", f"n={n_opt}", n_opt, "options",
+         lambda: greeks_fd(100.0, K, T, 0.02, 0.25)),
+        ("implied_vol", f"n={n_opt}", n_opt, "options",
+         lambda: implied_vol(prices, 100.0, K, T, 0.02)),
+        ("cos_price.heston", f"n={n_opt}", n_opt, "options",
+         lambda: cos_price(heston, K, 1.0, 0.02)),
+        ("calibrate_heston_surface", "36 cotations", 36, "cotations",
+         lambda: calibrate_heston_surface(100.0, K_s, T_s, 0.02, quotes)),
+        ("calibrate_heston_moments", f"n={n_ret}", n_ret, "rendements",
+         lambda: calibrate_heston_moments(log_ret, [2.0, 0.04, 0.5, -0.5, 0.04])),
+        ("gbm_mle_from_prices", f"n={hist.size}", hist.size, "prix",
+         lambda: gbm_mle_from_prices(hist, 1.0 / 252)),
+        ("gbm_mle_from_prices.panel", f"{n_series} séries", n_series, "séries",
+         lambda: gbm_mle_from_prices(panel, 1.0 / 252, return_se=True)),
+        ("calibrate_model.batch", f"{n_series} séries", n_series, "séries",
+         lambda: calibrate_model(panel_obj, theta_panel, jac=True, batch=True,
+                                 bounds=[(None, None), (1e-6, None)])),
+    ]
+
+
+def measure(func, repeat: int):
+    """Latences (s) sur 'repeat' exécutions après une exécution à blanc, et pic mémoire (octets)."""
+    func()
+    latencies = np.empty(repeat)
+    for i in range(repeat):
+        t0 = time.perf_counter()
+        func()
+        latencies[i] = time.perf_counter() - t0
+    tracemalloc.start()
+    try:
+        func()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return latencies, peak
+
+
+def run(sizes, repeat: int = 5, pattern: str | None = None):
+    results = []
+    for size in sizes:
+        for name, params, units, unit_label, func in _cases(SIZES[size]):
+            if pattern and pattern not in name:
+                continue
+            with np.errstate(all="ignore"):
+                lat, peak = measure(func, repeat)
+            p50, p90 = np.percentile(lat, [50, 90])
+            res = {"name": name, "size": size, "params": params,
+                   "p50_s": float(p50), "p90_s": float(p90), "max_s": float(lat.max()),
+                   "throughput": float(units / p50), "unit": unit_label + "/s",
+                   "peak_mem_mb": peak / 2 ** 20}
+            results.append(res)
+            print(f"{name:<26} {size:<7} {params:<22} p50={p50 * 1e3:9.2f} ms  p90={p90 * 1e3:9.2f} ms  "
+                  f"{res['throughput']:14,.0f} {res['unit']:<14} pic={res['peak_mem_mb']:8.1f} Mo")
+    return results
+
+
+def compare(results, baseline, threshold: float):
+    """Cas dont la latence médiane dépasse la référence de plus de 'threshold' (relatif)."""
+    ref = {(r["name"], r["size"]): r for r in baseline["results"]}
+    regressions = []
+    for r in results:
+        b = ref.get((r["name"], r["size"]))
+        if b is None:
+            continue
+        ratio = r["p50_s"] / b["p50_s"]
+        if ratio > 1.0 + threshold:
+            regressions.append({"name": r["name"], "size": r["size"], "ratio": ratio,
+                                "p50_s": r["p50_s"], "baseline_p50_s": b["p50_s"]})
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--sizes", nargs="+", default=["small", "medium"], choices=list(SIZES))
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--filter", default=None, help="sous-chaîne du nom des cas à exécuter")
+    parser.add_argument("--output", type=pathlib.Path, default=None, help="résultats JSON")
+    parser.add_argument("--baseline", type=pathlib.Path, default=None, help="référence JSON à comparer")
+    parser.add_argument("--save-baseline", type=pathlib.Path, default=None)
+    parser.add_argument("--threshold", type=float, default=0.2)
+    args = parser.parse_args(argv)
+
+    results = run(args.sizes, repeat=args.repeat, pattern=args.filter)
+    payload = {"timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+               "python": platform.python_version(), "numpy": np.__version__,
+               "machine": platform.platform(), "repeat": args.repeat, "results": results}
+    for path in (args.output, args.save_baseline):
+        if path is not None:
+            path.write_text(json.dumps(payload, indent=2))
+
+    if args.baseline is None:
+        return 0
+    regressions = compare(results, json.loads(args.baseline.read_text()), args.threshold)
+    payload["regressions"] = regressions
+    if args.output is not None:
+        args.output.write_text(json.dumps(payload, indent=2))
+    for r in regressions:
+        print(f"RÉGRESSION {r['name']} [{r['size']}] : x{r['ratio']:.2f} "
+              f"({r['baseline_p50_s'] * 1e3:.2f} -> {r['p50_s'] * 1e3:.2f} ms)")
+    if not regressions:
+        print(f"aucune régression (seuil {args.threshold:.0%})")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
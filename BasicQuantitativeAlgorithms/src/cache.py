@@ -0,0 +1,185 @@
+"""
+Cache optionnel des pricers et des fonctions objectif de calibration.
+
+- memoize : décorateur LRU dont la clé est construite sur les arguments
+  arrondis (floats, tableaux numpy), les paramètres des modèles et la graine ;
+- PDEGridCache : une grille Crank–Nicolson résolue une fois répond à toute
+  requête de spot à l'intérieur de la grille (prix, Delta, Gamma interpolés).
+
+Les résultats mis en cache sont partagés : ne pas modifier en place un
+tableau renvoyé par une fonction mémoïsée.
+"""
+import inspect
+from collections import OrderedDict
+from functools import wraps
+
+import numpy as np
+
+from pricing.pde_solver import crank_nicolson_bs_batch, _quadratic_weights
+
+_MISSING = object()
+
+
+class Uncacheable(TypeError):
+    """Argument sans clé de cache stable (générateur aléatoire, objet opaque…)."""
+
+
+class LRUCache:
+    """Dictionnaire borné à maxsize entrées, éviction du moins récemment utilisé."""
+
+    def __init__(self, maxsize: int = 1024):
+        self.maxsize = int(maxsize)
+        self._data = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.bypass = 0
+
+    def get(self, key, default=_MISSING):
+        if key in self._data:
+            self._data.move_to_end(key)
+            self.hits += 1
+            return self._data[key]
+        self.misses += 1
+        return default
+
+    def put(self, key, value):
+        self._data[key] = value
+        self._data.move_to_end(key)
+        if len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def __len__(self):
+        return len(self._data)
+
+    def info(self) -> dict:
+        total = self.hits + self.misses
+        return {"hits": self.hits, "misses": self.misses, "bypass": self.bypass,
+                "size": len(self._data), "maxsize": self.maxsize,
+                "hit_rate": self.hits / total if total else 0.0}
+
+    def clear(self):
+        self._data.clear()
+        self.hits = self.misses = self.bypass = 0
+
+
+def make_key(obj, decimals: int = 10):
+    """
+    Clé hachable d'un argument : floats et tableaux arrondis à 'decimals'
+    décimales, conteneurs parcourus récursivement, modèles remplacés par
+    (type, paramètres). Lève Uncacheable pour un Generator (état consommé).
+    """
+    if obj is None or isinstance(obj, (bool, int, str, bytes)):
+        return obj
+    if isinstance(obj, (float, np.floating)):
+        return round(float(obj), decimals) + 0.0     # -0.0 et 0.0 confondus
+    if isinstance(obj, np.integer):
+        return int(obj)
+    if isinstance(obj, np.ndarray):
+        if obj.dtype.kind in "fc":
+            obj = np.round(obj, decimals) + 0.0
+        return ("ndarray", obj.shape, obj.dtype.str, np.ascontiguousarray(obj).tobytes())
+    if isinstance(obj, (list, tuple)):
+        return tuple(make_key(x, decimals) for x in obj)
+    if isinstance(obj, dict):
+        return tuple(sorted((k, make_key(v, decimals)) for k, v in obj.items()))
+    if isinstance(obj, np.random.SeedSequence):
+        return ("SeedSequence", obj.entropy, obj.spawn_key)
+    if isinstance(obj, np.random.Generator):
+        raise Uncacheable("un Generator n'a pas de clé de cache stable.")
+    if hasattr(obj, "__dict__") and not callable(obj):
+        return (type(obj).__name__, make_key(vars(obj), decimals))
+    raise Uncacheable(f"argument de type {type(obj).__name__} non mémoïsable.")
+
+
+def memoize(maxsize: int = 1024, decimals: int = 10, seed_arg: str = "random_state"):
+    """
+    Décorateur de mise en cache LRU (opt-in) :
+
+        cached_call = memoize(maxsize=4096)(bs_call)
+
+    Les arguments sont normalisés par la signature (positionnels / nommés /
+    valeurs par défaut), puis arrondis (make_key). Un appel dont 'seed_arg'
+    vaut None ou un Generator n'est pas reproductible et passe sans cache
+    (compté dans 'bypass'), de même que tout argument non mémoïsable.
+    Statistiques : f.cache_info(), remise à zéro : f.cache_clear().
+    """
+    def decorator(func):
+        cache = LRUCache(maxsize)
+        try:
+            signature = inspect.signature(func)
+        except (TypeError, ValueError):
+            signature = None
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            if signature is not None:
+                bound = signature.bind(*args, **kwargs)
+                bound.apply_defaults()
+                arguments = bound.arguments
+            else:
+                arguments = {"args": args, "kwargs": kwargs}
+            seed = arguments.get(seed_arg, 0)
+            try:
+                if seed is None or isinstance(seed, np.random.Generator):
+                    raise Uncacheable(seed_arg)
+                key = make_key(tuple(arguments.items()), decimals)
+            except Uncacheable:
+                cache.bypass += 1
+                return func(*args, **kwargs)
+            value = cache.get(key)
+            if value is _MISSING:
+                value = func(*args, **kwargs)
+                cache.put(key, value)
+            return value
+
+        wrapper.cache = cache
+        wrapper.cache_info = cache.info
+        wrapper.cache_clear = cache.clear
+        return wrapper
+    return decorator
+
+
+class PDEGridCache:
+    """
+    Cache de grilles Crank–Nicolson (crank_nicolson_bs_batch) : une grille par
+    (K, T, r, sigma, option, paramètres de grille), réutilisée pour tout spot
+    inférieur à Smax. Un spot hors de la grille déclenche une nouvelle
+    résolution avec Smax = 4·max(K, spot), qui remplace l'ancienne.
+    """
+
+    def __init__(self, maxsize: int = 64, decimals: int = 10, M_S: int = 400, M_T: int = 200):
+        self.cache = LRUCache(maxsize)
+        self.decimals = decimals
+        self.M_S = M_S
+        self.M_T = M_T
+
+    def grid(self, K: float, T: float, r: float, sigma: float, option: str = "call",
+             S_max_needed: float = 0.0):
+        """(S_grid, V_grid) à t = 0 pour un payoff, résolue au besoin."""
+        key = make_key((K, T, r, sigma, option, self.M_S, self.M_T), self.decimals)
+        entry = self.cache.get(key)
+        if entry is _MISSING or entry[0][-1] <= S_max_needed:
+            Smax = 4.0 * max(K, S_max_needed)
+            res = crank_nicolson_bs_batch(K, K, T, r, sigma, option=option, M_S=self.M_S, M_T=self.M_T,
+                                          Smax=Smax)
+            entry = (res["S_grid"], res["V_grid"][:, 0])
+            self.cache.put(key, entry)
+        return entry
+
+    def price(self, S, K: float, T: float, r: float, sigma: float, option: str = "call"):
+        """
+        Prix, Delta et Gamma aux spots S (scalaire ou tableau), par interpolation
+        quadratique sur la grille en cache. Retourne un dict comme le solveur.
+        """
+        x = np.atleast_1d(np.asarray(S, dtype=float))
+        S_grid, V = self.grid(K, T, r, sigma, option, S_max_needed=float(x.max()))
+        j, w0, w1, w2 = _quadratic_weights(S_grid, x)
+        nodes = (V[j - 1], V[j], V[j + 1])
+        out = {name: sum(w[k] * nodes[k] for k in range(3))
+               for name, w in (("price", w0), ("delta", w1), ("gamma", w2))}
+        if np.ndim(S) == 0:
+            out = {name: float(v[0]) for name, v in out.items()}
+        return out
+
+    def info(self) -> dict:
+        return self.cache.info()
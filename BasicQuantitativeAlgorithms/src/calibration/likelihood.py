@@ -1,45 +1,162 @@
 import numpy as np
+from stats import RunningMoments, rolling_moments
 
-def gbm_mle_from_prices(prices: np.ndarray, dt: float):
+def _return_stats(log_returns: np.ndarray):
+    """
+    Statistiques suffisantes (n, moyenne, somme des carrés des écarts) par série
+    le long du dernier axe ; les NaN (séries de longueurs différentes, complétées
+    par des NaN) sont ignorés.
+    """
+    mask = ~np.isnan(log_returns)
+    n = mask.sum(axis=-1)
+    x = np.where(mask, log_returns, 0.0)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        mean = x.sum(axis=-1) / n
+        M2 = (np.where(mask, log_returns - mean[..., None], 0.0) ** 2).sum(axis=-1)
+    return n, mean, M2
+
+
+def gbm_mle_from_prices(prices: np.ndarray, dt: float, return_se: bool = False):
     """
     Estimateurs MLE fermés pour un GBM à partir d'une série de prix S_t.
     Retourne (mu_hat, sigma_hat).
+
+    prices peut être un tableau 2-D (une série par ligne) : les séries de
+    longueurs différentes sont complétées par des NaN, ignorés. Les estimateurs
+    sont alors des tableaux (un par série).
+
+    return_se=True : ajoute les écarts-types asymptotiques (se_mu, se_sigma),
+    inverse de l'information observée (Hessienne analytique de log_likelihood).
     """
     prices = np.asarray(prices, dtype=float)
-    log_ret = np.diff(np.log(prices))
-    mu_hat = (np.mean(log_ret) + 0.5 * np.var(log_ret)) / dt
-    sigma_hat = np.sqrt(np.var(log_ret) / dt)
-    return float(mu_hat), float(sigma_hat)
+    n, mean, M2 = _return_stats(np.diff(np.log(prices), axis=-1))
+    with np.errstate(invalid="ignore", divide="ignore"):     # série vide -> NaN
+        var = M2 / n
+    mu_hat = (mean + 0.5 * var) / dt
+    sigma_hat = np.sqrt(var / dt)
+    if prices.ndim == 1:
+        mu_hat, sigma_hat = float(mu_hat), float(sigma_hat)
+    if not return_se:
+        return mu_hat, sigma_hat
+    # paramètres par pas au maximum : la Hessienne y est connue en forme fermée
+    theta = np.stack([np.asarray(mu_hat) * dt, np.asarray(sigma_hat) * np.sqrt(dt)], axis=-1)
+    _, _, hess = log_likelihood(theta, np.diff(np.log(prices), axis=-1), derivatives=True)
+    cov = np.linalg.inv(-hess)
+    se_mu = np.sqrt(cov[..., 0, 0]) / dt
+    se_sigma = np.sqrt(cov[..., 1, 1]) / np.sqrt(dt)
+    if prices.ndim == 1:
+        se_mu, se_sigma = float(se_mu), float(se_sigma)
+    return mu_hat, sigma_hat, se_mu, se_sigma
 
 
-def log_likelihood(theta, log_returns: np.ndarray) -> float:
+class OnlineGBMMLE:
+    """
+    Version en flux de gbm_mle_from_prices : chaque nouveau prix met à jour
+    les moments des log-rendements en O(1) (Welford), l'estimation est
+    disponible à tout instant sans reparcourir l'historique.
+    """
+
+    def __init__(self, dt: float):
+        self.dt = float(dt)
+        self.moments = RunningMoments()
+        self._last_log_price = None
+
+    def update(self, price: float):
+        log_price = float(np.log(price))
+        if self._last_log_price is not None:
+            self.moments.push(log_price - self._last_log_price)
+        self._last_log_price = log_price
+        return self
+
+    def update_many(self, prices: np.ndarray):
+        """Ajoute un bloc de prix consécutifs (mise à jour vectorisée)."""
+        log_prices = np.log(np.asarray(prices, dtype=float))
+        if log_prices.size == 0:
+            return self
+        if self._last_log_price is not None:
+            log_prices = np.concatenate([[self._last_log_price], log_prices])
+        self.moments.update(np.diff(log_prices))
+        self._last_log_price = float(log_prices[-1])
+        return self
+
+    def estimate(self):
+        """(mu_hat, sigma_hat), identiques à gbm_mle_from_prices sur tout l'historique."""
+        var = self.moments.var()
+        return float((self.moments.mean + 0.5 * var) / self.dt), float(np.sqrt(var / self.dt))
+
+
+def rolling_gbm_mle(prices: np.ndarray, window: int, dt: float):
+    """
+    gbm_mle_from_prices sur chaque fenêtre glissante de 'window' rendements,
+    vectorisé sur tout l'historique. Retourne (mu_hat, sigma_hat) en tableaux.
+    """
+    log_ret = np.diff(np.log(np.asarray(prices, dtype=float)))
+    mean, var, _, _ = rolling_moments(log_ret, window)
+    return (mean + 0.5 * var) / dt, np.sqrt(var / dt)
+
+
+def log_likelihood(theta, log_returns: np.ndarray, derivatives: bool = False):
     """
     Log-vraisemblance d'un GBM pour une série de rendements log.
 
     Paramètres
     ----------
-    theta : (mu, sigma)
+    theta : (mu, sigma), ou tableau (..., 2) de paramètres
         mu : drift (par pas de temps)
         sigma : volatilité (par pas de temps, > 0)
     log_returns : array_like
         R_i = log(S_{i+1} / S_i) pour i = 0,...,n-1 (on suppose dt = 1).
+        Tableau 2-D : une série par ligne, NaN ignorés (longueurs différentes).
+    derivatives : bool
+        Si True, retourne aussi le gradient (..., 2) et la Hessienne (..., 2, 2)
+        analytiques par rapport à (mu, sigma).
 
     Retour
     ------
-    float
-        Valeur de la log-vraisemblance.
+    float ou ndarray
+        Valeur de la log-vraisemblance : float pour une série et un theta,
+        sinon tableau de forme diffusée theta[..., 0] × séries.
+        Avec derivatives=True : (ll, gradient, Hessienne).
+
+    Calcul sur les statistiques suffisantes (n, moyenne, somme des carrés) :
+    chaque theta supplémentaire coûte O(1), quelle que soit la longueur.
     """
     log_returns = np.asarray(log_returns, dtype=float)
-    mu, sigma = float(theta[0]), float(theta[1])
+    theta = np.asarray(theta, dtype=float)
+    mu, sigma = theta[..., 0], theta[..., 1]
+    n, mean, M2 = _return_stats(log_returns)
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        v = sigma ** 2                       # variance par pas
+        e = mean - (mu - 0.5 * v)            # moyenne empirique − espérance par pas
+        Q = M2 + n * e ** 2                  # somme des carrés des résidus
+        ll = -0.5 * n * np.log(2 * np.pi * v) - 0.5 * Q / v
+    # sigma non valide -> -inf pour que l'optimiseur évite cette zone
+    ll = np.where(sigma > 0, ll, -np.inf)
+    scalar = ll.ndim == 0
+
+    if not derivatives:
+        return float(ll) if scalar else ll
 
-    if sigma <= 0:
-        # sigma non valide -> -inf pour que l'optimiseur évite cette zone
-        return -np.inf
+    with np.errstate(invalid="ignore", divide="ignore"):
+        grad = np.stack([n * e / v,
+                         -n / sigma + Q / (sigma * v) - n * e / sigma], axis=-1)
+        h_mm = -n / v
+        h_ms = n / sigma - 2.0 * n * e / (sigma * v)
+        h_ss = n / v + 3.0 * n * e / v - 3.0 * Q / (v * v) - n
+        h_mm, h_ms, h_ss = np.broadcast_arrays(h_mm, h_ms, h_ss)
+        hess = np.stack([np.stack([h_mm, h_ms], axis=-1),
+                         np.stack([h_ms, h_ss], axis=-1)], axis=-2)
+    return (float(ll) if scalar else ll), grad, hess
 
-    n = log_returns.size
-    m = mu - 0.5 * sigma**2          # espérance par pas
-    v = sigma**2                     # variance par pas
 
-    resid = log_returns - m
-    ll = -0.5 * n * np.log(2 * np.pi * v) - 0.5 * np.sum(resid**2) / v
-    return float(ll)
+def negative_log_likelihood(theta, log_returns: np.ndarray, jac: bool = False):
+    """
+    Objectif de calibrate_model : −log_likelihood, et son gradient si jac=True
+    (à utiliser avec calibrate_model(..., jac=True), batch=True pour un tableau
+    de séries et theta de forme (n_series, 2)).
+    """
+    if not jac:
+        return -log_likelihood(theta, log_returns)
+    ll, grad, _ = log_likelihood(theta, log_returns, derivatives=True)
+    return -ll, -grad
@@ -38,11 +38,15 @@ def heston_theoretical_moments(theta):
 
     kappa, theta_bar, xi, rho, v0 = theta
 
-    # 1) mean approx. : E[log(S)] ≈ ( -0.5 E[v] )
-    mean = -0.5 * theta_bar
+    # variance intégrée moyenne sur le pas : E[∫_0^1 v_s ds] = θ + (v0 − θ)(1 − e^{−κ})/κ
+    k = max(kappa, 1e-12)
+    int_var = theta_bar + (v0 - theta_bar) * (1.0 - np.exp(-k)) / k
 
-    # 2) variance approx. : Var(log(S)) ≈ E[v]
-    variance = theta_bar
+    # 1) mean approx. : E[log(S)] ≈ ( -0.5 E[∫v] )
+    mean = -0.5 * int_var
+
+    # 2) variance approx. : Var(log(S)) ≈ E[∫v]
+    variance = int_var
 
     # 3) skew approximation : dépend de rho et xi
     skew = rho * xi / np.sqrt(variance + 1e-12)
@@ -56,12 +60,15 @@ def heston_theoretical_moments(theta):
 # -------------------------------------------------------------------------
 # 3. Fonction objectif (distance entre moments)
 # -------------------------------------------------------------------------
-def moments_objective(theta, logreturns):
+def moments_objective(theta, logreturns, emp=None):
     """
     Distance quadratique entre moments empiriques et moments Heston.
     Utilisée pour calibrer theta par moindres carrés.
+    emp : vecteur des moments empiriques déjà calculé (évite de reparcourir
+    toute la série à chaque évaluation).
     """
-    emp = np.array(empirical_moments(logreturns))
+    if emp is None:
+        emp = np.array(empirical_moments(logreturns))
     theo = np.array(heston_theoretical_moments(theta))
 
     return np.sum((emp - theo)**2)
@@ -75,8 +82,11 @@ from scipy.optimize import minimize
 def calibrate_heston_moments(logreturns, theta0):
     """
     Calibre un modèle Heston en minimisant la distance des moments.
+    Les moments empiriques sont calculés une seule fois.
+    Pour une calibration sur une surface d'options, voir calibration.surface.
     """
-    res = minimize(lambda th: moments_objective(th, logreturns),
+    emp = np.array(empirical_moments(logreturns))
+    res = minimize(lambda th: moments_objective(th, None, emp=emp),
                    x0=np.asarray(theta0, dtype=float),
                    method="Nelder-Mead")
 
@@ -1,37 +1,240 @@
 import numpy as np
-from scipy.optimize import minimize
-from pricing.black_scholes import bs_call
+from scipy.optimize import minimize, OptimizeResult
+from pricing.black_scholes import bs_call, _as_result
+from cache import memoize
+from instrumentation import instrument
 
 
 # -------------------------------------------------------------------------
-# 1. Calibration de volatilité BS par moindres carrés
+# 1. Volatilité implicite Black–Scholes (inversion vectorisée)
 # -------------------------------------------------------------------------
+def implied_vol(market_price, S0, K, T, r, option="call", sigma0=None,
+                tol: float = 1e-12, max_iter: int = 50,
+                sigma_min: float = 1e-9, sigma_max: float = 10.0):
+    """
+    Volatilité implicite Black–Scholes d'un tableau complet de cotations.
+
+    Itérations de Halley (vega, vomma) vectorisées sur tous les contrats,
+    point de départ rationnel de Corrado–Miller et encadrement [lo, hi]
+    mis à jour à chaque pas : si le pas sort de l'intervalle, on bissecte.
+    Les puts sont ramenés à des calls par parité.
+
+    Parameters
+    ----------
+    market_price, S0, K, T, r : scalaires ou tableaux (diffusion numpy)
+    option : 'call', 'put' ou tableau booléen (True = call)
+    sigma0 : point de départ optionnel (sinon Corrado–Miller)
+    tol : tolérance sur l'erreur de prix, relative à S0
+
+    Returns
+    -------
+    sigma : ndarray (NaN hors bornes d'arbitrage)
+    converged : ndarray de bool, drapeau de convergence par contrat
+    """
+    price, S0, K, T, r = np.broadcast_arrays(
+        *(np.asarray(a, dtype=float) for a in (market_price, S0, K, T, r)))
+    if isinstance(option, str):
+        if option not in ("call", "put"):
+            raise ValueError("option doit être 'call' ou 'put'.")
+        is_call = np.full(price.shape, option == "call")
+    else:
+        is_call = np.broadcast_to(np.asarray(option, dtype=bool), price.shape)
+
+    disc_K = K * np.exp(-r * T)
+    call = np.where(is_call, price, price + S0 - disc_K)   # parité call-put
+    lower = np.maximum(S0 - disc_K, 0.0)
+    valid = (T > 0) & (call > lower) & (call < S0)
+
+    shape = price.shape
+    sigma = np.full(shape, np.nan)
+    converged = np.zeros(shape, dtype=bool)
+    idx = np.flatnonzero(valid)
+    if idx.size == 0:
+        return _as_result(sigma), _as_result(converged)
+
+    c, s, k, t, rr, dk = (a.ravel()[idx] for a in (call, S0, K, T, r, disc_K))
+    sqrt_t = np.sqrt(t)
+
+    if sigma0 is None:
+        # Corrado–Miller (1996), repli Brenner–Subrahmanyam si le discriminant est < 0
+        m = c - 0.5 * (s - dk)
+        disc = np.maximum(m * m - (s - dk) ** 2 / np.pi, 0.0)
+        x = np.sqrt(2.0 * np.pi / t) / (s + dk) * (m + np.sqrt(disc))
+        x = np.where(np.isfinite(x) & (x > 0), x, np.sqrt(2.0 * np.pi / t) * c / s)
+    else:
+        x = np.broadcast_to(np.asarray(sigma0, dtype=float), shape).ravel()[idx].copy()
+
+    lo = np.full(idx.size, sigma_min)
+    hi = np.full(idx.size, sigma_max)
+    x = np.clip(x, lo, hi)
+    done = np.zeros(idx.size, dtype=bool)
+    atol = tol * s
+
+    for _ in range(max_iter):
+        a = ~done
+        if not a.any():
+            break
+        xa, sa, ka, ta, ra, ca = x[a], s[a], k[a], t[a], rr[a], c[a]
+        vol = xa * sqrt_t[a]
+        d1 = (np.log(sa / ka) + (ra + 0.5 * xa * xa) * ta) / vol
+        d2 = d1 - vol
+        f = bs_call(sa, ka, ta, ra, xa) - ca
+        vega = sa * np.exp(-0.5 * d1 * d1) * sqrt_t[a] / np.sqrt(2.0 * np.pi)
+        vomma = vega * d1 * d2 / xa
+
+        ok = np.abs(f) <= atol[a]
+        # le prix est croissant en sigma : mise à jour de l'encadrement
+        lo[a] = np.where(f < 0, xa, lo[a])
+        hi[a] = np.where(f > 0, xa, hi[a])
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            step = 2.0 * f * vega / (2.0 * vega * vega - f * vomma)
+        x_new = xa - step
+        bad = ~np.isfinite(x_new) | (x_new <= lo[a]) | (x_new >= hi[a])
+        x_new = np.where(bad, 0.5 * (lo[a] + hi[a]), x_new)
+        ok |= np.abs(x_new - xa) <= 4.0 * np.finfo(float).eps * xa
+
+        x[a] = np.where(ok, xa, x_new)
+        done[a] = ok
+
+    sigma.ravel()[idx] = x
+    converged.ravel()[idx] = done
+    return _as_result(sigma), _as_result(converged)
+
+
 def fit_bs_vol_to_call_price(S0: float, K: float, T: float, r: float,
                              market_price: float, sigma0: float = 0.2):
     """
     Calibre sigma de Black–Scholes pour reproduire un prix d'option cible.
-    Utilise les moindres carrés : minimise (BS - market_price)^2.
+    Enveloppe scalaire de implied_vol, itérations démarrées en sigma0 ;
+    retourne (sigma_hat, res) avec res un OptimizeResult (x, fun = erreur de
+    prix au carré, success). Prix hors bornes d'arbitrage : sigma0 est renvoyé.
     """
-    def obj(sig):
-        sig = float(np.maximum(sig, 1e-8))
-        price = bs_call(S0, K, T, r, sig)
-        return (price - market_price) ** 2
-
-    res = minimize(lambda x: obj(x[0]),
-                   x0=[sigma0],
-                   method="Nelder-Mead")
-
-    sigma_hat = float(max(res.x[0], 1e-8))
-    return sigma_hat, res
+    sigma_hat, ok = implied_vol(market_price, S0, K, T, r, option="call", sigma0=sigma0)
+    if not np.isfinite(sigma_hat):
+        sigma_hat = float(max(sigma0, 1e-8))
+    err = bs_call(S0, K, T, r, sigma_hat) - market_price
+    res = OptimizeResult(x=np.array([sigma_hat]), fun=err ** 2, success=bool(ok),
+                         message="convergence" if ok else "prix hors bornes ou non convergé")
+    return float(sigma_hat), res
 
 
 # -------------------------------------------------------------------------
 # 2. Calibration générique (maximum de vraisemblance, moments, etc.)
 # -------------------------------------------------------------------------
+BATCH_METHODS = ("L-BFGS-B",)
+
+
+def _batch_evaluator(objective, jac, fd_step: float = 1e-7):
+    """
+    (valeurs (n,), gradients (n, p)) d'un objectif vectorisé sur theta (n, p).
+    Sans gradient analytique, différences finies avant vectorisées : les séries
+    étant indépendantes, un décalage de la colonne j pour toutes les séries à
+    la fois donne la dérivée j de chacune (p évaluations en plus).
+    """
+    def evaluate(theta):
+        if jac is True:
+            f, g = objective(theta)
+            return np.asarray(f, dtype=float), np.asarray(g, dtype=float)
+        f = np.asarray(objective(theta), dtype=float)
+        if callable(jac):
+            return f, np.asarray(jac(theta), dtype=float)
+        g = np.empty(theta.shape)
+        for j in range(theta.shape[1]):
+            h = fd_step * np.maximum(1.0, np.abs(theta[:, j]))
+            bumped = theta.copy()
+            bumped[:, j] += h
+            g[:, j] = (np.asarray(objective(bumped), dtype=float) - f) / h
+        return f, g
+    return evaluate
+
+
+def _projected_gradient(theta, g, bounds):
+    """Gradient projeté sur les bornes (composantes nulles aux bornes actives)."""
+    if bounds is None:
+        return g
+    pg = g.copy()
+    for j, (lo, hi) in enumerate(bounds):
+        if lo is not None:
+            pg[(theta[:, j] <= lo) & (g[:, j] > 0), j] = 0.0
+        if hi is not None:
+            pg[(theta[:, j] >= hi) & (g[:, j] < 0), j] = 0.0
+    return pg
+
+
+def _calibrate_batch(objective, theta0, method, bounds, jac, options, max_rounds: int = 5):
+    """
+    Mode batch de calibrate_model : L-BFGS-B sur le vecteur empilé des séries
+    actives, puis test de convergence par série ; les
+    séries non convergées sont relancées seules, jusqu'à max_rounds tours.
+    Les séries dont l'objectif n'est pas fini en theta0 (série vide, NaN…)
+    sont exclues.
+    """
+    if method not in BATCH_METHODS:
+        raise ValueError(f"en mode batch, method doit être parmi {BATCH_METHODS}.")
+    theta = np.asarray(theta0, dtype=float).copy()
+    if theta.ndim != 2:
+        raise ValueError("en mode batch, theta0 doit être de forme (n_series, p).")
+    n, p = theta.shape
+    options = {"maxiter": 15000, "ftol": 1e-15, "gtol": 1e-9, **(options or {})}
+    gtol_series = options.pop("gtol_series", 1e-5)
+    ftol_series = options.pop("ftol_series", 1e-10)
+    evaluate = _batch_evaluator(objective, jac)
+
+    f, g = evaluate(theta)
+    valid = np.isfinite(f) & np.all(np.isfinite(g), axis=1)
+
+    def small_gradient(g):
+        return np.max(np.abs(_projected_gradient(theta, g, bounds)), axis=1) <= gtol_series
+
+    converged = valid & small_gradient(g)
+    nit = nfev = 0
+    messages = []
+    for _ in range(max_rounds):
+        active = valid & ~converged
+        if not active.any():
+            break
+        n_active = int(active.sum())
+
+        def func(x):
+            full = theta.copy()
+            full[active] = x.reshape(n_active, p)
+            f_all, g_all = evaluate(full)
+            return float(np.sum(f_all[active])), g_all[active].ravel()
+
+        res = minimize(func, x0=theta[active].ravel(), method=method, jac=True,
+                       bounds=None if bounds is None else list(bounds) * n_active,
+                       options=options)
+        theta[active] = res.x.reshape(n_active, p)
+        nit += res.nit
+        nfev += res.nfev
+        messages.append(str(res.message))
+        f_prev = f
+        f, g = evaluate(theta)
+        # convergence par série : gradient projeté petit, ou objectif stationnaire
+        # d'un tour au suivant (critère 'factr' de L-BFGS-B appliqué à la série)
+        stalled = f_prev - f <= ftol_series * np.maximum(1.0, np.abs(f))
+        converged |= active & np.isfinite(f) & (small_gradient(g) | stalled)
+
+    theta[~valid] = np.nan
+    f = np.where(valid, f, np.nan)
+    success = bool(np.all(converged[valid])) and bool(valid.any())
+    res = OptimizeResult(x=theta, fun=float(np.sum(f[valid])), success=success,
+                         success_per_series=converged & valid, excluded=~valid,
+                         fun_per_series=f, nit=nit, nfev=nfev,
+                         message="; ".join(messages) or "convergence en theta0")
+    return res
+
+
+@instrument("calibration.calibrate_model")
 def calibrate_model(objective,
                     theta0,
-                    method: str = "Nelder-Mead",
-                    bounds=None):
+                    method: str | None = None,
+                    bounds=None,
+                    cache: int | bool = False,
+                    jac=None,
+                    batch: bool = False,
+                    options=None):
     """
     Calibre un modèle en minimisant une fonction objectif générale.
     (ex : -log-likelihood, distance de moments, etc.)
@@ -42,22 +245,54 @@ def calibrate_model(objective,
         Fonction à minimiser (ex: -log-vraisemblance)
     theta0 : array_like
         Point de départ
-    method : str
-        Méthode d'optimisation scipy (Nelder-Mead, L-BFGS-B, Powell…)
+    method : str or None
+        Méthode d'optimisation scipy (Nelder-Mead, L-BFGS-B, Powell…) ;
+        None : Nelder-Mead, ou L-BFGS-B en mode batch
     bounds : list of tuple or None
         Bornes éventuelles (pour L-BFGS-B)
+    cache : bool or int
+        Mémoïse l'objectif sur theta arrondi (True : 1024 entrées, entier :
+        taille du cache) ; les statistiques sont dans res.cache_info
+    jac : bool, callable or None
+        Gradient analytique, transmis à scipy (True : objective retourne
+        (valeur, gradient)) ; évite les différences finies
+    batch : bool
+        Calibre n séries indépendantes en un seul appel vectorisé : theta0 est
+        de forme (n, p), objective(theta (n, p)) retourne n valeurs (et, si
+        jac=True, un gradient (n, p) ; un jac appelable reçoit aussi theta
+        (n, p)). Sans gradient, différences finies vectorisées sur les séries.
+        L-BFGS-B minimise la somme des objectifs des séries actives ; la
+        convergence est testée série par série (gradient projeté <=
+        gtol_series, défaut 1e-5, ou baisse relative de l'objectif d'un tour
+        au suivant <= ftol_series, défaut 1e-10, clés de 'options') et les
+        séries non convergées sont relancées seules. Les séries d'objectif non
+        fini en theta0 (série vide…) sont exclues (theta NaN). bounds (p
+        couples) est répété pour chaque série
+    options : dict or None
+        Options de l'optimiseur scipy
 
     Returns
     -------
     theta_hat : ndarray
-        Paramètres calibrés
+        Paramètres calibrés ((n, p) en mode batch)
     res : OptimizeResult
-        Résultat scipy complet
+        Résultat scipy complet (en mode batch : fun_per_series,
+        success_per_series, excluded par série)
     """
 
-    res = minimize(objective,
-                   x0=np.asarray(theta0, dtype=float),
-                   method=method,
-                   bounds=bounds)
+    if cache:
+        objective = memoize(maxsize=1024 if cache is True else int(cache), decimals=12)(objective)
+
+    if batch:
+        res = _calibrate_batch(objective, theta0, method or "L-BFGS-B", bounds, jac, options)
+    else:
+        res = minimize(objective,
+                       x0=np.asarray(theta0, dtype=float),
+                       method=method or "Nelder-Mead",
+                       jac=jac,
+                       bounds=bounds,
+                       options=options)
 
+    if cache:
+        res.cache_info = objective.cache_info()
     return res.x, res
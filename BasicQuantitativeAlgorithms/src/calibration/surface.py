@@ -0,0 +1,115 @@
+import numpy as np
+from scipy.optimize import least_squares
+
+from models.heston import Heston
+from pricing.fourier import cos_put_grad
+from instrumentation import instrument
+
+HESTON_PARAMS = ("kappa", "theta", "xi", "rho", "v0")
+HESTON_THETA0 = np.array([2.0, 0.04, 0.5, -0.5, 0.04])
+
+
+# -------------------------------------------------------------------------
+# 1. Paramétrisation sans contraintes (LM ne gère pas les bornes)
+# -------------------------------------------------------------------------
+def _to_params(z):
+    # kappa, theta, xi, v0 = exp(z) > 0 ; rho = tanh(z) dans ]-1, 1[
+    p = np.exp(z)
+    p[3] = np.tanh(z[3])
+    return p
+
+
+def _to_internal(p):
+    p = np.asarray(p, dtype=float)
+    z = np.empty_like(p)
+    positive = [0, 1, 2, 4]
+    z[positive] = np.log(p[positive])
+    z[3] = np.arctanh(p[3])
+    return z
+
+
+def _dparams_dz(p):
+    d = p.copy()
+    d[3] = 1.0 - p[3] ** 2
+    return d
+
+
+# -------------------------------------------------------------------------
+# 2. Prix et jacobienne de toutes les cotations
+# -------------------------------------------------------------------------
+def heston_surface_prices(params, S0: float, K, T, r: float, option="call",
+                          n_terms: int = 256, L: float = 10.0):
+    """
+    Prix Heston (COS) de toutes les cotations (K, T) et jacobienne analytique
+    par rapport à (kappa, theta, xi, rho, v0). Une passe vectorisée par maturité.
+    Retourne (prix (n,), jac (n, 5)).
+    """
+    K, T = np.broadcast_arrays(np.asarray(K, dtype=float), np.asarray(T, dtype=float))
+    is_call = np.broadcast_to(np.asarray(option) == "call", K.shape)
+    model = Heston(*params, S0=S0)
+    price = np.empty(K.shape)
+    jac = np.empty(K.shape + (len(HESTON_PARAMS),))
+    for Tj in np.unique(T):
+        idx = T == Tj
+        put, dput = cos_put_grad(model, K[idx], float(Tj), r, n_terms=n_terms, L=L)
+        price[idx] = np.where(is_call[idx], put + S0 - K[idx] * np.exp(-r * Tj), put)
+        jac[idx] = dput.T
+    return price, jac
+
+
+# -------------------------------------------------------------------------
+# 3. Calibration Levenberg–Marquardt sur la surface
+# -------------------------------------------------------------------------
+@instrument("calibration.calibrate_heston_surface")
+def calibrate_heston_surface(S0: float, K, T, r: float, market_prices, option="call",
+                             theta0=None, weights=None, n_terms: int = 256, L: float = 10.0,
+                             max_nfev: int = 200):
+    """
+    Calibre (kappa, theta, xi, rho, v0) sur une surface de prix d'options par
+    moindres carrés pondérés, Levenberg–Marquardt (MINPACK) avec jacobienne
+    analytique de la méthode COS.
+
+    theta0 : point de départ ; passer les paramètres de la veille pour un
+    démarrage à chaud (cf. HestonSurfaceCalibrator).
+
+    Returns
+    -------
+    theta_hat : ndarray (kappa, theta, xi, rho, v0)
+    res : OptimizeResult de scipy.optimize.least_squares
+    """
+    market_prices = np.asarray(market_prices, dtype=float)
+    w = np.ones_like(market_prices) if weights is None else np.asarray(weights, dtype=float)
+    p0 = HESTON_THETA0 if theta0 is None else np.asarray(theta0, dtype=float)
+
+    last = {}
+
+    def evaluate(z):
+        key = z.tobytes()
+        if last.get("key") != key:
+            p = _to_params(z)
+            price, jac = heston_surface_prices(p, S0, K, T, r, option, n_terms, L)
+            last.update(key=key, resid=w * (price - market_prices),
+                        jac=w[:, None] * jac * _dparams_dz(p))
+        return last
+
+    res = least_squares(lambda z: evaluate(z)["resid"], _to_internal(p0),
+                        jac=lambda z: evaluate(z)["jac"], method="lm", max_nfev=max_nfev)
+    return _to_params(res.x), res
+
+
+class HestonSurfaceCalibrator:
+    """
+    Calibrations successives (p.ex. quotidiennes) démarrées à chaud :
+    chaque fit part des paramètres obtenus au fit précédent.
+    """
+
+    def __init__(self, theta0=None, **options):
+        self.theta = None if theta0 is None else np.asarray(theta0, dtype=float)
+        self.options = options
+
+    def fit(self, S0: float, K, T, r: float, market_prices, option="call", weights=None):
+        theta_hat, res = calibrate_heston_surface(S0, K, T, r, market_prices, option=option,
+                                                  theta0=self.theta, weights=weights, **self.options)
+        if res.success:
+            self.theta = theta_hat
+        return theta_hat, res
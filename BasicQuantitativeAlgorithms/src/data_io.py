@@ -0,0 +1,325 @@
+"""
+Accès aux historiques de prix sur disque, par blocs, à mémoire bornée.
+
+- PriceFile : fichier binaire de prix (.npy ou brut), lignes = dates,
+  colonnes = instruments ; lecture de blocs de lignes par np.fromfile (ou
+  np.memmap pour un .npy en ordre Fortran) sans charger le fichier ;
+- iter_blocks / iter_log_returns : blocs de prix et de log-rendements
+  calculés à la volée (recouvrement de 'horizon' lignes entre blocs) ;
+- stream_* : moments, MLE GBM, VaR/CVaR et moments de log(S_T/S0) calculés
+  en flux, identiques aux versions en mémoire (empirical_moments,
+  gbm_mle_from_prices, var_cvar_from_prices, log_return_moments) ;
+- simulate_to_file / append_prices : écriture de gros résultats de
+  simulation ou d'historiques directement sur disque.
+
+La mémoire utilisée est O(block_size × colonnes), quelle que soit la
+longueur de l'historique. Les NaN (séries de longueurs différentes) sont
+ignorés comme dans gbm_mle_from_prices.
+"""
+import os
+
+import numpy as np
+
+from stats import RunningMoments
+
+
+# -------------------------------------------------------------------------
+# 1. Fichiers de prix
+# -------------------------------------------------------------------------
+class PriceFile:
+    """
+    Fichier de prix binaire, lu par blocs de lignes.
+
+    .npy : forme, dtype et ordre lus dans l'en-tête. Fichier brut : dtype et
+    n_columns (None = une seule série, tableau 1-D) sont à fournir, le nombre
+    de lignes est déduit de la taille du fichier.
+    """
+
+    def __init__(self, path, dtype=np.float64, n_columns: int | None = None):
+        self.path = os.fspath(path)
+        if self.path.endswith(".npy"):
+            with open(self.path, "rb") as f:
+                version = np.lib.format.read_magic(f)
+                if version == (1, 0):
+                    shape, fortran, dtype = np.lib.format.read_array_header_1_0(f)
+                else:
+                    shape, fortran, dtype = np.lib.format.read_array_header_2_0(f)
+                self.offset = f.tell()
+            self.fortran_order = bool(fortran)
+        else:
+            dtype = np.dtype(dtype)
+            width = 1 if n_columns is None else int(n_columns)
+            n_rows = os.path.getsize(self.path) // (dtype.itemsize * width)
+            shape = (n_rows,) if n_columns is None else (n_rows, width)
+            self.offset = 0
+            self.fortran_order = False
+        self.dtype = np.dtype(dtype)
+        self.shape = tuple(shape)
+
+    @property
+    def ndim(self) -> int:
+        return len(self.shape)
+
+    def __len__(self) -> int:
+        return self.shape[0]
+
+    def memmap(self) -> np.memmap:
+        """Vue np.memmap en lecture seule sur tout le fichier."""
+        return np.memmap(self.path, dtype=self.dtype, mode="r", offset=self.offset, shape=self.shape,
+                         order="F" if self.fortran_order else "C")
+
+    def read(self, start: int, stop: int) -> np.ndarray:
+        """Lignes [start, stop) copiées en mémoire."""
+        start, stop = max(start, 0), min(stop, len(self))
+        if self.fortran_order:
+            return np.array(self.memmap()[start:stop])
+        row = int(np.prod(self.shape[1:], dtype=int))
+        block = np.fromfile(self.path, dtype=self.dtype, count=max(stop - start, 0) * row,
+                            offset=self.offset + start * row * self.dtype.itemsize)
+        return block.reshape((-1,) + self.shape[1:])
+
+
+def open_prices(path, dtype=np.float64, n_columns: int | None = None) -> PriceFile:
+    return PriceFile(path, dtype=dtype, n_columns=n_columns)
+
+
+def append_prices(path, block, dtype=np.float64):
+    """Ajoute des lignes à un fichier de prix brut (créé au besoin)."""
+    block = np.ascontiguousarray(block, dtype=dtype)
+    with open(path, "ab") as f:
+        block.tofile(f)
+
+
+# -------------------------------------------------------------------------
+# 2. Blocs de prix et log-rendements à la volée
+# -------------------------------------------------------------------------
+def _source(prices):
+    """PriceFile, chemin ou tableau (ndarray / memmap, non copié)."""
+    if isinstance(prices, PriceFile) or hasattr(prices, "shape"):
+        return prices
+    return PriceFile(prices)
+
+
+def _read(src, start: int, stop: int) -> np.ndarray:
+    if isinstance(src, PriceFile):
+        return src.read(start, stop)
+    return np.asarray(src[max(start, 0):stop])
+
+
+def iter_blocks(prices, block_size: int = 65_536, overlap: int = 0):
+    """
+    Blocs de 'block_size' lignes ; chaque bloc reprend en tête les 'overlap'
+    dernières lignes du précédent. Produit (indice de première ligne, bloc).
+    """
+    src = _source(prices)
+    n = len(src)
+    for start in range(overlap, max(n, overlap + 1), block_size):
+        stop = min(start + block_size, n)
+        if stop <= start:
+            break
+        yield start - overlap, _read(src, start - overlap, stop)
+
+
+def iter_log_returns(prices, block_size: int = 65_536, horizon: int = 1):
+    """Blocs de log-rendements log(S_{t+h}/S_t), calculés à la lecture (float64)."""
+    for _, block in iter_blocks(prices, block_size, overlap=horizon):
+        log_p = np.log(block.astype(float, copy=False))
+        yield log_p[horizon:] - log_p[:-horizon]
+
+
+# -------------------------------------------------------------------------
+# 3. Estimateurs en flux
+# -------------------------------------------------------------------------
+def _block_moments(x: np.ndarray):
+    """(n, moyenne, m2, m3, m4) de chaque colonne d'un bloc, en tableaux (NaN ignorés)."""
+    mask = ~np.isnan(x)
+    n = mask.sum(axis=0)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        mean = np.where(n > 0, np.where(mask, x, 0.0).sum(axis=0) / n, 0.0)
+    d = np.where(mask, x - mean, 0.0)
+    d2 = d * d
+    return n, mean, d2.sum(axis=0), (d2 * d).sum(axis=0), (d2 * d2).sum(axis=0)
+
+
+def _merge_moments(a, b):
+    """Fusion de Chan / Pébay (celle de RunningMoments.merge) vectorisée sur les colonnes."""
+    na, mean_a, m2a, m3a, m4a = a
+    nb, mean_b, m2b, m3b, m4b = b
+    n = na + nb
+    safe = np.maximum(n, 1).astype(float)
+    na, nb = na.astype(float), nb.astype(float)
+    delta = mean_b - mean_a
+    d2 = delta * delta
+    m4 = (m4a + m4b + d2 * d2 * na * nb * (na * na - na * nb + nb * nb) / safe ** 3
+          + 6.0 * d2 * (na * na * m2b + nb * nb * m2a) / safe ** 2
+          + 4.0 * delta * (na * m3b - nb * m3a) / safe)
+    m3 = m3a + m3b + d2 * delta * na * nb * (na - nb) / safe ** 2 + 3.0 * delta * (na * m2b - nb * m2a) / safe
+    m2 = m2a + m2b + d2 * na * nb / safe
+    return n, mean_a + delta * nb / safe, m2, m3, m4
+
+
+def _stream_column_moments(prices, block_size: int, horizon: int):
+    """Accumulateurs en tableaux (n, moyenne, m2, m3, m4) par colonne, en une passe."""
+    acc = None
+    for ret in iter_log_returns(prices, block_size, horizon):
+        part = _block_moments(ret)
+        acc = part if acc is None else _merge_moments(acc, part)
+    if acc is None:
+        zeros = np.zeros(_source(prices).shape[1])
+        acc = (zeros.astype(np.int64), zeros, zeros, zeros, zeros)
+    return acc
+
+
+def stream_moments(prices, block_size: int = 65_536, horizon: int = 1):
+    """
+    Moments des log-rendements en une passe : un RunningMoments (série 1-D)
+    ou une liste de RunningMoments (une par colonne, accumulés en tableaux
+    vectorisés sur les colonnes). acc.moments() donne (moyenne, variance,
+    asymétrie, kurtosis) comme empirical_moments.
+    """
+    if _source(prices).ndim == 1:
+        acc = RunningMoments()
+        for ret in iter_log_returns(prices, block_size, horizon):
+            acc.update(ret[~np.isnan(ret)])
+        return acc
+    out = []
+    for n, mean, m2, m3, m4 in zip(*_stream_column_moments(prices, block_size, horizon)):
+        acc = RunningMoments()
+        acc.n, acc.mean, acc.m2, acc.m3, acc.m4 = int(n), float(mean), float(m2), float(m3), float(m4)
+        out.append(acc)
+    return out
+
+
+def stream_gbm_mle(prices, dt: float, block_size: int = 65_536):
+    """gbm_mle_from_prices en flux : (mu_hat, sigma_hat), floats ou tableaux par colonne."""
+    if _source(prices).ndim == 1:
+        acc = stream_moments(prices, block_size)
+        var = acc.var()
+        return float((acc.mean + 0.5 * var) / dt), float(np.sqrt(var / dt))
+    n, mean, m2, _, _ = _stream_column_moments(prices, block_size, 1)
+    with np.errstate(invalid="ignore", divide="ignore"):     # colonne vide -> NaN
+        var = np.where(n > 0, m2 / n, np.nan)
+    return (mean + 0.5 * var) / dt, np.sqrt(var / dt)
+
+
+def stream_var_cvar(prices, horizon: int = 1, alpha: float = 0.95, block_size: int = 65_536,
+                    bins: int = 65_536, max_kept: int = 262_144):
+    """
+    var_cvar_from_prices exact en flux, pour une série 1-D.
+
+    Les statistiques d'ordre encadrant le quantile 1 − alpha sont localisées
+    par histogrammes emboîtés : une passe donne effectif, minimum et maximum
+    de la fenêtre courante, une passe son histogramme en 'bins' classes ; la
+    fenêtre se restreint à la classe contenant les rangs cherchés (séparés
+    s'ils tombent dans deux classes), jusqu'à ce
+    qu'elle compte au plus max_kept rendements (relus et triés) ou qu'ils
+    soient tous égaux (cas des nombreux rendements nuls d'un historique
+    tick). Le quantile est l'interpolation linéaire de np.quantile, la CVaR
+    la moyenne des rendements <= VaR (dernière passe).
+    Mémoire O(block_size + bins + max_kept), quel que soit l'historique.
+    Rendements définis comme dans var_cvar_from_prices (np.diff d'ordre
+    horizon des log-prix).
+    """
+    if _source(prices).ndim != 1:
+        raise ValueError("stream_var_cvar attend une série 1-D (une colonne de prix).")
+
+    def returns():
+        for _, block in iter_blocks(prices, block_size, overlap=horizon):
+            ret = np.diff(np.log(block.astype(float, copy=False)), n=horizon)
+            yield ret[~np.isnan(ret)]
+
+    def window(levels):
+        # rendements de la fenêtre : classe retenue à chaque niveau (a, échelle, classe)
+        for ret in returns():
+            for a, scale, b in levels:
+                ret = ret[np.minimum(((ret - a) * scale).astype(np.int64), bins - 1) == b]
+            yield ret
+
+    def stats(levels):
+        count, lo, hi = 0, np.inf, -np.inf
+        for ret in window(levels):
+            if ret.size:
+                count += ret.size
+                lo, hi = min(lo, float(ret.min())), max(hi, float(ret.max()))
+        return count, lo, hi
+
+    def select(ranks, levels, below, window_stats):
+        """Valeurs des rangs 'ranks' (triés) ; les rangs d'une même classe sont raffinés ensemble."""
+        count, lo, hi = window_stats
+        if lo == hi:
+            return [lo] * len(ranks)
+        if count <= max_kept:
+            kept = np.sort(np.concatenate(list(window(levels))))
+            return [float(kept[r - below]) for r in ranks]
+        scale = bins / (hi - lo)
+        counts = np.zeros(bins, dtype=np.int64)
+        for ret in window(levels):
+            counts += np.bincount(np.minimum(((ret - lo) * scale).astype(np.int64), bins - 1),
+                                  minlength=bins)
+        cum = below + np.cumsum(counts)
+        found = np.searchsorted(cum, ranks, side="right")
+        values = []
+        for b in np.unique(found):
+            group = [r for r, fb in zip(ranks, found) if fb == b]
+            sub = levels + [(lo, scale, int(b))]
+            values += select(group, sub, int(cum[b] - counts[b]), stats(sub))
+        return values
+
+    window_stats = stats([])
+    n = window_stats[0]
+    if n == 0:
+        raise ValueError("aucun rendement disponible.")
+    h = (n - 1) * (1.0 - alpha)
+    k = int(np.floor(h))
+    ranks = [k, k + 1] if k + 1 < n and h > k else [k]
+    x = select(ranks, [], 0, window_stats)
+    q = float(np.quantile([x[0], x[-1]], h - k))
+
+    tail_sum, tail_n = 0.0, 0
+    for ret in returns():
+        tail = ret[ret <= q]
+        tail_sum += float(tail.sum())
+        tail_n += tail.size
+    return q, tail_sum / tail_n
+
+
+def stream_log_return_moments(paths, S0: float, block_size: int = 65_536):
+    """
+    log_return_moments en flux sur une matrice de trajectoires (M, N+1) sur
+    disque (par ex. écrite par simulate_to_file) : seule la colonne S_T est lue.
+    """
+    src = _source(paths)
+    acc = RunningMoments()
+    for start in range(0, len(src), block_size):
+        stop = min(start + block_size, len(src))
+        ST = _read(src, start, stop)[:, -1]
+        acc.update(np.log(ST.astype(float) / S0))
+    return acc.mean, acc.var()
+
+
+# -------------------------------------------------------------------------
+# 4. Écriture des simulations sur disque
+# -------------------------------------------------------------------------
+def simulate_to_file(model, path, T: float, N: int, M: int, chunk_size: int = 100_000,
+                     random_state=None, terminal: bool = False, dtype=np.float64, **kwargs):
+    """
+    Simule M trajectoires par blocs (model.simulate_chunks) et les écrit dans
+    un .npy (np.lib.format.open_memmap) au fil de l'eau : forme
+    batch_shape + (M, N+1), ou batch_shape + (M,) si terminal=True.
+    Mêmes graines par bloc que simulate_chunks. Retourne (t, PriceFile).
+    """
+    batch = tuple(getattr(model, "batch_shape", ()))
+    shape = batch + ((M,) if terminal else (M, N + 1))
+    out = np.lib.format.open_memmap(os.fspath(path), mode="w+", dtype=dtype, shape=shape)
+    i = 0
+    t = np.linspace(0.0, T, N + 1)
+    for block in model.simulate_chunks(T, N, M, chunk_size=chunk_size, random_state=random_state,
+                                       terminal=terminal, **kwargs):
+        if not terminal:
+            t, block = block
+        size = block.shape[len(batch)]
+        out[(slice(None),) * len(batch) + (slice(i, i + size),)] = block
+        out.flush()
+        i += size
+    del out
+    return t, PriceFile(path)
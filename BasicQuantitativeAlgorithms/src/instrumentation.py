@@ -0,0 +1,107 @@
+"""
+Instrumentation légère (chronos et compteurs) activable en production.
+
+Désactivée par défaut : chaque point d'instrumentation ne coûte alors qu'un
+test de booléen. Activation par enable() ou la variable d'environnement
+QUANT_INSTRUMENTATION=1 ; lecture par report(), remise à zéro par reset().
+
+    from instrumentation import instrument, count, timed
+
+    @instrument("pricing.mc")          # durée et nombre d'appels
+    def price(...): ...
+
+    count("mc.paths", M)               # compteur libre
+    with timed("calibration.step"):    # bloc chronométré
+        ...
+"""
+import os
+import threading
+import time
+from contextlib import contextmanager
+from functools import wraps
+
+_enabled = os.environ.get("QUANT_INSTRUMENTATION", "") not in ("", "0")
+_lock = threading.Lock()
+_counters: dict = {}
+_timings: dict = {}
+
+
+def enable():
+    global _enabled
+    _enabled = True
+
+
+def disable():
+    global _enabled
+    _enabled = False
+
+
+def is_enabled() -> bool:
+    return _enabled
+
+
+def count(name: str, n: float = 1):
+    """Incrémente le compteur 'name' de n (sans effet si désactivé)."""
+    if _enabled:
+        with _lock:
+            _counters[name] = _counters.get(name, 0) + n
+
+
+def record(name: str, seconds: float):
+    """Ajoute une durée à la série 'name' : appels, total, min, max."""
+    if not _enabled:
+        return
+    with _lock:
+        stats = _timings.get(name)
+        if stats is None:
+            _timings[name] = [1, seconds, seconds, seconds]
+        else:
+            stats[0] += 1
+            stats[1] += seconds
+            stats[2] = min(stats[2], seconds)
+            stats[3] = max(stats[3], seconds)
+
+
+@contextmanager
+def timed(name: str):
+    """Chronomètre le bloc (time.perf_counter) si l'instrumentation est active."""
+    if not _enabled:
+        yield
+        return
+    t0 = time.perf_counter()
+    try:
+        yield
+    finally:
+        record(name, time.perf_counter() - t0)
+
+
+def instrument(name: str | None = None):
+    """Décorateur : durée et nombre d'appels de la fonction sous 'name' (défaut module.nom)."""
+    def decorator(func):
+        label = name or f"{func.__module__}.{func.__qualname__}"
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            if not _enabled:
+                return func(*args, **kwargs)
+            t0 = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                record(label, time.perf_counter() - t0)
+        return wrapper
+    return decorator
+
+
+def report() -> dict:
+    """Instantané {'counters': {...}, 'timings': {nom: {calls, total, mean, min, max}}}."""
+    with _lock:
+        timings = {k: {"calls": n, "total": tot, "mean": tot / n, "min": lo, "max": hi}
+                   for k, (n, tot, lo, hi) in _timings.items()}
+        return {"counters": dict(_counters), "timings": timings}
+
+
+def reset():
+    with _lock:
+        _counters.clear()
+        _timings.clear()
@@ -1,7 +1,104 @@
 from abc import ABC, abstractmethod
 import numpy as np
 
+
+def block_seeds(random_state, M: int, block_size: int | None):
+    """
+    Découpe M trajectoires en blocs de taille fixe 'block_size', chacun muni de
+    sa propre graine (SeedSequence.spawn). Le découpage ne dépend que de M et
+    block_size : les résultats sont reproductibles quel que soit l'ordre ou le
+    parallélisme d'exécution des blocs. Un bloc unique garde random_state tel quel.
+
+    Retourne une liste de (taille, graine).
+    """
+    if block_size is None or block_size >= M:
+        return [(M, random_state)]
+    n_blocks = -(-M // block_size)
+    sizes = [block_size] * (n_blocks - 1) + [M - block_size * (n_blocks - 1)]
+    if isinstance(random_state, (np.random.Generator, np.random.SeedSequence)):
+        seeds = random_state.spawn(n_blocks)
+    else:
+        seeds = np.random.SeedSequence(random_state).spawn(n_blocks)
+    return list(zip(sizes, seeds))
+
+
+def standard_normal(rng: np.random.Generator, shape, antithetic: bool = False) -> np.ndarray:
+    """
+    Tire des N(0,1) de forme 'shape' (première dimension = trajectoires).
+    En mode antithétique, seule la moitié est tirée et la seconde moitié est
+    son opposé : la trajectoire i et la trajectoire i + M/2 forment une paire.
+    """
+    shape = tuple(np.atleast_1d(shape))
+    if not antithetic:
+        return rng.normal(0.0, 1.0, size=shape)
+    if shape[0] % 2:
+        raise ValueError("M doit être pair en mode antithétique.")
+    Z = rng.normal(0.0, 1.0, size=(shape[0] // 2,) + shape[1:])
+    return np.concatenate([Z, -Z])
+
+
+def as_param(x):
+    """
+    Paramètre de modèle : float si scalaire, tableau si l'on balaie une grille
+    de valeurs (toutes les grilles d'un modèle sont diffusées entre elles).
+    """
+    a = np.asarray(x, dtype=float)
+    return float(a) if a.ndim == 0 else a
+
+
 class PathModel(ABC):
+    # noms des paramètres pouvant être des tableaux (simulation par lots)
+    params: tuple = ()
+    # famille d'estimateurs de grecques Monte Carlo (cf. pricing.greeks.mc_greeks) :
+    # attribut déclaré par le modèle plutôt qu'un test isinstance, les classes
+    # importées via src.models et via models n'étant pas les mêmes objets
+    greeks_family: str | None = None
+    # volatilité constante du log-prix quand celui-ci est un brownien à dérive
+    # (GBM), None sinon : condition de la correction de pont brownien des barrières
+    diffusion_vol = None
+
+    @property
+    def batch_shape(self) -> tuple:
+        """
+        Forme du lot de jeux de paramètres (() pour un modèle scalaire). Un
+        modèle par lots simule tous les jeux en un appel, avec les mêmes
+        nombres aléatoires (CRN) : les sorties ont la forme batch_shape + (M, ...).
+        """
+        return np.broadcast_shapes(*(np.shape(getattr(self, name)) for name in self.params))
+
+    @staticmethod
+    def _batched(x, ndim: int):
+        # ajoute 'ndim' axes à droite d'un paramètre tableau (trajectoires, pas)
+        return x if np.ndim(x) == 0 else np.reshape(x, np.shape(x) + (1,) * ndim)
+
     @abstractmethod
-    def simulate(self, T: float, N: int, M: int, random_state=None) -> tuple[np.ndarray, np.ndarray]:
-        raise NotImplementedError
\ No newline at end of file
+    def simulate(self, T: float, N: int, M: int, random_state=None,
+                 antithetic: bool = False) -> tuple[np.ndarray, np.ndarray]:
+        raise NotImplementedError
+
+    def simulate_terminal(self, T: float, N: int, M: int, random_state=None, **kwargs) -> np.ndarray:
+        """
+        Valeurs terminales S_T (taille M) sans matrice de chemins.
+        Implémentation par défaut via simulate ; les modèles la surchargent.
+        """
+        return self.simulate(T, N, M, random_state=random_state, **kwargs)[1][:, -1]
+
+    def expected_terminal(self, T: float, N: int) -> float:
+        """
+        E[S_T] exact pour le schéma de simulation (N pas) : sert de variable
+        de contrôle et de cible au moment matching.
+        """
+        raise NotImplementedError
+
+    def simulate_chunks(self, T: float, N: int, M: int, chunk_size: int | None = 100_000,
+                        random_state=None, terminal: bool = False, **kwargs):
+        """
+        Générateur de blocs de trajectoires : mémoire bornée par chunk_size
+        quel que soit M. Produit (t, S_bloc) ou, si terminal=True, S_T du bloc.
+        Les options supplémentaires (antithetic, ...) sont transmises au modèle.
+        """
+        for size, seed in block_seeds(random_state, M, chunk_size):
+            if terminal:
+                yield self.simulate_terminal(T, N, size, random_state=seed, **kwargs)
+            else:
+                yield self.simulate(T, N, size, random_state=seed, **kwargs)
@@ -1,24 +1,69 @@
 import numpy as np
-from .base_model import PathModel
+from .base_model import PathModel, as_param, standard_normal
+from .qmc import sobol_normal, brownian_bridge
 
 class GBM(PathModel):
     """Mouvement brownien géométrique (Black–Scholes)
     dS_t = μ S_t dt + σ S_t dW_t
+
+    mu, sigma, S0 peuvent être des tableaux : les trajectoires de tous les jeux
+    de paramètres partagent le même brownien, S est de forme batch_shape + (M, N+1).
     """
+    params = ("mu", "sigma", "S0")
+    greeks_family = "gbm"
 
     def __init__(self, mu: float, sigma: float, S0: float):
-        self.mu = float(mu)
-        self.sigma = float(sigma)
-        self.S0 = float(S0)
+        self.mu = as_param(mu)
+        self.sigma = as_param(sigma)
+        self.S0 = as_param(S0)
+
+    @property
+    def diffusion_vol(self):
+        """Volatilité σ du log-prix, brownien à dérive entre deux dates."""
+        return self.sigma
 
-    def simulate(self, T: float, N: int, M: int, random_state=None):
-        """Simule M trajectoires de longueur N sur [0,T]."""
+    def simulate(self, T: float, N: int, M: int, random_state=None, antithetic: bool = False,
+                 sampler: str = "pseudo"):
+        """
+        Simule M trajectoires de longueur N sur [0,T] (antithetic : paires (Z, -Z)).
+        sampler='sobol' : normales de Sobol brouillées et pont brownien (QMC).
+        """
         rng = np.random.default_rng(random_state)
         dt = T / N
         t = np.linspace(0.0, T, N + 1)
-        dW = rng.normal(0.0, np.sqrt(dt), size=(M, N))
-        W = np.cumsum(dW, axis=1)
-        W = np.concatenate([np.zeros((M, 1)), W], axis=1)
-        drift = (self.mu - 0.5 * self.sigma ** 2) * t
-        S = self.S0 * np.exp(drift + self.sigma * W)
+        # Un seul tableau (M, N+1) : W cumulé en place, puis exponentielle en place
+        if sampler == "sobol":
+            if antithetic:
+                raise ValueError("antithetic n'est pas compatible avec sampler='sobol'.")
+            S = brownian_bridge(sobol_normal(M, N, rng), t)
+        elif sampler == "pseudo":
+            S = np.empty((M, N + 1), dtype=float)
+            S[:, 0] = 0.0
+            np.cumsum(np.sqrt(dt) * standard_normal(rng, (M, N), antithetic), axis=1, out=S[:, 1:])
+        else:
+            raise ValueError("sampler doit être 'pseudo' ou 'sobol'.")
+        if self.batch_shape:
+            drift = self._batched(self.mu - 0.5 * self.sigma ** 2, 2)
+            return t, self._batched(self.S0, 2) * np.exp(self._batched(self.sigma, 2) * S + drift * t)
+        S *= self.sigma
+        S += (self.mu - 0.5 * self.sigma ** 2) * t
+        np.exp(S, out=S)
+        S *= self.S0
         return t, S
+
+    def simulate_terminal(self, T: float, N: int, M: int, random_state=None, antithetic: bool = False,
+                          sampler: str = "pseudo"):
+        """S_T exact en un tirage par trajectoire (N est ignoré)."""
+        rng = np.random.default_rng(random_state)
+        if sampler == "sobol":
+            if antithetic:
+                raise ValueError("antithetic n'est pas compatible avec sampler='sobol'.")
+            Z = sobol_normal(M, 1, rng)[:, 0]
+        else:
+            Z = standard_normal(rng, M, antithetic)
+        drift = self._batched((self.mu - 0.5 * self.sigma ** 2) * T, 1)
+        vol = self._batched(self.sigma * np.sqrt(T), 1)
+        return self._batched(self.S0, 1) * np.exp(drift + vol * Z)
+
+    def expected_terminal(self, T: float, N: int = 1) -> float:
+        return self.S0 * np.exp(self.mu * T)
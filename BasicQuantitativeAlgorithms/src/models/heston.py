@@ -1,48 +1,297 @@
 import numpy as np
-from .base_model import PathModel
+from scipy.special import ndtr
+from .base_model import PathModel, as_param
+from .qmc import sobol_normal, brownian_bridge
+
+SCHEMES = ("euler", "log_euler", "qe")
+
 
 class Heston(PathModel):
-    def __init__(self, kappa: float, theta: float, xi: float, rho: float, v0: float, S0: float, mu: float = 0.0):
-        self.kappa = float(kappa)
-        self.theta = float(theta)
-        self.xi = float(xi)
-        self.rho = float(rho)
-        self.v0 = float(v0)
-        self.S0 = float(S0)
-        self.mu = float(mu)
-        if not -1.0 <= self.rho <= 1.0:
+    """
+    Modèle de Heston
+    dS_t = μ S_t dt + √v_t S_t dW1_t
+    dv_t = κ(θ − v_t) dt + ξ √v_t dW2_t,   d<W1, W2>_t = ρ dt
+
+    Schémas de discrétisation (scheme) :
+    - 'euler'     : Euler à troncature complète sur S et v (schéma historique) ;
+    - 'log_euler' : Euler sur log S (martingale exacte pas à pas), v tronqué ;
+    - 'qe'        : Quadratic-Exponential d'Andersen (2008) pour v, log S par
+      schéma centré avec correction de martingale : autorise de grands pas.
+
+    Les paramètres peuvent être des tableaux (grille de scénarios) : simulate
+    et simulate_terminal traitent tous les jeux en un appel avec les mêmes
+    normales, sorties de forme batch_shape + (M, ...).
+    """
+    params = ("kappa", "theta", "xi", "rho", "v0", "S0", "mu")
+    greeks_family = "heston"
+
+    def __init__(self, kappa: float, theta: float, xi: float, rho: float, v0: float, S0: float, mu: float = 0.0,
+                 scheme: str = "euler"):
+        self.kappa = as_param(kappa)
+        self.theta = as_param(theta)
+        self.xi = as_param(xi)
+        self.rho = as_param(rho)
+        self.v0 = as_param(v0)
+        self.S0 = as_param(S0)
+        self.mu = as_param(mu)
+        self.scheme = scheme
+        if not np.all((-1.0 <= self.rho) & (self.rho <= 1.0)):
             raise ValueError("rho doit être dans [-1, 1].")
+        if scheme not in SCHEMES:
+            raise ValueError(f"scheme doit être parmi {SCHEMES}.")
 
-    def simulate(self, T: float, N: int, M: int, random_state=None):
-        rng = np.random.default_rng(random_state)
+    def _normal_blocks(self, rng, T, N, M, antithetic, sampler, block_steps):
+        """
+        Générateur de blocs de normales de forme (B, 2, M) : [:, 0] = Z1, [:, 1] = Z2,
+        B <= block_steps pas par bloc (un seul appel au générateur par bloc).
+        'pseudo' : même flux que des tirages pas à pas (Z1 puis Z2) ;
+        'sobol' : Sobol de dimension 2N entrelacée (W1, W2) construite par pont
+        brownien, puis ramenée en incréments normés.
+        """
+        if sampler == "pseudo":
+            for k0 in range(0, N, block_steps):
+                B = min(block_steps, N - k0)
+                if not antithetic:
+                    yield rng.normal(0.0, 1.0, size=(B, 2, M))
+                elif M % 2:
+                    raise ValueError("M doit être pair en mode antithétique.")
+                else:
+                    Z = rng.normal(0.0, 1.0, size=(B, 2, M // 2))
+                    yield np.concatenate([Z, -Z], axis=2)
+        elif sampler == "sobol":
+            if antithetic:
+                raise ValueError("antithetic n'est pas compatible avec sampler='sobol'.")
+            t = np.linspace(0.0, T, N + 1)
+            U = sobol_normal(M, 2 * N, rng)
+            scale = 1.0 / np.sqrt(T / N)
+            Z = np.empty((N, 2, M))
+            Z[:, 0] = np.diff(brownian_bridge(U[:, 0::2], t), axis=1).T * scale
+            Z[:, 1] = np.diff(brownian_bridge(U[:, 1::2], t), axis=1).T * scale
+            for k0 in range(0, N, block_steps):
+                yield Z[k0:k0 + block_steps]
+        else:
+            raise ValueError("sampler doit être 'pseudo' ou 'sobol'.")
+
+    def _qe_step(self, v, Zv, theta, E, c1, c2):
+        """
+        Pas Quadratic-Exponential d'Andersen pour la variance.
+        Retourne v_{k+1} et les paramètres (ψ, a, b², p, β) de la loi utilisée,
+        nécessaires à la correction de martingale de log S.
+        """
+        with np.errstate(divide="ignore", invalid="ignore"):
+            m = theta + (v - theta) * E
+            psi = (v * c1 + c2) / (m * m)
+            inv = 2.0 / psi
+            b2 = inv - 1.0 + np.sqrt(inv) * np.sqrt(np.maximum(inv - 1.0, 0.0))
+            a = m / (1.0 + b2)
+            p = (psi - 1.0) / (psi + 1.0)
+            beta = (1.0 - p) / m
+            U = ndtr(Zv)
+            v_quad = a * (np.sqrt(b2) + Zv) ** 2
+            v_exp = np.where(U <= p, 0.0, np.log((1.0 - p) / (1.0 - U)) / beta)
+        quad = psi <= 1.5
+        return np.where(quad, v_quad, v_exp), quad, a, b2, p, beta
+
+    def _run(self, T, N, M, rng, antithetic, sampler, scheme, block_steps, S_out=None, v_out=None,
+             int_v=None, int_dw=None):
+        """
+        Moteur commun : état (S ou log S, v) de forme batch_shape + (M,) mis à jour
+        en place, normales tirées par blocs de pas (communes à tout le lot),
+        colonnes k+1 de S_out / v_out remplies si fournies, somme des v_k (point
+        gauche) accumulée dans int_v si fourni, et pour les schémas d'Euler somme
+        des √v_k Zv_k dans int_dw si fourni. Retourne (S_T, v_T).
+        """
+        scheme = self.scheme if scheme is None else scheme
+        if scheme not in SCHEMES:
+            raise ValueError(f"scheme doit être parmi {SCHEMES}.")
+        kappa, theta, xi, rho, mu, S0, v0 = (self._batched(getattr(self, name), 1)
+                                             for name in ("kappa", "theta", "xi", "rho", "mu", "S0", "v0"))
         dt = T / N
+        sqrt_dt = np.sqrt(dt)
+        rho_b = self._batched(self.rho, 2)                   # axes (pas, trajectoires)
+        rho_c = np.sqrt(np.maximum(1.0 - rho_b ** 2, 0.0))
+        log_state = scheme != "euler"
+
+        shape = self.batch_shape + (M,)
+        X = np.full(shape, 0.0)
+        X += np.log(S0) if log_state else S0                 # log S ou S
+        v = np.full(shape, 0.0)
+        v += v0
+        sv = np.empty(shape)
+        tmp = np.empty(shape)
+
+        if scheme == "qe":
+            E = np.exp(-kappa * dt)
+            c1 = xi ** 2 * E * (1.0 - E) / kappa
+            c2 = theta * xi ** 2 * (1.0 - E) ** 2 / (2.0 * kappa)
+            K0 = -rho * kappa * theta * dt / xi
+            K1 = 0.5 * dt * (kappa * rho / xi - 0.5) - rho / xi
+            K2 = 0.5 * dt * (kappa * rho / xi - 0.5) + rho / xi
+            K3 = K4 = 0.5 * dt * (1.0 - rho ** 2)
+            A = K2 + 0.5 * K4
+
+        k = 0
+        for Zb in self._normal_blocks(rng, T, N, M, antithetic, sampler, block_steps):
+            if scheme != "qe":
+                # bruit de v, par bloc : forme batch_shape + (B, M)
+                Zv_b = rho_b * Zb[:, 0] + rho_c * Zb[:, 1]
+            for j in range(Zb.shape[0]):
+                Z1 = Zb[j, 0]
+                if int_v is not None:
+                    int_v += v
+                if scheme == "qe":
+                    v_new, quad, a, b2, p, beta = self._qe_step(v, Zb[j, 1], theta, E, c1, c2)
+                    # correction de martingale : E[S_{k+1} / S_k | v_k] = exp(μ dt)
+                    with np.errstate(divide="ignore", invalid="ignore"):
+                        k0_star = np.where(quad,
+                                           -A * b2 * a / (1.0 - 2.0 * A * a) + 0.5 * np.log(1.0 - 2.0 * A * a),
+                                           -np.log(p + beta * (1.0 - p) / (beta - A)))
+                    k0_star = np.where(np.isfinite(k0_star), k0_star - (K1 + 0.5 * K3) * v, K0)
+                    np.sqrt(K3 * v + K4 * v_new, out=sv)
+                    np.multiply(sv, Z1, out=tmp)
+                    tmp += mu * dt
+                    tmp += k0_star
+                    tmp += K1 * v
+                    tmp += K2 * v_new
+                    X += tmp
+                    v = v_new
+                else:
+                    np.sqrt(v, out=sv)                      # v est déjà tronqué à 0
+                    np.multiply(sv, Z1, out=tmp)
+                    tmp *= sqrt_dt
+                    tmp += mu * dt
+                    if log_state:
+                        tmp -= (0.5 * dt) * v
+                        X += tmp
+                    else:
+                        tmp *= X
+                        X += tmp
+                    # v <- max(v + κ(θ − v)dt + ξ √v √dt Zv, 0), en place
+                    np.multiply(sv, Zv_b[..., j, :], out=tmp)
+                    if int_dw is not None:
+                        int_dw += tmp
+                    tmp *= xi * sqrt_dt
+                    v *= 1.0 - kappa * dt
+                    v += kappa * theta * dt
+                    v += tmp
+                    np.maximum(v, 0.0, out=v)
+                k += 1
+                if S_out is not None:
+                    if log_state:
+                        np.exp(X, out=S_out[..., k])
+                    else:
+                        S_out[..., k] = X
+                if v_out is not None:
+                    v_out[..., k] = v
+        return (np.exp(X) if log_state else X), v
+
+    def simulate(self, T: float, N: int, M: int, random_state=None, antithetic: bool = False,
+                 sampler: str = "pseudo", scheme: str | None = None, return_variance: bool = False,
+                 block_steps: int = 64):
+        """
+        Simule M trajectoires sur N pas. Retourne (t, S), ou (t, S, v) si
+        return_variance=True (sinon la matrice des variances n'est jamais allouée).
+        scheme : surcharge ponctuelle du schéma du modèle.
+        """
+        rng = np.random.default_rng(random_state)
         t = np.linspace(0.0, T, N + 1)
+        shape = self.batch_shape + (M, N + 1)
+        S = np.empty(shape, dtype=float)
+        S[..., 0] = self._batched(self.S0, 1)
+        v = None
+        if return_variance:
+            v = np.empty(shape, dtype=float)
+            v[..., 0] = self._batched(self.v0, 1)
+        self._run(T, N, M, rng, antithetic, sampler, scheme, block_steps, S_out=S, v_out=v)
+        return (t, S, v) if return_variance else (t, S)
 
-        S = np.empty((M, N + 1), dtype=float)
-        v = np.empty((M, N + 1), dtype=float)
-        S[:, 0] = self.S0
-        v[:, 0] = self.v0
+    def simulate_terminal(self, T: float, N: int, M: int, random_state=None, antithetic: bool = False,
+                          sampler: str = "pseudo", scheme: str | None = None, block_steps: int = 64):
+        """S_T seul : même moteur et même flux aléatoire que simulate, état (S, v) en O(M)."""
+        rng = np.random.default_rng(random_state)
+        return self._run(T, N, M, rng, antithetic, sampler, scheme, block_steps)[0]
 
-        sqrt_dt = np.sqrt(dt)
-        rho = self.rho
-        xi = self.xi
-        kappa = self.kappa
-        theta = self.theta
+    def simulate_variance(self, T: float, N: int, M: int, random_state=None, antithetic: bool = False,
+                          sampler: str = "pseudo", scheme: str | None = None, block_steps: int = 64):
+        """
+        (v_T, ∫_0^T v_t dt, ∫_0^T √v_t dW^v_t) par trajectoire, même flux aléatoire
+        que simulate, sans matrice de chemins : base des estimateurs conditionnels
+        à la trajectoire de variance (Romano–Touzi). Intégrales par sommes à
+        gauche ; pour 'qe' (pas de brownien de v explicite), la seconde vient de
+        l'identité ξ∫√v dW^v = v_T − v0 − κθT + κ∫v dt.
+        """
+        scheme = self.scheme if scheme is None else scheme
+        rng = np.random.default_rng(random_state)
+        dt = T / N
+        int_v = np.zeros(self.batch_shape + (M,))
+        int_dw = np.zeros(self.batch_shape + (M,)) if scheme != "qe" else None
+        _, v_T = self._run(T, N, M, rng, antithetic, sampler, scheme, block_steps, int_v=int_v, int_dw=int_dw)
+        int_v *= dt
+        if int_dw is None:
+            kappa, theta, xi, v0 = (self._batched(getattr(self, name), 1) for name in ("kappa", "theta", "xi", "v0"))
+            return v_T, int_v, (v_T - v0 - kappa * theta * T + kappa * int_v) / xi
+        return v_T, int_v, int_dw * np.sqrt(dt)
 
-        for k in range(N):
-            Z1 = rng.normal(0.0, 1.0, size=M)
-            Z2 = rng.normal(0.0, 1.0, size=M)
-            dW1 = sqrt_dt * Z1
-            dW2 = sqrt_dt * (rho * Z1 + np.sqrt(max(1.0 - rho ** 2, 0.0)) * Z2)
+    def expected_terminal(self, T: float, N: int) -> float:
+        if self.scheme == "euler":
+            # Euler : E[S_{k+1}] = (1 + mu·dt) E[S_k]
+            return self.S0 * (1.0 + self.mu * T / N) ** N
+        # log-Euler et QE corrigé sont des martingales exactes (à la dérive près)
+        return self.S0 * np.exp(self.mu * T)
 
-            v_prev = np.maximum(v[:, k], 0.0)
-            v_new = v_prev + kappa * (theta - v_prev) * dt + xi * np.sqrt(v_prev) * dW2
-            v_new = np.maximum(v_new, 0.0)
+    def characteristic_function(self, u, T, r: float | None = None):
+        """
+        Fonction caractéristique de log(S_T / S_0), E[exp(iu log(S_T/S_0))],
+        forme « little trap » d'Albrecher et al. (stable numériquement).
+        r : dérive risque-neutre (par défaut mu). u et T diffusés (numpy).
+        """
+        mu = self.mu if r is None else r
+        u = np.asarray(u, dtype=complex)
+        kappa, theta, xi, rho, v0 = self.kappa, self.theta, self.xi, self.rho, self.v0
+        iu = 1j * u
+        beta = kappa - rho * xi * iu
+        d = np.sqrt(beta * beta + xi ** 2 * (iu + u * u))
+        g = (beta - d) / (beta + d)
+        E = np.exp(-d * T)
+        A = kappa * theta / xi ** 2 * ((beta - d) * T - 2.0 * np.log((1.0 - g * E) / (1.0 - g)))
+        B = v0 / xi ** 2 * (beta - d) * (1.0 - E) / (1.0 - g * E)
+        return np.exp(iu * mu * T + A + B)
 
-            S_prev = S[:, k]
-            S_new = S_prev + self.mu * S_prev * dt + np.sqrt(v_prev) * S_prev * dW1
+    def characteristic_function_grad(self, u, T, r: float | None = None):
+        """
+        φ(u) et son gradient analytique par rapport à (kappa, theta, xi, rho, v0),
+        dérivée de la forme « little trap » (règle de chaîne sur β, d, g, e^{−dT}).
+        Retourne (phi, dphi) avec dphi de forme (5,) + forme de phi.
+        """
+        mu = self.mu if r is None else r
+        u, T = np.broadcast_arrays(np.asarray(u, dtype=complex), np.asarray(T, dtype=float))
+        kappa, theta, xi, rho, v0 = self.kappa, self.theta, self.xi, self.rho, self.v0
+        iu = 1j * u
+        zero = np.zeros_like(u)
+        one = np.ones_like(u)
 
-            v[:, k + 1] = v_new
-            S[:, k + 1] = S_new
+        beta = kappa - rho * xi * iu
+        d = np.sqrt(beta * beta + xi ** 2 * (iu + u * u))
+        g = (beta - d) / (beta + d)
+        E = np.exp(-d * T)
+        Lg = np.log((1.0 - g * E) / (1.0 - g))
+        P = (beta - d) * T - 2.0 * Lg
+        Q = (beta - d) * (1.0 - E) / (1.0 - g * E)
+        cA = kappa * theta / xi ** 2
+        cB = v0 / xi ** 2
+        phi = np.exp(iu * mu * T + cA * P + cB * Q)
 
-        return t, S
\ No newline at end of file
+        d_beta = np.stack([one, zero, -rho * iu, -xi * iu, zero])
+        d_xi = np.stack([zero, zero, one, zero, zero])
+        d_d = (beta * d_beta + xi * (iu + u * u) * d_xi) / d
+        d_g = 2.0 * (d * d_beta - beta * d_d) / (beta + d) ** 2
+        d_E = -T * E * d_d
+        d_Lg = -(d_g * E + g * d_E) / (1.0 - g * E) + d_g / (1.0 - g)
+        d_P = (d_beta - d_d) * T - 2.0 * d_Lg
+        d_Q = (((d_beta - d_d) * (1.0 - E) - (beta - d) * d_E) / (1.0 - g * E)
+               + (beta - d) * (1.0 - E) * (d_g * E + g * d_E) / (1.0 - g * E) ** 2)
+        d_cA = np.array([theta / xi ** 2, kappa / xi ** 2, -2.0 * kappa * theta / xi ** 3, 0.0, 0.0])
+        d_cB = np.array([0.0, 0.0, -2.0 * v0 / xi ** 3, 0.0, 1.0 / xi ** 2])
+        expand = (slice(None),) + (None,) * u.ndim
+        d_log_phi = d_cA[expand] * P + cA * d_P + d_cB[expand] * Q + cB * d_Q
+        return phi, phi * d_log_phi
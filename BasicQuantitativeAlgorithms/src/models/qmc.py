@@ -0,0 +1,57 @@
+"""
+Quasi-Monte Carlo : normales de Sobol brouillées et construction par pont brownien.
+"""
+import warnings
+import numpy as np
+from scipy.special import ndtri
+from scipy.stats import qmc
+
+
+def sobol_normal(M: int, d: int, random_state=None) -> np.ndarray:
+    """
+    M points d'une suite de Sobol brouillée (Owen) en dimension d, transformés
+    en N(0,1) par la fonction quantile. M puissance de 2 conseillé (équilibre de la suite).
+    Un brouillage différent par graine : base du QMC randomisé.
+    """
+    rng = np.random.default_rng(random_state)
+    sampler = qmc.Sobol(d=d, scramble=True, seed=rng)
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", UserWarning)   # M non puissance de 2
+        u = sampler.random(M)
+    eps = np.finfo(float).eps
+    return ndtri(np.clip(u, eps, 1.0 - eps))
+
+
+def _bridge_plan(N: int):
+    # ordre de construction : W_N puis milieux successifs (parcours en largeur)
+    plan = [(N, 0, None)]
+    queue = [(0, N)]
+    while queue:
+        left, right = queue.pop(0)
+        if right - left < 2:
+            continue
+        mid = (left + right) // 2
+        plan.append((mid, left, right))
+        queue += [(left, mid), (mid, right)]
+    return plan
+
+
+def brownian_bridge(Z: np.ndarray, t: np.ndarray) -> np.ndarray:
+    """
+    Construit W (M, N+1) aux dates t (t[0] = 0) à partir de Z (M, N) par pont
+    brownien : la colonne 0 de Z fixe W_T, les suivantes les milieux successifs.
+    Les premières dimensions (les mieux réparties d'une suite de Sobol) portent
+    ainsi l'essentiel de la variance du chemin.
+    """
+    M, N = Z.shape
+    W = np.zeros((M, N + 1), dtype=float)
+    for k, (j, left, right) in enumerate(_bridge_plan(N)):
+        if right is None:
+            W[:, j] = np.sqrt(t[j] - t[left]) * Z[:, k]
+            continue
+        span = t[right] - t[left]
+        wl = (t[right] - t[j]) / span
+        wr = (t[j] - t[left]) / span
+        std = np.sqrt((t[j] - t[left]) * (t[right] - t[j]) / span)
+        W[:, j] = wl * W[:, left] + wr * W[:, right] + std * Z[:, k]
+    return W
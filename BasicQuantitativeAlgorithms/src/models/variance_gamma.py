@@ -1,26 +1,117 @@
 import numpy as np
-from .base_model import PathModel
+from .base_model import PathModel, as_param, standard_normal
+
+SAMPLERS = ("gamma", "dog")
+
 
 class VarianceGamma(PathModel):
-    def __init__(self, theta: float, sigma: float, nu: float, S0: float):
-        self.theta = float(theta)
-        self.sigma = float(sigma)
+    """
+    Variance Gamma : X_t = θ G_t + σ W_{G_t}, G subordinateur gamma de variance ν,
+    S_t = S0 exp(ω_μ t + X_t).
+
+    mu=None : pas de dérive (ω_μ = 0, loi historique du modèle) ; sinon
+    ω_μ = μ + ω avec ω = log(1 − θν − σ²ν/2)/ν (correction de martingale), de
+    sorte que E[S_t] = S0 e^{μt} : mu = r donne la dynamique risque-neutre.
+
+    Échantillonneurs (sampler) :
+    - 'gamma' : brownien changé de temps (incréments gamma puis normaux) ;
+    - 'dog'   : différence de deux gammas, X = Γ+ − Γ− (Madan, Carr & Chang).
+
+    theta, sigma, S0, mu peuvent être des tableaux (lots à nombres aléatoires
+    communs) ; nu fixe la loi des tirages gamma et reste scalaire.
+    """
+    params = ("theta", "sigma", "S0", "mu")
+    greeks_family = "variance_gamma"
+
+    def __init__(self, theta: float, sigma: float, nu: float, S0: float, mu: float | None = None):
+        self.theta = as_param(theta)
+        self.sigma = as_param(sigma)
         self.nu = float(nu)
-        self.S0 = float(S0)
-    def simulate(self, T: float, N: int, M: int, random_state=None):
+        self.S0 = as_param(S0)
+        self.mu = None if mu is None else as_param(mu)
+        if mu is not None and np.any(1.0 - self.theta * self.nu - 0.5 * self.sigma ** 2 * self.nu <= 0):
+            raise ValueError("E[S_T] infinie : il faut 1 − θν − σ²ν/2 > 0.")
+
+    @property
+    def omega(self):
+        """Correction de martingale ω = log(1 − θν − σ²ν/2)/ν."""
+        return np.log(1.0 - self.theta * self.nu - 0.5 * self.sigma ** 2 * self.nu) / self.nu
+
+    @property
+    def drift(self):
+        """Dérive de log S ajoutée à X_t : 0 si mu=None, μ + ω sinon."""
+        return 0.0 if self.mu is None else self.mu + self.omega
+
+    def _gamma(self, rng, shape, size, antithetic):
+        # incréments du subordinateur (loi Gamma(shape, ν)), communs aux deux
+        # membres d'une paire antithétique
+        size = tuple(np.atleast_1d(size))
+        if not antithetic:
+            return rng.gamma(shape=shape, scale=self.nu, size=size)
+        dG = rng.gamma(shape=shape, scale=self.nu, size=(size[0] // 2,) + size[1:])
+        return np.concatenate([dG, dG])
+
+    def _increments(self, rng, dt, size, antithetic, sampler):
+        """Incréments de X sur des pas dt, tirés en bloc : forme batch_shape + size."""
+        ndim = len(size)
+        if sampler == "gamma":
+            dG = self._gamma(rng, dt / self.nu, size, antithetic)
+            dW = standard_normal(rng, size, antithetic)
+            dW *= np.sqrt(dG)
+            return self._batched(self.theta, ndim) * dG + self._batched(self.sigma, ndim) * dW
+        if sampler == "dog":
+            if antithetic:
+                raise ValueError("antithetic n'est pas compatible avec sampler='dog'.")
+            # Γ± ~ Gamma(dt/ν, μ± ν), μ± = ½√(θ² + 2σ²/ν) ± θ/2 ; gammas unitaires
+            # tirés une fois puis mis à l'échelle (nombres communs à tout le lot)
+            half = 0.5 * np.sqrt(self.theta ** 2 + 2.0 * self.sigma ** 2 / self.nu)
+            G_plus = rng.gamma(shape=dt / self.nu, scale=1.0, size=size)
+            G_minus = rng.gamma(shape=dt / self.nu, scale=1.0, size=size)
+            return (self._batched((half + 0.5 * self.theta) * self.nu, ndim) * G_plus
+                    - self._batched((half - 0.5 * self.theta) * self.nu, ndim) * G_minus)
+        raise ValueError(f"sampler doit être parmi {SAMPLERS}.")
+
+    def simulate(self, T: float, N: int, M: int, random_state=None, antithetic: bool = False,
+                 sampler: str = "gamma"):
+        """
+        Simule M trajectoires sur N pas : incréments tirés en un bloc (M, N) puis
+        cumulés (cumsum), sans boucle sur les pas.
+        """
         rng = np.random.default_rng(random_state)
         dt = T / N
         t = np.linspace(0.0, T, N + 1)
+        dX = self._increments(rng, dt, (M, N), antithetic, sampler)
+        np.cumsum(dX, axis=-1, out=dX)
+
+        S = np.empty(self.batch_shape + (M, N + 1), dtype=float)
+        S[..., 0] = 0.0
+        S[..., 1:] = dX
+        S += self._batched(self.drift, 2) * t
+        np.exp(S, out=S)
+        S *= self._batched(self.S0, 2)
+        return t, S
 
-        shape = dt / self.nu
-        scale = self.nu
+    def simulate_terminal(self, T: float, N: int, M: int, random_state=None, antithetic: bool = False,
+                          sampler: str = "gamma"):
+        """S_T exact : un seul tirage de la loi VG sur [0, T] (G_T ~ Gamma(T/ν, ν)), N est ignoré."""
+        rng = np.random.default_rng(random_state)
+        X = self._increments(rng, T, (M,), antithetic, sampler)
+        return self._batched(self.S0, 1) * np.exp(self._batched(self.drift * T, 1) + X)
 
-        X = np.zeros((M, N + 1), dtype=float)
-        for k in range(N):
-            dG = rng.gamma(shape=shape, scale=scale, size=M)
-            dW = rng.normal(0.0, 1.0, size=M)
-            dX = self.theta * dG + self.sigma * np.sqrt(dG) * dW
-            X[:, k + 1] = X[:, k] + dX
+    def expected_terminal(self, T: float, N: int = 1) -> float:
+        if self.mu is not None:
+            return self.S0 * np.exp(self.mu * T)
+        # E[exp(X_T)] = (1 - θν - σ²ν/2)^(-T/ν)
+        return self.S0 * (1.0 - self.theta * self.nu - 0.5 * self.sigma ** 2 * self.nu) ** (-T / self.nu)
 
-        S = self.S0 * np.exp(X)
-        return t, S
\ No newline at end of file
+    def characteristic_function(self, u, T, r: float | None = None):
+        """
+        Fonction caractéristique de log(S_T / S_0) :
+        (1 − iuθν + σ²νu²/2)^(−T/ν), multipliée si r est donné par
+        exp(iu(r + ω)T), ω = log(1 − θν − σ²ν/2)/ν (correction de martingale,
+        E[S_T] = S_0 e^{rT}), sinon par exp(iu·drift·T) (loi de simulate).
+        """
+        u = np.asarray(u, dtype=complex)
+        phi = (1.0 - 1j * u * self.theta * self.nu + 0.5 * self.sigma ** 2 * self.nu * u * u) ** (-T / self.nu)
+        drift = self.drift if r is None else r + self.omega
+        return phi * np.exp(1j * u * drift * T)
@@ -0,0 +1,60 @@
+"""
+Moteur Monte Carlo parallèle (threads ou processus).
+
+Les M trajectoires sont découpées en blocs de taille fixe (models.base_model.block_seeds),
+chacun avec son flux aléatoire SeedSequence.spawn. Les blocs sont répartis sur
+le pool puis les résultats fusionnés dans l'ordre des blocs : pour une graine et
+une taille de bloc données, le résultat est identique au bit près quel que soit
+le nombre de workers.
+"""
+import os
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+from functools import partial
+
+import numpy as np
+from models.base_model import block_seeds
+
+
+def map_blocks(func, blocks, n_workers: int | None = 1, backend: str = "thread"):
+    """
+    Applique func(size, seed) à chaque bloc (liste de (taille, graine)) et
+    retourne la liste des résultats dans l'ordre des blocs.
+    backend : 'thread' (numpy libère le GIL sur les gros tableaux) ou 'process'
+    (func et ses arguments doivent alors être picklables).
+    """
+    if n_workers is None:
+        n_workers = os.cpu_count() or 1
+    n_workers = min(n_workers, len(blocks))
+    if n_workers <= 1:
+        return [func(size, seed) for size, seed in blocks]
+    if backend == "thread":
+        Executor = ThreadPoolExecutor
+    elif backend == "process":
+        Executor = ProcessPoolExecutor
+    else:
+        raise ValueError("backend doit être 'thread' ou 'process'.")
+    sizes, seeds = zip(*blocks)
+    with Executor(max_workers=n_workers) as ex:
+        return list(ex.map(func, sizes, seeds))
+
+
+def _simulate_block(model, T, N, terminal, kwargs, size, seed):
+    if terminal:
+        return model.simulate_terminal(T, N, size, random_state=seed, **kwargs)
+    return model.simulate(T, N, size, random_state=seed, **kwargs)
+
+
+def parallel_simulate(model, T: float, N: int, M: int, block_size: int | None = 100_000,
+                      random_state=None, n_workers: int | None = None, backend: str = "thread",
+                      terminal: bool = False, **kwargs):
+    """
+    Simule M trajectoires d'un PathModel quelconque en parallèle.
+    Résultat identique à la concaténation de model.simulate_chunks(...) avec
+    chunk_size=block_size : (t, S) ou S_T si terminal=True.
+    """
+    blocks = block_seeds(random_state, M, block_size)
+    func = partial(_simulate_block, model, T, N, terminal, kwargs)
+    parts = map_blocks(func, blocks, n_workers=n_workers, backend=backend)
+    if terminal:
+        return np.concatenate(parts)
+    return parts[0][0], np.concatenate([S for _, S in parts])
@@ -1,19 +1,52 @@
-import math
-
-def _N(x: float) -> float:
-    # CDF de la loi normale standard via erf
-    return 0.5 * (1.0 + math.erf(x / math.sqrt(2.0)))
-
-def bs_call(S0: float, K: float, T: float, r: float, sigma: float) -> float:
-    if T <= 0 or sigma <= 0:
-        return max(0.0, S0 - K)
-    d1 = (math.log(S0 / K) + (r + 0.5 * sigma * sigma) * T) / (sigma * math.sqrt(T))
-    d2 = d1 - sigma * math.sqrt(T)
-    return S0 * _N(d1) - K * math.exp(-r * T) * _N(d2)
-
-def bs_put(S0: float, K: float, T: float, r: float, sigma: float) -> float:
-    if T <= 0 or sigma <= 0:
-        return max(0.0, K - S0)
-    d1 = (math.log(S0 / K) + (r + 0.5 * sigma * sigma) * T) / (sigma * math.sqrt(T))
-    d2 = d1 - sigma * math.sqrt(T)
-    return K * math.exp(-r * T) - S0 + bs_call(S0, K, T, r, sigma)
\ No newline at end of file
+import numpy as np
+from scipy.special import ndtr
+
+
+def _N(x):
+    # CDF de la loi normale standard (vectorisée)
+    return ndtr(x)
+
+
+def _n(x):
+    # densité de la loi normale standard
+    return np.exp(-0.5 * x * x) / np.sqrt(2.0 * np.pi)
+
+
+def _as_result(x):
+    # scalaire Python si toutes les entrées sont scalaires, tableau sinon
+    return float(x) if np.ndim(x) == 0 else x
+
+
+def _d1_d2(S0, K, T, r, sigma):
+    """
+    d1, d2 de Black–Scholes avec diffusion numpy (S0, K, T, r, sigma broadcastés).
+    Retourne aussi le masque des contrats dégénérés (T <= 0 ou sigma <= 0).
+    """
+    S0, K, T, r, sigma = np.broadcast_arrays(*(np.asarray(a, dtype=float) for a in (S0, K, T, r, sigma)))
+    degenerate = (T <= 0) | (sigma <= 0)
+    T_ = np.where(degenerate, 1.0, T)
+    sig_ = np.where(degenerate, 1.0, sigma)
+    vol = sig_ * np.sqrt(T_)
+    d1 = (np.log(S0 / K) + (r + 0.5 * sig_ * sig_) * T_) / vol
+    d2 = d1 - vol
+    return S0, K, T, r, sigma, d1, d2, degenerate
+
+
+def bs_call(S0, K, T, r, sigma):
+    """
+    Prix d'un call européen Black–Scholes.
+    Toutes les entrées peuvent être des tableaux (diffusion numpy) : une chaîne
+    complète de strikes/maturités est valorisée en une passe.
+    """
+    S0, K, T, r, sigma, d1, d2, degenerate = _d1_d2(S0, K, T, r, sigma)
+    price = S0 * _N(d1) - K * np.exp(-r * T) * _N(d2)
+    price = np.where(degenerate, np.maximum(0.0, S0 - K), price)
+    return _as_result(price)
+
+
+def bs_put(S0, K, T, r, sigma):
+    """Prix d'un put européen Black–Scholes (vectorisé, cf. bs_call)."""
+    S0, K, T, r, sigma, d1, d2, degenerate = _d1_d2(S0, K, T, r, sigma)
+    price = K * np.exp(-r * T) * _N(-d2) - S0 * _N(-d1)
+    price = np.where(degenerate, np.maximum(0.0, K - S0), price)
+    return _as_result(price)
@@ -0,0 +1,149 @@
+"""
+Pricing semi-analytique par fonction caractéristique : méthode COS
+(Fang & Oosterlee, 2008) et FFT de Carr & Madan (1999).
+
+Tout modèle exposant characteristic_function(u, T, r) (fonction caractéristique
+de log(S_T/S_0) sous la dérive risque-neutre r) et S0 est accepté :
+Heston, VarianceGamma.
+"""
+from collections import OrderedDict
+
+import numpy as np
+
+
+def _model_key(model) -> tuple:
+    # clé de cache : type + paramètres (tableaux convertis en octets)
+    items = []
+    for name, value in sorted(vars(model).items()):
+        if isinstance(value, np.ndarray):
+            value = (value.shape, value.tobytes())
+        items.append((name, value))
+    return (type(model).__name__, tuple(items))
+
+
+def _cumulants(model, T: float, r: float, h: float = 1e-2):
+    """c1, c2, c4 de log(S_T/S_0) par différences finies de log φ autour de 0."""
+    u = h * np.arange(-2, 3)
+    f = np.log(model.characteristic_function(u, T, r))
+    c1 = ((f[3] - f[1]) / (2.0 * h)).imag
+    c2 = -((f[3] - 2.0 * f[2] + f[1]) / h ** 2).real
+    c4 = ((f[4] - 4.0 * f[3] + 6.0 * f[2] - 4.0 * f[1] + f[0]) / h ** 4).real
+    return float(c1), float(max(c2, 1e-12)), float(max(c4, 0.0))
+
+
+_NODES_CACHE_SIZE = 256
+_nodes_cache: OrderedDict = OrderedDict()
+
+
+def _cos_grid(model, T: float, r: float, n_terms: int, L: float):
+    # intervalle [a, b], fréquences u_k et coefficients V_k du put (par unité de strike)
+    c1, c2, c4 = _cumulants(model, T, r)
+    width = L * np.sqrt(c2 + np.sqrt(c4))
+    a, b = c1 - width, c1 + width
+    k = np.arange(n_terms)
+    u = k * np.pi / (b - a)
+
+    # put : V_k = 2/(b−a) (−χ_k(a, 0) + ψ_k(a, 0))
+    c, d = a, 0.0
+    chi = (np.cos(u * (d - a)) * np.exp(d) - np.cos(u * (c - a)) * np.exp(c)
+           + u * np.sin(u * (d - a)) * np.exp(d) - u * np.sin(u * (c - a)) * np.exp(c)) / (1.0 + u * u)
+    psi = np.empty(n_terms)
+    psi[0] = d - c
+    psi[1:] = (np.sin(u[1:] * (d - a)) - np.sin(u[1:] * (c - a))) / u[1:]
+    return a, u, 2.0 / (b - a) * (-chi + psi)
+
+
+def _cos_nodes(model, T: float, r: float, n_terms: int, L: float):
+    # Nœuds COS d'une maturité : a, u_k et φ(u_k)·V_k (terme k = 0 divisé par 2).
+    # Cache LRU indexé par les paramètres du modèle, pas par l'instance.
+    key = (_model_key(model), T, r, n_terms, L)
+    if key in _nodes_cache:
+        _nodes_cache.move_to_end(key)
+        return _nodes_cache[key]
+
+    a, u, V_put = _cos_grid(model, T, r, n_terms, L)
+    phi = model.characteristic_function(u, T, r)
+    phi[0] *= 0.5
+
+    _nodes_cache[key] = nodes = (a, u, phi * V_put)
+    if len(_nodes_cache) > _NODES_CACHE_SIZE:
+        _nodes_cache.popitem(last=False)
+    return nodes
+
+
+def cos_price(model, K, T: float, r: float, option: str = "call",
+              n_terms: int = 512, L: float = 10.0, S0: float | None = None) -> np.ndarray:
+    """
+    Prix européens d'une grille complète de strikes pour une maturité T,
+    en une passe vectorisée (méthode COS). Les nœuds (intervalle de troncature,
+    φ(u_k), coefficients de payoff) sont mis en cache par (modèle, T, r, n_terms, L).
+
+    Le put est calculé par COS puis le call par parité (plus stable).
+    """
+    S0 = model.S0 if S0 is None else S0
+    K = np.asarray(K, dtype=float)
+    a, u, weights = _cos_nodes(model, float(T), float(r), int(n_terms), float(L))
+    x = np.log(S0 / K)[..., None]
+    # Σ'_k Re(φ(u_k) e^{iu_k(x−a)}) V_k, pour tous les strikes d'un coup
+    put = K * np.exp(-r * T) * (np.exp(1j * u * (x - a)) @ weights).real
+    put = np.maximum(put, 0.0)
+    if option == "put":
+        return put
+    if option == "call":
+        return put + S0 - K * np.exp(-r * T)
+    raise ValueError("option doit être 'call' ou 'put'.")
+
+
+def cos_put_grad(model, K, T: float, r: float, n_terms: int = 512, L: float = 10.0,
+                 S0: float | None = None):
+    """
+    Puts COS d'une maturité et leur gradient analytique par rapport aux paramètres
+    du modèle (via model.characteristic_function_grad). L'intervalle de troncature
+    est traité comme fixe. Le gradient d'un call est le même (parité).
+    Retourne (put, dput) de formes (n_K,) et (n_params, n_K).
+    """
+    S0 = model.S0 if S0 is None else S0
+    K = np.asarray(K, dtype=float)
+    a, u, V_put = _cos_grid(model, T, r, n_terms, L)
+    phi, dphi = model.characteristic_function_grad(u, T, r)
+    phi[0] *= 0.5
+    dphi[:, 0] *= 0.5
+    Ex = np.exp(1j * u * (np.log(S0 / K)[:, None] - a))
+    disc_K = K * np.exp(-r * T)
+    put = disc_K * (Ex @ (phi * V_put)).real
+    dput = disc_K * (Ex @ (dphi * V_put).T).real.T
+    return put, dput
+
+
+def carr_madan_fft(model, T: float, r: float, alpha: float = 1.5, n: int = 4096,
+                   eta: float = 0.25, S0: float | None = None):
+    """
+    Prix de calls sur une grille de n log-strikes par FFT (Carr & Madan),
+    avec amortissement exp(α k) et poids de Simpson.
+    Retourne (strikes, prix) ; voir fft_price pour des strikes quelconques.
+    """
+    S0 = model.S0 if S0 is None else S0
+    lam = 2.0 * np.pi / (n * eta)
+    b = 0.5 * n * lam
+    v = eta * np.arange(n)
+    u = v - (alpha + 1.0) * 1j
+    phi = np.exp(1j * u * np.log(S0)) * model.characteristic_function(u, T, r)
+    psi = np.exp(-r * T) * phi / (alpha ** 2 + alpha - v ** 2 + 1j * (2.0 * alpha + 1.0) * v)
+    simpson = (3.0 + (-1.0) ** np.arange(1, n + 1)) / 3.0
+    simpson[0] = 1.0 / 3.0
+    fft = np.fft.fft(np.exp(1j * v * b) * psi * eta * simpson).real
+    k = -b + lam * np.arange(n)
+    return np.exp(k), np.exp(-alpha * k) / np.pi * fft
+
+
+def fft_price(model, K, T: float, r: float, option: str = "call", **kwargs) -> np.ndarray:
+    """Prix aux strikes K par interpolation (en log-strike) de la grille Carr–Madan."""
+    K = np.asarray(K, dtype=float)
+    S0 = kwargs.get("S0") or model.S0
+    strikes, calls = carr_madan_fft(model, T, r, **kwargs)
+    call = np.interp(np.log(K), np.log(strikes), calls)
+    if option == "call":
+        return call
+    if option == "put":
+        return call - S0 + K * np.exp(-r * T)
+    raise ValueError("option doit être 'call' ou 'put'.")
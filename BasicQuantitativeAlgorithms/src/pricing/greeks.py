@@ -1,8 +1,53 @@
-from .black_scholes import bs_call, bs_put
+from functools import partial
+import numpy as np
+from models.base_model import block_seeds
+from stats import RunningMoments
+from instrumentation import instrument
+from .black_scholes import bs_call, bs_put, _d1_d2, _N, _n, _as_result
+
+# paramètres de Heston dont la sensibilité est obtenue par perturbation
+HESTON_BUMPED = ("kappa", "theta", "xi", "v0")
+
+
+def bs_greeks(S0, K, T, r, sigma, payoff="call"):
+    """
+    Grecques analytiques de Black–Scholes (Delta, Gamma, Vega, Theta, Rho).
+    Entrées scalaires ou tableaux (diffusion numpy) ; même convention que greeks_fd :
+    Theta = -dV/dT (par an), Vega et Rho par unité de sigma et de r.
+    """
+    S0, K, T, r, sigma, d1, d2, degenerate = _d1_d2(S0, K, T, r, sigma)
+    sqrt_T = np.sqrt(np.where(degenerate, 1.0, T))
+    disc = np.exp(-r * T)
+    pdf_d1 = _n(d1)
+
+    gamma = pdf_d1 / (S0 * sigma * sqrt_T)
+    vega = S0 * pdf_d1 * sqrt_T
+    theta_common = -S0 * pdf_d1 * sigma / (2.0 * sqrt_T)
+    if payoff == "call":
+        delta = _N(d1)
+        theta = theta_common - r * K * disc * _N(d2)
+        rho = K * T * disc * _N(d2)
+    elif payoff == "put":
+        delta = _N(d1) - 1.0
+        theta = theta_common + r * K * disc * _N(-d2)
+        rho = -K * T * disc * _N(-d2)
+    else:
+        raise ValueError("payoff doit être 'call' ou 'put'.")
+
+    greeks = {"delta": delta, "gamma": gamma, "vega": vega, "rho": rho, "theta": theta}
+    if np.any(degenerate):
+        # Maturité nulle / vol nulle : on garde le delta intrinsèque, le reste est nul
+        itm = (S0 > K) if payoff == "call" else (S0 < K)
+        intrinsic_delta = np.where(itm, 1.0 if payoff == "call" else -1.0, 0.0)
+        greeks = {k: np.where(degenerate, intrinsic_delta if k == "delta" else 0.0, v)
+                  for k, v in greeks.items()}
+    return {k: _as_result(v) for k, v in greeks.items()}
+
 
 def greeks_fd(S0: float, K: float, T: float, r: float, sigma: float, payoff="call", eps=1e-4):
     """
     Grecques par différences finies sur Black–Scholes (Delta, Gamma, Vega, Theta, Rho).
+    Conservé comme référence de validation de bs_greeks (11 évaluations de prix).
     """
     price_fun = bs_call if payoff == "call" else bs_put
     # Delta & Gamma (variation S0)
@@ -28,3 +73,130 @@ def greeks_fd(S0: float, K: float, T: float, r: float, sigma: float, payoff="cal
     theta = (pt_dn - pt_up) / (2 * T * eps)
 
     return {"delta": delta, "gamma": gamma, "vega": vega, "rho": rho, "theta": theta}
+
+
+# ---- Grecques Monte Carlo (une seule simulation) ----
+
+def _gbm_greek_samples(model, K, T, r, payoff, size, seed):
+    """Échantillons par trajectoire : prix, Delta et Vega trajectoriels, Gamma LR-PW."""
+    rng = np.random.default_rng(seed)
+    Z = rng.standard_normal(size)
+    S0, sigma = model.S0, model.sigma
+    ST = S0 * np.exp((r - 0.5 * sigma ** 2) * T + sigma * np.sqrt(T) * Z)
+    disc = np.exp(-r * T)
+    if payoff == "call":
+        price = np.maximum(ST - K, 0.0)
+        dpayoff = (ST > K).astype(float)
+    else:
+        price = np.maximum(K - ST, 0.0)
+        dpayoff = -(ST < K).astype(float)
+    delta = disc * dpayoff * ST / S0
+    return {"price": disc * price,
+            "delta": delta,
+            # dS_T/dσ = S_T (log(S_T/S0) − (r + σ²/2)T) / σ
+            "vega": delta * S0 * (np.log(ST / S0) - (r + 0.5 * sigma ** 2) * T) / sigma,
+            # dérivée LR du Delta trajectoriel : score d'une loi lognormale en S0
+            "gamma": delta * (Z / (sigma * np.sqrt(T)) - 1.0) / S0}
+
+
+def _conditional_bs(S0_eff, K, T, r, sigma_eff, payoff):
+    price = (bs_call if payoff == "call" else bs_put)(S0_eff, K, T, r, sigma_eff)
+    return price, bs_greeks(S0_eff, K, T, r, sigma_eff, payoff)
+
+
+def _heston_greek_samples(model, K, T, r, payoff, N, bump, size, seed):
+    """
+    Estimateur conditionnel (Romano–Touzi) : sachant la trajectoire de variance,
+    log S_T est gaussien et le prix est un prix Black–Scholes. La loi de
+    (∫v dt, ∫√v dW^v) ne dépend pas de ρ : d_rho est la dérivée trajectorielle
+    du prix conditionnel, sans simulation supplémentaire. d_kappa, d_theta,
+    d_xi et d_v0 sont des différences centrées à nombres aléatoires communs sur
+    2×4 jeux perturbés simulés dans le même appel par lots : ce coût est celui
+    d'environ 9 simulations de variance.
+    """
+    base = np.array([getattr(model, name) for name in HESTON_BUMPED])
+    h = bump * np.abs(base)
+    grid = np.tile(base, (9, 1))
+    grid[1:5] += np.diag(h)
+    grid[5:] -= np.diag(h)
+    kappa, theta, xi, v0 = grid.T
+    batch = type(model)(kappa, theta, xi, model.rho, v0, S0=model.S0, mu=r, scheme=model.scheme)
+    _, int_v, I = batch.simulate_variance(T, N, size, random_state=seed)
+    rho = model.rho
+    S0_eff = model.S0 * np.exp(rho * I - 0.5 * rho ** 2 * int_v)
+    sigma_eff = np.sqrt(np.maximum((1.0 - rho ** 2) * int_v, 0.0) / T)
+    price, g = _conditional_bs(S0_eff[0], K, T, r, sigma_eff[0], payoff)
+    prices = (bs_call if payoff == "call" else bs_put)(S0_eff[1:], K, T, r, sigma_eff[1:])
+    ratio = S0_eff[0] / model.S0
+    out = {"price": price, "delta": g["delta"] * ratio, "gamma": g["gamma"] * ratio ** 2}
+    for i, name in enumerate(HESTON_BUMPED):
+        out["d_" + name] = (prices[i] - prices[4 + i]) / (2.0 * h[i])
+    # dS0_eff/dρ = S0_eff (I − ρ∫v), dσ_eff/dρ = −ρ∫v / (T σ_eff)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        dsigma = np.where(sigma_eff[0] > 0, -rho * int_v[0] / (T * sigma_eff[0]), 0.0)
+    out["d_rho"] = g["delta"] * S0_eff[0] * (I[0] - rho * int_v[0]) + g["vega"] * dsigma
+    # vega : sensibilité à la volatilité initiale √v0
+    out["vega"] = out["d_v0"] * 2.0 * np.sqrt(model.v0)
+    return out
+
+
+def _vg_greek_samples(model, K, T, r, payoff, size, seed):
+    """
+    Estimateur conditionnel au subordinateur : sachant G_T ~ Gamma(T/ν, ν),
+    S_T = S0 exp(ω_μ T + θG + σ√G Z) est lognormal, prix et grecques Black–Scholes.
+    """
+    rng = np.random.default_rng(seed)
+    G = model._gamma(rng, T / model.nu, size, False)
+    theta, sigma = model.theta, model.sigma
+    S0_eff = model.S0 * np.exp((model.drift - r) * T + (theta + 0.5 * sigma ** 2) * G)
+    price, g = _conditional_bs(S0_eff, K, T, r, sigma * np.sqrt(G / T), payoff)
+    ratio = S0_eff / model.S0
+    return {"price": price, "delta": g["delta"] * ratio, "gamma": g["gamma"] * ratio ** 2,
+            "vega": g["delta"] * S0_eff * sigma * G + g["vega"] * np.sqrt(G / T),
+            "d_theta": g["delta"] * S0_eff * G}
+
+
+@instrument("pricing.mc_greeks")
+def mc_greeks(model, K: float, T: float, r: float, M: int, payoff: str = "call", N: int = 252,
+              random_state=None, chunk_size: int | None = 100_000, bump: float = 1e-2):
+    """
+    Prix et grecques Monte Carlo tirés d'une seule simulation, avec erreurs standard.
+
+    - GBM : Delta et Vega trajectoriels, Gamma par méthode mixte LR-PW ;
+    - Heston : estimateurs conditionnels à la variance (prix Black–Scholes
+      sachant ∫v dt) pour Delta/Gamma et 'd_rho' (trajectoriel) ; 'd_kappa',
+      'd_theta', 'd_xi', 'd_v0' par différences centrées à pas relatif 'bump'
+      sur le même bruit (≈ 9 simulations de variance par bloc) ; 'vega' = dV/d√v0 ;
+    - Variance Gamma : estimateurs conditionnels au subordinateur, Vega en σ et
+      'd_theta' = dV/dθ au paramètre θ du modèle.
+
+    Les sensibilités aux paramètres du modèle sont préfixées par 'd_' ; 'theta'
+    et 'rho' gardent le sens de bs_greeks (décroissance temporelle, taux).
+
+    La dérive du modèle est remplacée par r (pricing risque-neutre) pour GBM et
+    Heston ; Variance Gamma garde la loi de simulate. Les M trajectoires sont
+    traitées par blocs de chunk_size (graines indépendantes, cf. block_seeds).
+
+    Retourne un dict {nom: valeur} avec en plus 'std_error' : {nom: erreur standard}.
+    """
+    if payoff not in ("call", "put"):
+        raise ValueError("payoff doit être 'call' ou 'put'.")
+    if model.batch_shape:
+        raise ValueError("mc_greeks attend un modèle à paramètres scalaires.")
+    family = getattr(model, "greeks_family", None)
+    if family == "gbm":
+        samples = partial(_gbm_greek_samples, model, K, T, r, payoff)
+    elif family == "heston":
+        samples = partial(_heston_greek_samples, model, K, T, r, payoff, N, bump)
+    elif family == "variance_gamma":
+        samples = partial(_vg_greek_samples, model, K, T, r, payoff)
+    else:
+        raise TypeError("mc_greeks supporte GBM, Heston et VarianceGamma.")
+
+    acc = {}
+    for size, seed in block_seeds(random_state, M, chunk_size):
+        for name, x in samples(size, seed).items():
+            acc.setdefault(name, RunningMoments()).update(np.asarray(x, dtype=float))
+    out = {name: float(m.mean) for name, m in acc.items()}
+    out["std_error"] = {name: float(np.sqrt(m.var(ddof=1) / m.n)) for name, m in acc.items()}
+    return out
@@ -1,34 +1,267 @@
+from functools import partial
 from typing import Tuple
 import numpy as np
+from models.base_model import block_seeds
+from models.variance_gamma import SAMPLERS as VG_SAMPLERS
+from parallel import map_blocks
+from stats import RunningMoments, RunningCovariance
+from instrumentation import instrument, count
 
+SAMPLERS = ("pseudo", "sobol") + VG_SAMPLERS
+
+
+def _payoff(ST: np.ndarray, K: float, payoff: str) -> np.ndarray:
+    if payoff == "call":
+        return np.maximum(ST - K, 0.0)
+    if payoff == "put":
+        return np.maximum(K - ST, 0.0)
+    raise ValueError("payoff doit être 'call' ou 'put'.")
+
+
+def _mc_block(model, T, N, K, payoff, disc, EX, antithetic, moment_matching, sim_kwargs, size, seed):
+    """Accumulateurs partiels (raw, acc) d'un bloc de trajectoires."""
+    ST = model.simulate_terminal(T, N, size, random_state=seed, antithetic=antithetic, **sim_kwargs)
+    if moment_matching:
+        ST = ST * (EX / disc / np.mean(ST))
+    Y = disc * _payoff(ST, K, payoff)
+    X = disc * ST
+    raw = RunningMoments().update(Y)
+    if antithetic:
+        h = Y.size // 2
+        Y = 0.5 * (Y[:h] + Y[h:])
+        X = 0.5 * (X[:h] + X[h:])
+    return raw, RunningCovariance().update(X, Y)
+
+
+def _estimate(acc: RunningCovariance, EX: float, control_variate: bool):
+    """(prix, variance par échantillon, beta) à partir des accumulateurs."""
+    n = acc.n
+    if control_variate and acc.cxx > 0:
+        beta = acc.cxy / acc.cxx
+        price = acc.mean_y - beta * (acc.mean_x - EX)
+        return price, max(acc.cyy - acc.cxy ** 2 / acc.cxx, 0.0) / (n - 2), beta
+    return acc.mean_y, acc.cyy / (n - 1), 0.0
+
+
+@instrument("pricing.mc_price_european")
 def mc_price_european(model, K: float, T: float, r: float, M: int, payoff: str = "call",
-antithetic: bool = True, N: int = 252, random_state=None) -> Tuple[float, float]:
+antithetic: bool = True, N: int = 252, random_state=None,
+chunk_size: int | None = 100_000, control_variate: bool = False,
+moment_matching: bool = False, full_output: bool = False,
+n_workers: int | None = 1, backend: str = "thread",
+sampler: str = "pseudo", qmc_replicates: int = 16) -> Tuple[float, float]:
     """
     Prix Monte Carlo européen générique basé chemins d'un modèle 'model' fournissant simulate(T,N,M).
     Retourne (prix, intervalle de confiance 95% approx).
+
+    Seules les valeurs terminales sont simulées (model.simulate_terminal) ; les M
+    trajectoires sont traitées par blocs de chunk_size (None : un seul bloc) et la
+    moyenne/variance accumulées en flux, si bien que la mémoire ne dépend plus de M.
+    Les blocs sont répartis sur n_workers threads/processus (None : tous les cœurs) ;
+    le résultat ne dépend que de random_state et chunk_size, pas de n_workers.
+
+    Réduction de variance :
+    - antithetic : bruits (Z, -Z) générés par le modèle, l'échantillon est la moyenne de la paire ;
+    - control_variate : prix terminal actualisé e^{-rT} S_T, d'espérance connue
+      (model.expected_terminal), coefficient beta estimé sur l'échantillon ;
+    - moment_matching : S_T est renormalisé par bloc pour que sa moyenne empirique
+      égale E[S_T].
+    QMC randomisé (sampler='sobol', modèles GBM/Heston) : qmc_replicates brouillages
+    indépendants de M/qmc_replicates points ; le prix est la moyenne des répliques
+    et l'intervalle de confiance vient de leur dispersion (antithetic ignoré).
+    Les autres échantillonneurs ('gamma', 'dog' : Variance Gamma) sont des
+    tirages pseudo-aléatoires, transmis tels quels au modèle.
+
+    Avec full_output=True, retourne (prix, ic, info) où info['vr_factor'] est le
+    facteur de réduction de variance effectif par rapport au MC simple à M égal.
     """
-    if antithetic:
+    if payoff not in ("call", "put"):
+        raise ValueError("payoff doit être 'call' ou 'put'.")
+    if sampler not in SAMPLERS:
+        raise ValueError(f"sampler doit être parmi {SAMPLERS}.")
+    qmc = sampler == "sobol"
+    sim_kwargs = {} if sampler == "pseudo" else {"sampler": sampler}
+    if qmc:
+        antithetic = False
+        chunk_size = max(1, M // qmc_replicates)
+        M2 = chunk_size * qmc_replicates
+    elif antithetic:
         M2 = M // 2 * 2
+        if chunk_size is not None:
+            chunk_size = max(2, chunk_size // 2 * 2)
     else:
         M2 = M
 
-    t, S = model.simulate(T=T, N=N, M=M2, random_state=random_state)
-    ST = S[:, -1]
-    if payoff == "call":
-        payoff_vals = np.maximum(ST - K, 0.0)
-    elif payoff == "put":
-        payoff_vals = np.maximum(K - ST, 0.0)
+    disc = np.exp(-r * T)
+    need_mean = control_variate or moment_matching
+    EX = disc * model.expected_terminal(T, N) if need_mean else 0.0
+
+    count("mc.paths", M2)
+    blocks = block_seeds(random_state, M2, chunk_size)
+    func = partial(_mc_block, model, T, N, K, payoff, disc, EX, antithetic, moment_matching, sim_kwargs)
+    parts = map_blocks(func, blocks, n_workers=n_workers, backend=backend)
+    raw = RunningMoments()         # variance par trajectoire du MC simple
+    acc = RunningCovariance()      # (x = contrôle, y = payoff) par échantillon
+    for raw_b, acc_b in parts:
+        raw.merge(raw_b)
+        acc.merge(acc_b)
+
+    if qmc:
+        # une estimation par réplique (brouillage) indépendante
+        estimates = np.array([_estimate(acc_b, EX, control_variate)[0] for _, acc_b in parts])
+        price, beta = float(np.mean(estimates)), 0.0
+        var_estimator = float(np.var(estimates, ddof=1)) / estimates.size
     else:
+        price, var_sample, beta = _estimate(acc, EX, control_variate)
+        var_estimator = var_sample / acc.n
+
+    ci = 1.96 * np.sqrt(var_estimator)
+    if not full_output:
+        return float(price), float(ci)
+    var_plain = raw.var(ddof=1) / raw.n
+    info = {"std_error": float(np.sqrt(var_estimator)),
+            "vr_factor": float(var_plain / var_estimator) if var_estimator > 0 else float("inf"),
+            "beta": float(beta),
+            "n_paths": int(raw.n)}
+    return float(price), float(ci), info
+
+
+# ---- Options américaines (Longstaff–Schwartz) ----
+
+def _lsm_basis(x: np.ndarray, degree: int) -> np.ndarray:
+    # polynômes de Laguerre pondérés en x = S/K (base classique de Longstaff–Schwartz)
+    e = np.exp(-0.5 * x)
+    cols = [e, e * (1.0 - x), e * (1.0 - 2.0 * x + 0.5 * x * x),
+            e * (1.0 - 3.0 * x + 1.5 * x * x - x ** 3 / 6.0)]
+    return np.column_stack([np.ones_like(x)] + cols[:degree])
+
+
+def _exercise_dates(model, T, N, n_exercise, size, seed, sim_kwargs):
+    """Trajectoires d'un bloc restreintes aux dates d'exercice : (size, n_exercise)."""
+    step = N // n_exercise
+    _, S = model.simulate(T, N, size, random_state=seed, **sim_kwargs)
+    return S[:, step::step]
+
+
+@instrument("pricing.lsm_price_american")
+def lsm_price_american(model, K: float, T: float, r: float, M: int, payoff: str = "put",
+                       n_exercise: int = 50, N: int | None = None, degree: int = 3,
+                       M_fit: int | None = None, random_state=None,
+                       chunk_size: int | None = 50_000, **sim_kwargs) -> Tuple[float, float]:
+    """
+    Prix d'une option américaine (bermudéenne à n_exercise dates) par
+    Longstaff–Schwartz sur les trajectoires d'un PathModel (sous la mesure
+    risque-neutre : dérive du modèle = r).
+
+    Deux passes indépendantes :
+    1. régression : M_fit trajectoires (défaut min(M, 100 000)), régressions
+       rétrogrades de la valeur de continuation sur les trajectoires dans la
+       monnaie (base de Laguerre de degré 'degree' en S/K) ;
+    2. valorisation : M nouvelles trajectoires traitées par blocs de chunk_size
+       avec la règle d'exercice estimée, moyenne en flux : estimateur biaisé par
+       défaut (sous-optimalité de la règle), non pollué par le sur-apprentissage.
+
+    Seules les colonnes des dates d'exercice sont conservées (mémoire
+    O(M_fit · n_exercise) pour la régression, O(chunk_size · N) pour la valorisation).
+    N : pas de simulation (multiple de n_exercise, défaut n_exercise).
+    Retourne (prix, intervalle de confiance 95%).
+    """
+    if payoff not in ("call", "put"):
         raise ValueError("payoff doit être 'call' ou 'put'.")
+    N = n_exercise if N is None else N
+    if N % n_exercise:
+        raise ValueError("N doit être un multiple de n_exercise.")
+    M_fit = min(M, 100_000) if M_fit is None else M_fit
+    if isinstance(random_state, (np.random.Generator, np.random.SeedSequence)):
+        fit_seed, price_seed = random_state.spawn(2)
+    else:
+        fit_seed, price_seed = np.random.SeedSequence(random_state).spawn(2)
+    disc = np.exp(-r * T / n_exercise)
+
+    # Passe 1 : coefficients de régression, date par date en remontant
+    X = np.concatenate([_exercise_dates(model, T, N, n_exercise, size, seed, sim_kwargs)
+                        for size, seed in block_seeds(fit_seed, M_fit, chunk_size)])
+    cash = _payoff(X[:, -1], K, payoff)
+    coefs = [None] * n_exercise
+    for k in range(n_exercise - 2, -1, -1):
+        cash *= disc
+        h = _payoff(X[:, k], K, payoff)
+        itm = h > 0
+        if itm.sum() <= degree + 1:
+            continue
+        A = _lsm_basis(X[itm, k] / K, degree)
+        coefs[k] = np.linalg.lstsq(A, cash[itm], rcond=None)[0]
+        exercise = np.zeros_like(itm)
+        exercise[itm] = h[itm] > A @ coefs[k]
+        cash[exercise] = h[exercise]
+    del X
+
+    # Passe 2 : valorisation sur trajectoires indépendantes, par blocs
+    acc = RunningMoments()
+    for size, seed in block_seeds(price_seed, M, chunk_size):
+        X = _exercise_dates(model, T, N, n_exercise, size, seed, sim_kwargs)
+        value = np.zeros(size)
+        alive = np.ones(size, dtype=bool)
+        for k in range(n_exercise):
+            h = _payoff(X[:, k], K, payoff)
+            if k == n_exercise - 1:
+                exercise = alive & (h > 0)
+            elif coefs[k] is None:
+                continue
+            else:
+                exercise = alive & (h > 0)
+                idx = np.flatnonzero(exercise)
+                exercise[idx] = h[idx] > _lsm_basis(X[idx, k] / K, degree) @ coefs[k]
+            value[exercise] = disc ** (k + 1) * h[exercise]
+            alive &= ~exercise
+        acc.update(value)
+    price = max(acc.mean, float(_payoff(np.asarray(model.S0), K, payoff)))
+    return float(price), float(1.96 * np.sqrt(acc.var(ddof=1) / acc.n))
 
-    if antithetic:
-        # Antithetic variates: re-simuler avec bruits opposés si possible nativement ?
-        # Ici simple split pair/impair (déjà centré par grande M).
-        pass
 
+# ---- Options à barrière désactivante ----
+
+@instrument("pricing.mc_price_barrier")
+def mc_price_barrier(model, K: float, barrier: float, T: float, r: float, M: int,
+                     payoff: str = "call", barrier_type: str = "down-and-out", N: int = 252,
+                     random_state=None, chunk_size: int | None = 50_000,
+                     bridge_correction: bool | None = None) -> Tuple[float, float]:
+    """
+    Prix Monte Carlo d'une option à barrière désactivante (sans rebate).
+
+    Surveillance sur les N dates de simulation ; avec bridge_correction (GBM
+    uniquement), la probabilité de franchissement entre deux dates par pont
+    brownien en log-prix, p = exp(−2 ln(S_k/B) ln(S_{k+1}/B) / (σ² dt)), pondère
+    chaque trajectoire par sa probabilité de survie : surveillance continue
+    sans biais de discrétisation. bridge_correction=None : correction pour les
+    modèles qui déclarent une volatilité de diffusion constante (diffusion_vol,
+    GBM), surveillance discrète pour les autres (sauts, volatilité
+    stochastique) ; True avec un autre modèle lève une erreur.
+    Trajectoires traitées par blocs de chunk_size. Retourne (prix, ic 95%).
+    """
+    if payoff not in ("call", "put"):
+        raise ValueError("payoff doit être 'call' ou 'put'.")
+    if barrier_type not in ("up-and-out", "down-and-out"):
+        raise ValueError("barrier_type doit être 'up-and-out' ou 'down-and-out'.")
+    vol = getattr(model, "diffusion_vol", None)
+    if bridge_correction is None:
+        bridge_correction = vol is not None
+    if bridge_correction and vol is None:
+        raise ValueError("bridge_correction n'est valable que pour un GBM.")
+    sigma = vol if bridge_correction else None
+    if sigma is not None and np.ndim(sigma):
+        raise ValueError("mc_price_barrier attend un modèle à paramètres scalaires.")
+    up = barrier_type == "up-and-out"
+    dt = T / N
     disc = np.exp(-r * T)
-    vals = disc * payoff_vals
-    price = float(np.mean(vals))
-    std = float(np.std(vals, ddof=1))
-    ci = 1.96 * std / np.sqrt(vals.size)
-    return price, ci
+    acc = RunningMoments()
+    for _, S in model.simulate_chunks(T, N, M, chunk_size=chunk_size, random_state=random_state):
+        crossed = np.any(S >= barrier if up else S <= barrier, axis=1)
+        weight = (~crossed).astype(float)
+        if sigma is not None:
+            with np.errstate(divide="ignore"):
+                L = np.log(S / barrier)
+            p_cross = np.exp(-2.0 * L[:, :-1] * L[:, 1:] / (sigma ** 2 * dt))
+            weight *= np.prod(1.0 - p_cross, axis=1)
+        acc.update(disc * weight * _payoff(S[:, -1], K, payoff))
+    return float(acc.mean), float(1.96 * np.sqrt(acc.var(ddof=1) / acc.n))
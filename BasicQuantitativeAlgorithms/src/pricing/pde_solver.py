@@ -1,71 +1,226 @@
 import numpy as np
+from scipy.linalg import lapack, solve_banded
 
+from instrumentation import instrument
+
+
+def _tridiag_factor(lower: np.ndarray, diag: np.ndarray, upper: np.ndarray):
+    """
+    Factorisation LU (avec pivot partiel) d'une matrice tridiagonale, une fois pour toutes.
+    lower/upper : sous- et sur-diagonales (taille n-1), diag : diagonale (taille n).
+    """
+    dl, d, du, du2, ipiv, info = lapack.dgttrf(lower, diag, upper)
+    if info != 0:
+        raise np.linalg.LinAlgError("matrice tridiagonale singulière.")
+    return dl, d, du, du2, ipiv
+
+
+def _tridiag_solve(factors, rhs: np.ndarray) -> np.ndarray:
+    """Résout A x = rhs en O(n) à partir des facteurs de _tridiag_factor (rhs 1-D ou (n, k))."""
+    b = rhs if rhs.ndim == 2 else rhs[:, None]
+    x, info = lapack.dgttrs(*factors, b)
+    return x if rhs.ndim == 2 else x[:, 0]
+
+
+EXERCISE_METHODS = ("brennan_schwartz", "psor")
+BARRIER_TYPES = ("up-and-out", "down-and-out")
+
+
+def _brennan_schwartz_factor(lower, diag, upper, call: bool):
+    """
+    Factorisation UL de la matrice implicite pour Brennan–Schwartz, une fois
+    pour toutes : élimination de la sur-diagonale (A = U·L, U bidiagonale
+    supérieure unitaire, L bidiagonale inférieure). Pour un call, la grille est
+    retournée afin que la région d'exercice touche le premier indice.
+    """
+    if call:
+        lower, diag, upper = upper[::-1], diag[::-1], lower[::-1]
+    n = diag.size
+    d = diag.copy()
+    m = np.empty(n - 1)
+    for i in range(n - 2, -1, -1):
+        m[i] = upper[i] / d[i + 1]
+        d[i] -= m[i] * lower[i]
+    ab_U = np.zeros((2, n))
+    ab_U[0, 1:] = m
+    ab_U[1] = 1.0
+    ab_L = np.zeros((2, n))
+    ab_L[0] = d
+    ab_L[1, :-1] = lower
+    return ab_U, ab_L, np.ascontiguousarray(lower), d, call
+
+
+def _brennan_schwartz(factors, rhs, payoff):
+    """
+    Problème de complémentarité linéaire A V >= rhs, V >= payoff (égalité sur
+    l'une des deux) résolu en une passe (Brennan & Schwartz, 1977) :
+    substitution U y = rhs, puis substitution L V = y projetée sur le payoff.
+    La région d'exercice étant un intervalle touchant le bord (S petits pour un
+    put, grands pour un call), la projection se réduit à localiser la
+    frontière : avant elle V = payoff, après elle une résolution bidiagonale.
+    """
+    ab_U, ab_L, lower, d, call = factors
+    if call:
+        rhs, payoff = rhs[::-1], payoff[::-1]
+    y = solve_banded((0, 1), ab_U, rhs, check_finite=False)
+    # valeur de continuation en i lorsque le point i-1 est exercé
+    z = y.copy()
+    z[1:] -= lower * payoff[:-1]
+    z /= d
+    V = payoff.copy()
+    cont = np.flatnonzero(z > payoff)
+    if cont.size:
+        k = cont[0]
+        b = y[k:].copy()
+        if k > 0:
+            b[0] -= lower[k - 1] * payoff[k - 1]
+        V[k:] = solve_banded((1, 0), ab_L[:, k:], b, check_finite=False)
+        if np.any(V[k:] < payoff[k:]):
+            # région d'exercice non connexe : substitution projetée point par point
+            for i in range(k + 1, V.size):
+                V[i] = max(payoff[i], (y[i] - lower[i - 1] * V[i - 1]) / d[i])
+    return V[::-1] if call else V
+
+
+def _psor(lower, diag, upper, rhs, payoff, V, omega: float, tol: float, max_iter: int):
+    """
+    SOR projeté (Cryer) en ordre rouge-noir : les points pairs puis impairs
+    sont mis à jour en bloc (chaque demi-balayage est un Gauss–Seidel exact),
+    sur-relaxés puis projetés sur V >= payoff. V sert de point de départ.
+    """
+    n = diag.size
+    for _ in range(max_iter):
+        err = 0.0
+        for start in (0, 1):
+            idx = np.arange(start, n, 2)
+            s = rhs[idx].copy()
+            has_lo = idx > 0
+            s[has_lo] -= lower[idx[has_lo] - 1] * V[idx[has_lo] - 1]
+            has_up = idx < n - 1
+            s[has_up] -= upper[idx[has_up]] * V[idx[has_up] + 1]
+            new = np.maximum(payoff[idx], V[idx] + omega * (s / diag[idx] - V[idx]))
+            err = max(err, float(np.max(np.abs(new - V[idx]))))
+            V[idx] = new
+        if err < tol:
+            break
+    return V
+
+
+@instrument("pricing.crank_nicolson_bs")
 def crank_nicolson_bs(Smax: float, K: float, T: float, r: float, sigma: float,
-                      M_S: int = 200, M_T: int = 200, option: str = "call"):
+                      M_S: int = 200, M_T: int = 200, option: str = "call",
+                      american: bool = False, barrier: float | None = None,
+                      barrier_type: str | None = None, early_exercise: str = "brennan_schwartz",
+                      omega: float = 1.2, tol: float = 1e-8, max_iter: int = 500,
+                      S0: float | None = None):
     """
     Résout l'EDP de Black–Scholes par Crank–Nicolson pour un call/put européen.
     Retourne (S_grid, V_grid) = valeurs au temps 0 sur la grille des spots.
+
+    Les coefficients ne dépendant pas du temps, le système tridiagonal est
+    factorisé une seule fois puis réutilisé à chaque pas : O(M_S·M_T) en temps,
+    O(M_S) en mémoire.
+
+    american=True : exercice anticipé, chaque pas devient un problème de
+    complémentarité résolu par Brennan–Schwartz (direct, défaut) ou par SOR
+    projeté (early_exercise='psor', itératif : omega, tol, max_iter).
+
+    barrier, barrier_type ('up-and-out' / 'down-and-out') : option à barrière
+    désactivante continue, sans rebate. La barrière devient un bord de la
+    grille (V = 0), qui couvre alors [barrier, Smax] ou [0, barrier]. Les deux
+    arguments vont ensemble, avec 0 < barrier < Smax ; S0 (optionnel) est le
+    spot d'intérêt, vérifié du côté actif de la barrière.
     """
+    if early_exercise not in EXERCISE_METHODS:
+        raise ValueError(f"early_exercise doit être parmi {EXERCISE_METHODS}.")
+    lo, hi = 0.0, Smax
+    if (barrier is None) != (barrier_type is None):
+        raise ValueError("barrier et barrier_type doivent être donnés ensemble.")
+    if barrier_type is not None:
+        if barrier_type not in BARRIER_TYPES:
+            raise ValueError(f"barrier_type doit être parmi {BARRIER_TYPES}.")
+        if not 0.0 < barrier < Smax:
+            raise ValueError("barrier doit être dans ]0, Smax[.")
+        up = barrier_type == "up-and-out"
+        if S0 is not None and (S0 >= barrier if up else S0 <= barrier):
+            raise ValueError("S0 doit être du côté actif de la barrière (option non désactivée).")
+        if barrier_type == "up-and-out":
+            hi = barrier
+        else:
+            lo = barrier
+
     dt = T / M_T
-    dS = Smax / M_S
-    S = np.linspace(0.0, Smax, M_S + 1)
+    S = np.linspace(lo, hi, M_S + 1)
+    dS = (hi - lo) / M_S
 
     # Condition terminale à t = T
     if option == "call":
         V = np.maximum(S - K, 0.0)
     else:
         V = np.maximum(K - S, 0.0)
+    payoff = V[1:-1].copy()
+    if barrier_type == "up-and-out":
+        V[-1] = 0.0
+    elif barrier_type == "down-and-out":
+        V[0] = 0.0
 
-    # Marche en temps inverse
-    for n in range(M_T, 0, -1):
-        t = (n - 1) * dt
+    # Points internes i = 1,...,M_S-1 (M_S-1 points), en unités de dS : x = S / dS
+    i = S[1:-1] / dS
 
-        # Indices internes i = 1,...,M_S-1 (M_S-1 points)
-        i = np.arange(1, M_S)
+    alpha = 0.25 * dt * (sigma**2 * i**2 - r * i)
+    beta  = -0.5 * dt * (sigma**2 * i**2 + r)
+    gamma = 0.25 * dt * (sigma**2 * i**2 + r * i)
 
-        alpha = 0.25 * dt * (sigma**2 * i**2 - r * i)
-        beta  = -0.5 * dt * (sigma**2 * i**2 + r)
-        gamma = 0.25 * dt * (sigma**2 * i**2 + r * i)
+    # Coeffs matrice A (LHS, temps n-1), factorisée une fois
+    diag_A     = 1.0 - beta                # taille M_S-1
+    off_down_A = -alpha[1:]                # taille M_S-2
+    off_up_A   = -gamma[:-1]               # taille M_S-2
+    if not american:
+        lu_A = _tridiag_factor(off_down_A, diag_A, off_up_A)
+    elif early_exercise == "brennan_schwartz":
+        bs_A = _brennan_schwartz_factor(off_down_A, diag_A, off_up_A, option == "call")
 
-        # Coeffs matrice A (LHS, temps n-1)
-        diag_A     = 1.0 - beta                # taille M_S-1
-        off_down_A = -alpha[1:]                # taille M_S-2
-        off_up_A   = -gamma[:-1]               # taille M_S-2
+    # Coeffs RHS (temps n)
+    D = 1.0 + beta                          # taille M_S-1
+    E = alpha                               # taille M_S-1
+    F = gamma                               # taille M_S-1
 
-        # Coeffs RHS (temps n)
-        D = 1.0 + beta                          # taille M_S-1
-        E = alpha                               # taille M_S-1
-        F = gamma                               # taille M_S-1
+    rhs = np.empty(M_S - 1)
 
-        # Valeurs internes de V
-        V_i   = V[1:-1]                         # taille M_S-1
-        V_im1 = V[0:-2]                         # taille M_S-1
-        V_ip1 = V[2:]                           # taille M_S-1
+    # Marche en temps inverse
+    for n in range(M_T, 0, -1):
+        t = (n - 1) * dt
 
-        # Terme droit
-        rhs = D * V_i + E * V_im1 + F * V_ip1   # taille M_S-1
+        # Terme droit : D*V_i + E*V_{i-1} + F*V_{i+1}
+        np.multiply(D, V[1:-1], out=rhs)
+        rhs += E * V[0:-2]
+        rhs += F * V[2:]
 
         # Conditions aux bornes à l’instant t
+        disc_K = K * np.exp(-r * (T - t))
         if option == "call":
             V0   = 0.0
-            Vmax = Smax - K * np.exp(-r * (T - t))
+            Vmax = hi - (K if american else disc_K)
         else:
-            V0   = K * np.exp(-r * (T - t))
+            V0   = K - lo if american else disc_K - lo
+            Vmax = 0.0
+        if barrier_type == "up-and-out":
             Vmax = 0.0
+        elif barrier_type == "down-and-out":
+            V0 = 0.0
 
         # Ajout des contributions de bord
         rhs[0]  += E[0]    * V0
         rhs[-1] += F[-1]   * Vmax
 
-        # Construction de la matrice tridiagonale
-        N_int = M_S - 1
-        A_mat = np.zeros((N_int, N_int))
-        np.fill_diagonal(A_mat, diag_A)
-        np.fill_diagonal(A_mat[1:], off_down_A)
-        np.fill_diagonal(A_mat[:, 1:], off_up_A)
-
         # Résolution pour V^{n-1}_i
-        V[1:-1] = np.linalg.solve(A_mat, rhs)
+        if not american:
+            V[1:-1] = _tridiag_solve(lu_A, rhs)
+        elif early_exercise == "brennan_schwartz":
+            V[1:-1] = _brennan_schwartz(bs_A, rhs, payoff)
+        else:
+            V[1:-1] = _psor(off_down_A, diag_A, off_up_A, rhs, payoff, np.maximum(V[1:-1], payoff),
+                            omega, tol, max_iter)
 
         # Bords explicites
         V[0]  = V0
@@ -73,3 +228,125 @@ def crank_nicolson_bs(Smax: float, K: float, T: float, r: float, sigma: float,
 
     # V est maintenant la solution à t=0
     return S, V
+
+
+def sinh_grid(Smax: float, center: float, M_S: int, width: float) -> np.ndarray:
+    """
+    Grille non uniforme sur [0, Smax] concentrée autour de 'center' :
+    S(ξ) = center + width·sinh(ξ), ξ uniforme. Plus 'width' est petit, plus
+    les nœuds sont resserrés près de 'center'.
+    """
+    xi = np.linspace(np.arcsinh(-center / width), np.arcsinh((Smax - center) / width), M_S + 1)
+    S = center + width * np.sinh(xi)
+    S[0], S[-1] = 0.0, Smax
+    return S
+
+
+def _bs_operator(S: np.ndarray, r: float, sigma: float):
+    """
+    Coefficients (l, d, u) de l'opérateur de Black–Scholes
+    L V = ½σ²S²V_SS + rSV_S − rV aux nœuds internes d'une grille quelconque
+    (différences centrées non uniformes).
+    """
+    h_m = S[1:-1] - S[:-2]
+    h_p = S[2:] - S[1:-1]
+    Si = S[1:-1]
+    diff = 0.5 * sigma**2 * Si**2
+    conv = r * Si
+    l = diff * 2.0 / (h_m * (h_m + h_p)) - conv * h_p / (h_m * (h_m + h_p))
+    d = -diff * 2.0 / (h_m * h_p) + conv * (h_p - h_m) / (h_m * h_p) - r
+    u = diff * 2.0 / (h_p * (h_m + h_p)) + conv * h_m / (h_p * (h_m + h_p))
+    return l, d, u
+
+
+def _quadratic_weights(S: np.ndarray, x: np.ndarray):
+    """
+    Indices et poids de Lagrange quadratiques (valeur, dérivées 1 et 2) aux points x,
+    sur les trois nœuds les plus proches de la grille S.
+    """
+    j = np.clip(np.searchsorted(S, x), 1, S.size - 2)
+    j = np.where((j < S.size - 2) & (np.abs(S[j + 1] - x) < np.abs(S[j - 1] - x)), j + 1, j)
+    x0, x1, x2 = S[j - 1], S[j], S[j + 1]
+    den = np.stack([(x0 - x1) * (x0 - x2), (x1 - x0) * (x1 - x2), (x2 - x0) * (x2 - x1)])
+    a = np.stack([x1, x0, x0])
+    b = np.stack([x2, x2, x1])
+    w0 = (x - a) * (x - b) / den
+    w1 = ((x - a) + (x - b)) / den
+    w2 = 2.0 / den
+    return j, w0, w1, w2
+
+
+@instrument("pricing.crank_nicolson_bs_batch")
+def crank_nicolson_bs_batch(S_eval, K, T: float, r: float, sigma: float, option="call",
+                            M_S: int = 400, M_T: int = 200, Smax: float | None = None,
+                            concentration: float = 0.1, rannacher_steps: int = 2):
+    """
+    Crank–Nicolson multi-payoffs : tous les strikes / types (call, put) sont
+    résolus simultanément comme un système à seconds membres multiples
+    partageant une seule factorisation.
+
+    - grille sinh concentrée autour des strikes (cf. sinh_grid) ;
+    - démarrage de Rannacher : les 'rannacher_steps' premiers pas sont
+      remplacés par 2·rannacher_steps demi-pas d'Euler implicite, ce qui
+      amortit les oscillations dues au payoff non lisse ;
+    - prix, Delta et Gamma interpolés (Lagrange quadratique) aux spots S_eval.
+
+    Parameters
+    ----------
+    S_eval : spots auxquels restituer les résultats (scalaire ou tableau)
+    K : strikes (tableau de taille P)
+    option : 'call', 'put' ou tableau de taille P ('call'/'put')
+
+    Returns
+    -------
+    dict {'price', 'delta', 'gamma'} de tableaux (P, n_spots),
+    plus 'S_grid' et 'V_grid' (M_S+1, P) à t = 0.
+    """
+    S_eval = np.atleast_1d(np.asarray(S_eval, dtype=float))
+    K = np.atleast_1d(np.asarray(K, dtype=float))
+    is_call = np.broadcast_to(np.asarray(option) == "call", K.shape)
+    if Smax is None:
+        Smax = 4.0 * max(K.max(), S_eval.max())
+
+    center = 0.5 * (K.min() + K.max())
+    width = concentration * center + 0.5 * (K.max() - K.min())
+    S = sinh_grid(Smax, center, M_S, width)
+    l, d, u = _bs_operator(S, r, sigma)
+
+    def boundaries(tau):
+        disc_K = K * np.exp(-r * tau)
+        return np.where(is_call, 0.0, disc_K), np.where(is_call, Smax - disc_K, 0.0)
+
+    def factor(theta, dt):
+        return _tridiag_factor(-theta * dt * l[1:], 1.0 - theta * dt * d, -theta * dt * u[:-1])
+
+    def step(V, lu, theta, dt, tau_old):
+        # (I − θΔt L) V_new = (I + (1−θ)Δt L) V_old + termes de bord
+        w = (1.0 - theta) * dt
+        rhs = V[1:-1] + w * (d[:, None] * V[1:-1] + l[:, None] * V[:-2] + u[:, None] * V[2:])
+        lo_new, hi_new = boundaries(tau_old + dt)
+        rhs[0] += theta * dt * l[0] * lo_new
+        rhs[-1] += theta * dt * u[-1] * hi_new
+        V[1:-1] = _tridiag_solve(lu, rhs)
+        V[0], V[-1] = lo_new, hi_new
+        return tau_old + dt
+
+    # Condition terminale (colonnes = payoffs)
+    V = np.where(is_call, np.maximum(S[:, None] - K, 0.0), np.maximum(K - S[:, None], 0.0))
+    V = np.asfortranarray(V)
+
+    dt = T / M_T
+    n_rannacher = min(rannacher_steps, M_T)
+    tau = 0.0
+    if n_rannacher:
+        lu_ie = factor(1.0, 0.5 * dt)
+        for _ in range(2 * n_rannacher):
+            tau = step(V, lu_ie, 1.0, 0.5 * dt, tau)
+    lu_cn = factor(0.5, dt)
+    for _ in range(M_T - n_rannacher):
+        tau = step(V, lu_cn, 0.5, dt, tau)
+
+    j, w0, w1, w2 = _quadratic_weights(S, S_eval)
+    nodes = (V[j - 1], V[j], V[j + 1])
+    price, delta, gamma = (sum(w[k][:, None] * nodes[k] for k in range(3)).T for w in (w0, w1, w2))
+    return {"price": price, "delta": delta, "gamma": gamma, "S_grid": S, "V_grid": V}
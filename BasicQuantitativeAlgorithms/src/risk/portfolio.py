@@ -0,0 +1,157 @@
+import numpy as np
+from scipy.linalg import cholesky, solve_triangular
+from scipy.special import ndtri
+
+from pricing.black_scholes import _d1_d2, _N
+from pricing.greeks import bs_greeks
+from instrumentation import instrument
+
+METHODS = ("full", "delta_gamma")
+
+
+# ---- 1. Scénarios de facteurs de risque ----
+
+def iman_conover(X: np.ndarray, corr: np.ndarray, random_state=None) -> np.ndarray:
+    """
+    Impose la corrélation de rangs 'corr' aux colonnes de X (M, d) sans
+    toucher aux marginales (Iman–Conover) : scores normaux permutés,
+    décorrélés puis recorrélés par Cholesky, et chaque colonne de X est
+    réordonnée selon les rangs des scores.
+    """
+    X = np.asarray(X, dtype=float)
+    M, d = X.shape
+    rng = np.random.default_rng(random_state)
+    scores = ndtri(np.arange(1, M + 1) / (M + 1.0))
+    Z = np.column_stack([rng.permutation(scores) for _ in range(d)])
+    L_E = cholesky(np.corrcoef(Z, rowvar=False), lower=True)
+    L_C = cholesky(np.asarray(corr, dtype=float), lower=True)
+    Z = solve_triangular(L_E, Z.T, lower=True).T @ L_C.T
+    ranks = np.argsort(np.argsort(Z, axis=0), axis=0)
+    return np.take_along_axis(np.sort(X, axis=0), ranks, axis=0)
+
+
+def simulate_risk_factors(models, horizon: float, M: int, corr=None, n_steps: int = 1,
+                          random_state=None) -> np.ndarray:
+    """
+    Scénarios (M, d) des sous-jacents à l'horizon : chaque PathModel fournit sa
+    marginale via simulate_terminal, la dépendance est imposée par Iman–Conover.
+    """
+    if isinstance(random_state, (np.random.Generator, np.random.SeedSequence)):
+        seeds = random_state.spawn(len(models) + 1)
+    else:
+        seeds = np.random.SeedSequence(random_state).spawn(len(models) + 1)
+    X = np.column_stack([np.asarray(m.simulate_terminal(horizon, n_steps, M, random_state=s), dtype=float)
+                         for m, s in zip(models, seeds)])
+    if corr is not None and len(models) > 1:
+        X = iman_conover(X, corr, random_state=seeds[-1])
+    return X
+
+
+# ---- 2. Revalorisation du livre ----
+
+def _book(positions):
+    """Normalise un livre {'asset', 'K', 'T', 'sigma', 'quantity', 'option'} en tableaux."""
+    K = np.atleast_1d(np.asarray(positions["K"], dtype=float))
+    n = K.size
+    asset = np.broadcast_to(np.asarray(positions.get("asset", 0), dtype=int), (n,))
+    T = np.broadcast_to(np.asarray(positions["T"], dtype=float), (n,))
+    sigma = np.broadcast_to(np.asarray(positions["sigma"], dtype=float), (n,))
+    qty = np.broadcast_to(np.asarray(positions.get("quantity", 1.0), dtype=float), (n,))
+    option = np.broadcast_to(np.asarray(positions.get("option", "call")), (n,))
+    if not np.all(np.isin(option, ("call", "put"))):
+        raise ValueError("option doit être 'call' ou 'put'.")
+    return asset, K, T, sigma, qty, option == "call"
+
+
+def _bs_value(S, K, T, r, sigma, is_call):
+    # calls et puts mélangés en une passe (parité call-put)
+    S, K, T, r, sigma, d1, d2, degenerate = _d1_d2(S, K, T, r, sigma)
+    call = S * _N(d1) - K * np.exp(-r * T) * _N(d2)
+    call = np.where(degenerate, np.maximum(0.0, S - K), call)
+    return np.where(is_call, call, call - S + K * np.exp(-r * np.maximum(T, 0.0)))
+
+
+def _book_greeks(S0, K, T, r, sigma, is_call):
+    """Delta, Gamma, Theta (= -dV/dT) par position au spot courant."""
+    delta, gamma, theta = (np.empty_like(K) for _ in range(3))
+    for payoff, mask in (("call", is_call), ("put", ~is_call)):
+        if np.any(mask):
+            g = bs_greeks(S0[mask], K[mask], T[mask], r, sigma[mask], payoff=payoff)
+            delta[mask], gamma[mask], theta[mask] = g["delta"], g["gamma"], g["theta"]
+    return delta, gamma, theta
+
+
+# ---- 3. VaR / CVaR du portefeuille ----
+
+@instrument("risk.portfolio_var_cvar")
+def portfolio_var_cvar(models, positions, horizon: float, r: float, M: int = 100_000,
+                       alpha: float = 0.99, corr=None, method: str = "full", n_steps: int = 1,
+                       random_state=None, max_elements: int = 4_000_000):
+    """
+    VaR/CVaR Monte Carlo d'un livre d'options européennes sur les sous-jacents
+    'models' (un PathModel par facteur, positions['asset'] = indice du facteur).
+
+    method="full" revalorise chaque position en Black–Scholes sur chaque
+    scénario (maturité résiduelle T - horizon) ; method="delta_gamma" utilise
+    l'approximation Delta/Gamma/Theta au spot courant. Les scénarios sont
+    traités par paquets de max_elements (scénarios x positions) : la mémoire
+    ne dépend pas de M x nombre de positions.
+
+    Une seconde passe ne revalorise que les scénarios de queue pour obtenir les
+    contributions à la CVaR (allocation d'Euler : leur somme vaut la CVaR).
+    Même convention que var_cvar : P&L négatifs = pertes.
+
+    Retourne un dict : var, cvar, contributions (par position), pnl (M,), scenarios (M, d).
+    """
+    if method not in METHODS:
+        raise ValueError(f"method doit être dans {METHODS}.")
+    asset, K, T, sigma, qty, is_call = _book(positions)
+    S0_factors = np.array([m.S0 for m in models], dtype=float)
+    S0 = S0_factors[asset]
+    scenarios = simulate_risk_factors(models, horizon, M, corr=corr, n_steps=n_steps,
+                                      random_state=random_state)
+
+    if method == "full":
+        T_h = T - horizon
+        V0 = _bs_value(S0, K, T, r, sigma, is_call)
+
+        def position_pnl(S):
+            return qty * (_bs_value(S[:, asset], K, T_h, r, sigma, is_call) - V0)
+    else:
+        delta, gamma, theta = _book_greeks(S0, K, T, r, sigma, is_call)
+        delta, gamma, theta = qty * delta, qty * gamma, qty * theta
+
+        def position_pnl(S):
+            dS = S[:, asset] - S0
+            return delta * dS + 0.5 * gamma * dS * dS + theta * horizon
+
+    chunk = max(1, int(max_elements) // K.size)
+
+    # Passe 1 : P&L agrégé par scénario (seul vecteur de taille M conservé)
+    if method == "delta_gamma":
+        # agrégation par sous-jacent : O(M x d) au lieu de O(M x positions)
+        d = len(models)
+        D, G = np.bincount(asset, delta, d), np.bincount(asset, gamma, d)
+        dS = scenarios - S0_factors
+        pnl = dS @ D + 0.5 * (dS * dS) @ G + theta.sum() * horizon
+    else:
+        pnl = np.empty(M)
+        for start in range(0, M, chunk):
+            stop = min(start + chunk, M)
+            pnl[start:stop] = position_pnl(scenarios[start:stop]).sum(axis=1)
+
+    var = float(np.quantile(pnl, 1 - alpha))
+    tail = np.flatnonzero(pnl <= var)
+
+    # Passe 2 : contributions sur les seuls scénarios de queue
+    contributions = np.zeros(K.size)
+    for start in range(0, tail.size, chunk):
+        contributions += position_pnl(scenarios[tail[start:start + chunk]]).sum(axis=0)
+    if tail.size:
+        contributions /= tail.size
+        cvar = float(np.mean(pnl[tail]))
+    else:
+        cvar = var
+
+    return {"var": var, "cvar": cvar, "contributions": contributions,
+            "pnl": pnl, "scenarios": scenarios}
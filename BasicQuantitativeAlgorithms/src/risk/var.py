@@ -1,4 +1,8 @@
+import heapq
+from collections import deque
+
 import numpy as np
+from stats import rolling_var_cvar
 
 def var_cvar_from_prices(prices: np.ndarray, horizon: int = 1, alpha: float = 0.95):
     """
@@ -10,4 +14,126 @@ def var_cvar_from_prices(prices: np.ndarray, horizon: int = 1, alpha: float = 0.
     q = float(np.quantile(ret, 1 - alpha))
     tail = ret[ret <= q]
     cvar = float(np.mean(tail)) if tail.size else q
-    return q, cvar
\ No newline at end of file
+    return q, cvar
+
+def rolling_var_cvar_from_prices(prices: np.ndarray, window: int, horizon: int = 1, alpha: float = 0.95):
+    """
+    (VaR, CVaR) de var_cvar_from_prices sur chaque fenêtre glissante de 'window'
+    rendements, pour tout l'historique en une passe vectorisée.
+    """
+    prices = np.asarray(prices, dtype=float)
+    ret = np.diff(np.log(prices), n=horizon)
+    return rolling_var_cvar(ret, window, alpha=alpha)
+
+
+class RollingVaR:
+    """
+    VaR/CVaR empiriques sur les 'window' derniers rendements, alimentées tick
+    par tick. Structure de statistique d'ordre à deux tas : le tas « bas »
+    (max) contient les k+1 plus petits rendements, k = ⌊(n−1)(1−alpha)⌋, le tas
+    « haut » (min) les autres ; les rendements sortis de la fenêtre sont
+    supprimés paresseusement. Mise à jour en O(log w), VaR en O(1) (sommets
+    des deux tas), CVaR en O(taille de la queue). Mêmes conventions que
+    var_cvar_from_prices.
+    """
+
+    def __init__(self, window: int, alpha: float = 0.95, horizon: int = 1):
+        self.window = int(window)
+        self.alpha = float(alpha)
+        self.horizon = int(horizon)
+        self._log_prices = deque(maxlen=self.horizon + 1)
+        self._returns = deque()      # (rendement, numéro) dans l'ordre d'arrivée
+        self._seq = 0
+        self._side = {}              # numéro -> 0 (tas bas) / 1 (tas haut), rendements vivants
+        self._lo = []                # entrées (-rendement, -numéro) : tas max
+        self._hi = []                # entrées (rendement, numéro) : tas min
+        self._n_lo = 0
+        self._n_hi = 0
+        self._hi_count = {}          # multiplicité des valeurs du tas haut (ex aequo avec la VaR)
+
+    # -- tas à suppression paresseuse --
+    def _top_lo(self):
+        while self._side.get(-self._lo[0][1]) != 0:
+            heapq.heappop(self._lo)
+        return -self._lo[0][0], -self._lo[0][1]
+
+    def _top_hi(self):
+        while self._side.get(self._hi[0][1]) != 1:
+            heapq.heappop(self._hi)
+        return self._hi[0]
+
+    def _push(self, value, seq, side):
+        self._side[seq] = side
+        if side == 0:
+            heapq.heappush(self._lo, (-value, -seq))
+            self._n_lo += 1
+        else:
+            heapq.heappush(self._hi, (value, seq))
+            self._n_hi += 1
+            self._hi_count[value] = self._hi_count.get(value, 0) + 1
+
+    def _remove(self, value, seq):
+        side = self._side.pop(seq)
+        if side == 0:
+            self._n_lo -= 1
+        else:
+            self._n_hi -= 1
+            c = self._hi_count[value] - 1
+            if c:
+                self._hi_count[value] = c
+            else:
+                del self._hi_count[value]
+
+    def _rebalance(self):
+        n = self._n_lo + self._n_hi
+        target = int(np.floor((n - 1) * (1 - self.alpha))) + 1 if n else 0
+        while self._n_lo > target:
+            value, seq = self._top_lo()
+            self._remove(value, seq)
+            self._push(value, seq, 1)
+        while self._n_lo < target:
+            value, seq = self._top_hi()
+            self._remove(value, seq)
+            self._push(value, seq, 0)
+        # compactage : les entrées mortes ne dépassent pas la taille vivante
+        for name, live, sign in (("_lo", self._n_lo, -1), ("_hi", self._n_hi, 1)):
+            heap = getattr(self, name)
+            if len(heap) > 2 * live + 16:
+                side = 0 if sign < 0 else 1
+                heap = [e for e in heap if self._side.get(sign * e[1]) == side]
+                heapq.heapify(heap)
+                setattr(self, name, heap)
+
+    def push_return(self, ret: float):
+        """Ajoute un rendement ; le plus ancien sort de la fenêtre si elle est pleine."""
+        ret = float(ret)
+        seq = self._seq
+        self._seq += 1
+        self._returns.append((ret, seq))
+        # numéro croissant : à valeur égale, le nouveau rendement est le plus grand
+        self._push(ret, seq, 0 if self._n_lo and ret < self._top_lo()[0] else 1)
+        if len(self._returns) > self.window:
+            self._remove(*self._returns.popleft())
+        self._rebalance()
+        return self
+
+    def update(self, price: float):
+        """Ajoute un prix ; le rendement est calculé comme dans var_cvar_from_prices."""
+        self._log_prices.append(np.log(price))
+        if len(self._log_prices) == self.horizon + 1:
+            self.push_return(np.diff(np.asarray(self._log_prices), n=self.horizon)[0])
+        return self
+
+    def var_cvar(self):
+        n = self._n_lo + self._n_hi
+        if n == 0:
+            return float("nan"), float("nan")
+        h = (n - 1) * (1 - self.alpha)
+        lo = int(np.floor(h))
+        x_lo = self._top_lo()[0]
+        # interpolation de np.quantile (même arrondi que var_cvar près d'un rang entier)
+        q = x_lo if lo + 1 >= n else float(np.quantile([x_lo, self._top_hi()[0]], h - lo))
+        # queue : tout le tas bas (<= x_lo <= q) et les ex aequo de q dans le tas haut
+        tail = [-v for v, s in self._lo if self._side.get(-s) == 0]
+        tail += [q] * self._hi_count.get(q, 0)
+        return float(q), float(np.mean(tail))
@@ -1,22 +1,59 @@
 from typing import Tuple
 import numpy as np
-from .models import GBM
+
+METHODS = ("exact", "euler", "milstein")
+
 
 def simulate_gbm(mu: float, sigma: float, S0: float, T: float, N: int, M: int,
-                 method: str = "exact", random_state=None) -> Tuple[np.ndarray, np.ndarray]:
-    """Simule un GBM avec méthode 'exact' (solution fermée) ou 'euler'."""
-    gbm = GBM(mu=mu, sigma=sigma, S0=S0)
+                 method: str = "exact", random_state=None,
+                 dtype=np.float64, block_elements: int = 2 ** 19) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Simule un GBM avec méthode 'exact' (solution fermée), 'euler' ou 'milstein'.
+    random_state est utilisé dans toutes les branches. Les schémas discrets sont
+    vectorisés : facteurs de croissance 1 + μdt + σdW (+ ½σ²(dW² - dt) pour
+    Milstein) puis produit cumulé, sans boucle sur les pas ; le flux aléatoire
+    est le même que la boucle pas à pas (un tirage de M par pas).
+
+    Les normales sont tirées directement dans 'dtype' par blocs d'environ
+    block_elements nombres et les incréments construits dans le tableau de
+    sortie (M, N+1), cumulés en place : dtype=np.float32 divise par deux le
+    pic mémoire, qui reste proche de la taille du résultat.
+    """
+    if method not in METHODS:
+        raise ValueError("method doit être 'exact', 'euler' ou 'milstein'.")
+    dtype = np.dtype(dtype)
+    dt = T / N
+    t = np.linspace(0.0, T, N + 1)
+    rng = np.random.default_rng(random_state)
+    S = np.empty((M, N + 1), dtype=dtype)
+
     if method == "exact":
-        return gbm.simulate(T=T, N=N, M=M)
-    elif method == "euler":
-        dt = T / N
-        t = np.linspace(0.0, T, N + 1)
-        rng = np.random.default_rng(random_state)
-        S = np.empty((M, N + 1), dtype=float)
-        S[:, 0] = S0
-        for k in range(N):
-            dW = rng.normal(0.0, np.sqrt(dt), size=M)
-            S[:, k + 1] = S[:, k] + mu * S[:, k] * dt + sigma * S[:, k] * dW
+        # log S : incréments (μ - σ²/2)dt + σ√dt Z, par blocs de trajectoires (flux de GBM.simulate)
+        step = max(1, block_elements // max(N, 1))
+        for i in range(0, M, step):
+            Z = rng.standard_normal((min(step, M - i), N), dtype=dtype)
+            Z *= sigma * np.sqrt(dt)
+            Z += (mu - 0.5 * sigma ** 2) * dt
+            S[i:i + step, 1:] = Z
+        S[:, 0] = 0.0
+        np.cumsum(S[:, 1:], axis=1, out=S[:, 1:])
+        np.exp(S, out=S)
+        S *= S0
         return t, S
-    else:
-        raise ValueError("method doit être 'exact' ou 'euler'.")
+
+    # facteurs de croissance par blocs de pas : tirages (pas, M) comme la boucle pas à pas
+    step = max(1, block_elements // max(M, 1))
+    for j in range(0, N, step):
+        dW = rng.standard_normal((min(step, N - j), M), dtype=dtype)
+        dW *= np.sqrt(dt)
+        growth = sigma * dW
+        if method == "milstein":
+            dW *= dW
+            dW -= dt
+            dW *= 0.5 * sigma ** 2
+            growth += dW
+        growth += 1.0 + mu * dt
+        S[:, j + 1:j + 1 + growth.shape[0]] = growth.T
+    S[:, 0] = S0
+    np.cumprod(S, axis=1, out=S)
+    return t, S
@@ -20,3 +20,169 @@ def gbm_theoretical_log_return_moments(mu: float, sigma: float, T: float):
     mean = (mu - 0.5 * sigma**2) * T
     var = sigma**2 * T
     return mean, var
+
+
+class RunningMoments:
+    """
+    Moments en flux jusqu'à l'ordre 4 (Welford / Terriberry), mis à jour
+    observation par observation (push, O(1)) ou par blocs avec les formules
+    de fusion de Chan et Pébay : mémoire O(1) quel que soit le nombre
+    d'observations, et fusion exacte de résultats partiels.
+    """
+
+    def __init__(self):
+        self.n = 0
+        self.mean = 0.0
+        self.m2 = 0.0      # sommes des puissances 2, 3, 4 des écarts à la moyenne
+        self.m3 = 0.0
+        self.m4 = 0.0
+
+    def push(self, x: float):
+        """Ajoute une observation en O(1)."""
+        n1 = self.n
+        self.n = n = n1 + 1
+        delta = float(x) - self.mean
+        delta_n = delta / n
+        delta_n2 = delta_n * delta_n
+        term1 = delta * delta_n * n1
+        self.mean += delta_n
+        self.m4 += term1 * delta_n2 * (n * n - 3 * n + 3) + 6.0 * delta_n2 * self.m2 - 4.0 * delta_n * self.m3
+        self.m3 += term1 * delta_n * (n - 2) - 3.0 * delta_n * self.m2
+        self.m2 += term1
+        return self
+
+    def update(self, x):
+        """Ajoute un bloc d'observations (scalaire ou tableau)."""
+        x = np.asarray(x, dtype=float).ravel()
+        if x.size == 0:
+            return self
+        other = RunningMoments()
+        other.n = x.size
+        other.mean = float(np.mean(x))
+        d = x - other.mean
+        d2 = d * d
+        other.m2 = float(np.sum(d2))
+        other.m3 = float(np.dot(d2, d))
+        other.m4 = float(np.dot(d2, d2))
+        return self.merge(other)
+
+    def merge(self, other: "RunningMoments"):
+        """Fusionne un autre accumulateur dans celui-ci."""
+        if other.n == 0:
+            return self
+        na, nb = self.n, other.n
+        n = na + nb
+        delta = other.mean - self.mean
+        d2 = delta * delta
+        m2a, m3a = self.m2, self.m3
+        self.m4 += (other.m4 + d2 * d2 * na * nb * (na * na - na * nb + nb * nb) / n ** 3
+                    + 6.0 * d2 * (na * na * other.m2 + nb * nb * m2a) / n ** 2
+                    + 4.0 * delta * (na * other.m3 - nb * m3a) / n)
+        self.m3 += (other.m3 + d2 * delta * na * nb * (na - nb) / n ** 2
+                    + 3.0 * delta * (na * other.m2 - nb * m2a) / n)
+        self.m2 += other.m2 + d2 * na * nb / n
+        self.mean += delta * nb / n
+        self.n = n
+        return self
+
+    def var(self, ddof: int = 0) -> float:
+        return self.m2 / (self.n - ddof) if self.n > ddof else float("nan")
+
+    def skew(self) -> float:
+        """Asymétrie (même convention que calibration.moments.empirical_moments)."""
+        return float(np.sqrt(self.n) * self.m3 / self.m2 ** 1.5) if self.m2 > 0 else float("nan")
+
+    def kurt(self) -> float:
+        """Kurtosis en excès (centrée, −3)."""
+        return float(self.n * self.m4 / self.m2 ** 2 - 3.0) if self.m2 > 0 else float("nan")
+
+    def moments(self):
+        """(moyenne, variance, asymétrie, kurtosis) comme empirical_moments."""
+        return self.mean, self.var(), self.skew(), self.kurt()
+
+
+class RunningCovariance:
+    """
+    Moyennes, variances et covariance de deux séries (x, y) en flux,
+    fusion par blocs comme RunningMoments.
+    """
+
+    def __init__(self):
+        self.n = 0
+        self.mean_x = 0.0
+        self.mean_y = 0.0
+        self.cxx = 0.0
+        self.cyy = 0.0
+        self.cxy = 0.0
+
+    def update(self, x, y):
+        x = np.asarray(x, dtype=float).ravel()
+        y = np.asarray(y, dtype=float).ravel()
+        if x.size == 0:
+            return self
+        other = RunningCovariance()
+        other.n = x.size
+        other.mean_x, other.mean_y = float(np.mean(x)), float(np.mean(y))
+        dx, dy = x - other.mean_x, y - other.mean_y
+        other.cxx, other.cyy, other.cxy = float(dx @ dx), float(dy @ dy), float(dx @ dy)
+        return self.merge(other)
+
+    def merge(self, other: "RunningCovariance"):
+        if other.n == 0:
+            return self
+        n = self.n + other.n
+        f = self.n * other.n / n
+        dx = other.mean_x - self.mean_x
+        dy = other.mean_y - self.mean_y
+        self.mean_x += dx * other.n / n
+        self.mean_y += dy * other.n / n
+        self.cxx += other.cxx + dx * dx * f
+        self.cyy += other.cyy + dy * dy * f
+        self.cxy += other.cxy + dx * dy * f
+        self.n = n
+        return self
+
+
+def rolling_moments(x: np.ndarray, window: int):
+    """
+    Moyenne, variance, asymétrie et kurtosis (excès) sur fenêtre glissante,
+    vectorisé sur tout le tableau (remplissage d'historique) : sommes de
+    puissances cumulées des écarts à la moyenne globale, O(n) en temps.
+    Retourne 4 tableaux de taille len(x) - window + 1.
+    """
+    x = np.asarray(x, dtype=float)
+    if not 1 <= window <= x.size:
+        raise ValueError("window doit être dans [1, len(x)].")
+    c = x - x.mean()          # centrage global : limite les annulations
+    sums = []
+    for p in (1, 2, 3, 4):
+        cs = np.concatenate([[0.0], np.cumsum(c ** p)])
+        sums.append((cs[window:] - cs[:-window]) / window)
+    s1, s2, s3, s4 = sums
+    mean = s1
+    var = np.maximum(s2 - s1 ** 2, 0.0)
+    m3 = s3 - 3.0 * s1 * s2 + 2.0 * s1 ** 3
+    m4 = s4 - 4.0 * s1 * s3 + 6.0 * s1 ** 2 * s2 - 3.0 * s1 ** 4
+    with np.errstate(divide="ignore", invalid="ignore"):
+        skew = m3 / var ** 1.5
+        kurt = m4 / var ** 2 - 3.0
+    return mean + x.mean(), var, skew, kurt
+
+
+def rolling_var_cvar(returns: np.ndarray, window: int, alpha: float = 0.95, chunk: int = 4096):
+    """
+    VaR/CVaR (convention de var_cvar) sur chaque fenêtre glissante de 'window'
+    rendements, vectorisé par paquets de 'chunk' fenêtres (mémoire bornée).
+    Retourne deux tableaux de taille len(returns) - window + 1.
+    """
+    returns = np.asarray(returns, dtype=float)
+    windows = np.lib.stride_tricks.sliding_window_view(returns, window)
+    q = np.empty(windows.shape[0])
+    cvar = np.empty(windows.shape[0])
+    for i in range(0, windows.shape[0], chunk):
+        w = windows[i:i + chunk]
+        qi = np.quantile(w, 1 - alpha, axis=1)
+        tail = w <= qi[:, None]
+        q[i:i + chunk] = qi
+        cvar[i:i + chunk] = np.sum(np.where(tail, w, 0.0), axis=1) / np.sum(tail, axis=1)
+    return q, cvar
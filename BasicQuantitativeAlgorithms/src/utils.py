@@ -5,15 +5,25 @@ import numpy as np
 
 @dataclass
 class RNG:
-    seed: int | None = None
-    def post_init(self):
-        self.rng = np.random.default_rng(self.seed)
+    seed: int | np.random.SeedSequence | None = None
+    def __post_init__(self):
+        if isinstance(self.seed, np.random.SeedSequence):
+            self.seed_seq = self.seed
+        else:
+            self.seed_seq = np.random.SeedSequence(self.seed)
+        self.rng = np.random.default_rng(self.seed_seq)
+    def spawn(self, n: int) -> list["RNG"]:
+        """n flux indépendants et reproductibles (un par worker)."""
+        return [RNG(ss) for ss in self.seed_seq.spawn(n)]
     def normal(self, *a, **k): return self.rng.normal(*a, **k)
     def gamma(self, *a, **k): return self.rng.gamma(*a, **k)
 
-    @contextmanager
-    def timer(name: str):
-        t0 = time.time()
+
+@contextmanager
+def timer(name: str):
+    """Affiche la durée du bloc : with timer("simulation"): ..."""
+    t0 = time.perf_counter()
+    try:
         yield
-        t1 = time.time()
-        print(f"[{name}] {t1 - t0:.3f}s")
\ No newline at end of file
+    finally:
+        print(f"[{name}] {time.perf_counter() - t0:.3f}s")
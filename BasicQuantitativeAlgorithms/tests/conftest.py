@@ -0,0 +1,9 @@
+import pathlib
+import sys
+
+# Les notebooks importent les sous-paquets depuis src/ (``pricing.*``, ``models.*``) ;
+# on reproduit ce sys.path pour les tests.
+ROOT = pathlib.Path(__file__).resolve().parents[1]
+for p in (ROOT, ROOT / "src"):
+    if str(p) not in sys.path:
+        sys.path.insert(0, str(p))
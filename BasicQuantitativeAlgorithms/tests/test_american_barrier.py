@@ -0,0 +1,92 @@
+import numpy as np
+import pytest
+from scipy.stats import norm
+from models.gbm import GBM
+from models.variance_gamma import VarianceGamma
+from pricing.black_scholes import bs_call, bs_put
+from pricing.monte_carlo import lsm_price_american, mc_price_barrier
+from pricing.pde_solver import crank_nicolson_bs
+
+
+def _binomial_put(S0, K, T, r, sigma, n=2000, exercise_every=1):
+    # arbre CRR, exercice tous les 'exercise_every' pas (bermudéen)
+    dt = T / n
+    u = np.exp(sigma * np.sqrt(dt))
+    p = (np.exp(r * dt) - 1 / u) / (u - 1 / u)
+    S = S0 * u ** np.arange(n, -n - 1, -2)
+    V = np.maximum(K - S, 0.0)
+    for i in range(n - 1, -1, -1):
+        S = S[:-1] / u
+        V = np.exp(-r * dt) * (p * V[:-1] + (1 - p) * V[1:])
+        if i % exercise_every == 0 and i > 0:
+            V = np.maximum(V, K - S)
+    return V[0]
+
+
+def _down_and_out_call(S0, K, B, T, r, sigma):
+    lam = (r + 0.5 * sigma ** 2) / sigma ** 2
+    y = np.log(B ** 2 / (S0 * K)) / (sigma * np.sqrt(T)) + lam * sigma * np.sqrt(T)
+    c_di = (S0 * (B / S0) ** (2 * lam) * norm.cdf(y)
+            - K * np.exp(-r * T) * (B / S0) ** (2 * lam - 2) * norm.cdf(y - sigma * np.sqrt(T)))
+    return bs_call(S0, K, T, r, sigma) - c_di
+
+
+def test_pde_american_put_brennan_schwartz_and_psor():
+    ref = _binomial_put(100.0, 100.0, 1.0, 0.05, 0.2)
+    S, V_bs = crank_nicolson_bs(300.0, 100.0, 1.0, 0.05, 0.2, M_S=300, M_T=200, option="put", american=True)
+    _, V_psor = crank_nicolson_bs(300.0, 100.0, 1.0, 0.05, 0.2, M_S=60, M_T=40, option="put", american=True,
+                                  early_exercise="psor", tol=1e-12)
+    _, V_bs_small = crank_nicolson_bs(300.0, 100.0, 1.0, 0.05, 0.2, M_S=60, M_T=40, option="put", american=True)
+    assert abs(np.interp(100.0, S, V_bs) - ref) < 5e-3
+    assert np.allclose(V_psor, V_bs_small, atol=1e-8)
+    assert np.all(V_bs >= np.maximum(100.0 - S, 0.0) - 1e-12)
+    assert np.interp(100.0, S, V_bs) > bs_put(100.0, 100.0, 1.0, 0.05, 0.2) + 0.1
+    # call sans dividende : l'exercice anticipé n'a pas de valeur
+    S, V = crank_nicolson_bs(400.0, 100.0, 1.0, 0.05, 0.2, M_S=400, M_T=200, option="call", american=True)
+    assert abs(np.interp(100.0, S, V) - bs_call(100.0, 100.0, 1.0, 0.05, 0.2)) < 1e-2
+
+
+def test_barrier_pde_and_bridge_corrected_mc_match_closed_form():
+    S0, K, B, T, r, sigma = 100.0, 100.0, 90.0, 1.0, 0.05, 0.25
+    ref = _down_and_out_call(S0, K, B, T, r, sigma)
+    S, V = crank_nicolson_bs(400.0, K, T, r, sigma, M_S=600, M_T=200, option="call",
+                             barrier=B, barrier_type="down-and-out")
+    assert S[0] == B and abs(np.interp(S0, S, V) - ref) < 2e-3
+
+    price, ci = mc_price_barrier(GBM(r, sigma, S0), K, B, T, r, 100_000, N=50, random_state=2)
+    assert abs(price - ref) < 2 * ci
+    discrete, _ = mc_price_barrier(GBM(r, sigma, S0), K, B, T, r, 100_000, N=50, random_state=2,
+                                   bridge_correction=False)
+    assert discrete > price + 0.5
+
+
+def test_longstaff_schwartz_bermudan_put():
+    ref = _binomial_put(100.0, 100.0, 1.0, 0.05, 0.2, n=2000, exercise_every=40)   # 50 dates
+    price, ci = lsm_price_american(GBM(0.05, 0.2, 100.0), 100.0, 1.0, 0.05, 100_000,
+                                   n_exercise=50, random_state=3, chunk_size=20_000)
+    assert ref - 2 * ci - 0.03 < price < ref + 2 * ci
+
+
+def test_barrier_argument_validation_and_non_gbm_models():
+    for kwargs in ({"barrier": 90.0}, {"barrier_type": "down-and-out"},
+                   {"barrier": 450.0, "barrier_type": "up-and-out"},
+                   {"barrier": 90.0, "barrier_type": "down-and-out", "S0": 85.0},
+                   {"barrier": 120.0, "barrier_type": "up-and-out", "S0": 125.0}):
+        with pytest.raises(ValueError):
+            crank_nicolson_bs(400.0, 100.0, 1.0, 0.05, 0.2, M_S=50, M_T=20, **kwargs)
+
+    # pas de pont brownien pour un modèle à sauts : surveillance discrète par défaut
+    vg = VarianceGamma(theta=-0.14, sigma=0.12, nu=0.2, S0=100.0, mu=0.05)
+    auto = mc_price_barrier(vg, 100.0, 90.0, 1.0, 0.05, 20_000, N=50, random_state=1)
+    discrete = mc_price_barrier(vg, 100.0, 90.0, 1.0, 0.05, 20_000, N=50, random_state=1, bridge_correction=False)
+    assert auto == discrete
+    with pytest.raises(ValueError):
+        mc_price_barrier(vg, 100.0, 90.0, 1.0, 0.05, 1000, N=50, bridge_correction=True)
+
+
+def test_bridge_correction_for_gbm_imported_through_src_package():
+    from src.models import GBM as PackageGBM
+    args = (100.0, 90.0, 1.0, 0.05, 20_000)
+    price, _ = mc_price_barrier(PackageGBM(0.05, 0.2, 100.0), *args, N=50, random_state=1)
+    ref, _ = mc_price_barrier(GBM(0.05, 0.2, 100.0), *args, N=50, random_state=1)
+    assert price == ref
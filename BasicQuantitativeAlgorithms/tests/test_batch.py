@@ -0,0 +1,46 @@
+import numpy as np
+import pytest
+from models.gbm import GBM
+from models.heston import Heston
+from models.variance_gamma import VarianceGamma
+
+
+def test_gbm_parameter_grid_matches_scalar_loop():
+    sigmas = np.linspace(0.1, 0.5, 5)
+    batch = GBM(mu=[[0.0], [0.05]], sigma=sigmas, S0=100.0)
+    assert batch.batch_shape == (2, 5)
+    _, S = batch.simulate(T=1.0, N=12, M=200, random_state=4)
+    ST = batch.simulate_terminal(T=1.0, N=12, M=200, random_state=4)
+    assert S.shape == (2, 5, 200, 13) and ST.shape == (2, 5, 200)
+    for i, mu in enumerate((0.0, 0.05)):
+        for j, sigma in enumerate(sigmas):
+            _, S_ref = GBM(mu, sigma, 100.0).simulate(T=1.0, N=12, M=200, random_state=4)
+            assert np.allclose(S[i, j], S_ref, rtol=1e-12)
+    # nombres aléatoires communs : le prix est monotone en sigma sur la grille
+    prices = np.maximum(ST[0] - 100.0, 0.0).mean(axis=-1)
+    assert np.all(np.diff(prices) > 0)
+
+
+@pytest.mark.parametrize("scheme", ["euler", "log_euler", "qe"])
+def test_heston_parameter_grid_matches_scalar_loop(scheme):
+    kappas, xis = np.array([0.5, 1.5, 3.0]), np.array([0.3, 0.6, 0.9])
+    batch = Heston(kappa=kappas, theta=0.04, xi=xis, rho=-0.7, v0=0.04, S0=100.0, scheme=scheme)
+    _, S, v = batch.simulate(T=1.0, N=20, M=300, random_state=5, antithetic=True, return_variance=True,
+                             block_steps=8)
+    ST = batch.simulate_terminal(T=1.0, N=20, M=300, random_state=5, antithetic=True)
+    assert S.shape == v.shape == (3, 300, 21)
+    assert np.allclose(ST, S[..., -1], rtol=1e-12)
+    for i in range(3):
+        model = Heston(kappa=kappas[i], theta=0.04, xi=xis[i], rho=-0.7, v0=0.04, S0=100.0, scheme=scheme)
+        _, S_ref, v_ref = model.simulate(T=1.0, N=20, M=300, random_state=5, antithetic=True,
+                                         return_variance=True)
+        assert np.allclose(S[i], S_ref, rtol=1e-12)
+        assert np.allclose(v[i], v_ref, rtol=1e-12)
+
+
+def test_variance_gamma_theta_grid():
+    thetas = np.array([-0.2, -0.1, 0.0])
+    ST = VarianceGamma(theta=thetas, sigma=0.2, nu=0.3, S0=100.0).simulate_terminal(1.0, 10, 500, random_state=6)
+    for i, theta in enumerate(thetas):
+        ref = VarianceGamma(theta=theta, sigma=0.2, nu=0.3, S0=100.0).simulate_terminal(1.0, 10, 500, random_state=6)
+        assert np.allclose(ST[i], ref, rtol=1e-12)
@@ -0,0 +1,26 @@
+import numpy as np
+from pricing.black_scholes import bs_call, bs_put
+from pricing.greeks import bs_greeks, greeks_fd
+
+
+def test_vectorized_matches_scalar():
+    K = np.linspace(60.0, 140.0, 9)
+    T = np.array([0.1, 0.5, 1.0, 2.0])[:, None]
+    calls = bs_call(100.0, K, T, 0.02, 0.25)
+    puts = bs_put(100.0, K, T, 0.02, 0.25)
+    assert calls.shape == (4, 9)
+    for i in range(T.shape[0]):
+        for j in range(K.size):
+            assert abs(calls[i, j] - bs_call(100.0, K[j], T[i, 0], 0.02, 0.25)) < 1e-12
+    # parité call-put
+    assert np.allclose(calls - puts, 100.0 - K * np.exp(-0.02 * T), atol=1e-10)
+
+
+def test_analytic_greeks_match_finite_differences():
+    for payoff in ("call", "put"):
+        g = bs_greeks(100.0, np.array([80.0, 100.0, 120.0]), 1.0, 0.03, 0.2, payoff=payoff)
+        for j, K in enumerate([80.0, 100.0, 120.0]):
+            fd = greeks_fd(100.0, K, 1.0, 0.03, 0.2, payoff=payoff)
+            for name in ("delta", "vega", "rho", "theta"):
+                assert abs(g[name][j] - fd[name]) < 1e-4 * max(1.0, abs(fd[name]))
+            assert abs(g["gamma"][j] - fd["gamma"]) < 1e-3
@@ -0,0 +1,59 @@
+import numpy as np
+from cache import PDEGridCache, make_key, memoize
+from calibration.optimization import calibrate_model
+from models.heston import Heston
+from pricing.black_scholes import bs_call
+from pricing.monte_carlo import mc_price_european
+from pricing.pde_solver import crank_nicolson_bs_batch
+
+
+def test_memoize_rounds_inputs_and_evicts_lru():
+    cached = memoize(maxsize=2, decimals=8)(bs_call)
+    assert cached(100.0, 100.0, 1.0, 0.01, 0.2) == bs_call(100.0, 100.0, 1.0, 0.01, 0.2)
+    cached(100.0 + 1e-12, 100.0, T=1.0, r=0.01, sigma=0.2)
+    assert cached.cache_info()["hits"] == 1
+    cached(100.0, 90.0, 1.0, 0.01, 0.2)
+    cached(100.0, 80.0, 1.0, 0.01, 0.2)          # évince K = 100
+    cached(100.0, 100.0, 1.0, 0.01, 0.2)
+    info = cached.cache_info()
+    assert info["size"] == 2 and info["misses"] == 4
+
+    a = Heston(1.5, 0.04, 0.9, -0.7, 0.04, 100.0)
+    assert make_key(a) == make_key(Heston(1.5, 0.04, 0.9, -0.7, 0.04, 100.0))
+    assert make_key(a) != make_key(Heston(1.5, 0.04, 0.9, -0.6, 0.04, 100.0))
+
+
+def test_memoize_keys_on_seed_and_bypasses_unseeded_calls():
+    cached = memoize()(mc_price_european)
+    model = Heston(1.5, 0.04, 0.9, -0.7, 0.04, 100.0)
+    p1 = cached(model, 100.0, 1.0, 0.0, 2000, N=10, random_state=1)
+    assert cached(model, 100.0, 1.0, 0.0, 2000, N=10, random_state=1) == p1
+    cached(model, 100.0, 1.0, 0.0, 2000, N=10, random_state=2)
+    cached(model, 100.0, 1.0, 0.0, 2000, N=10)
+    info = cached.cache_info()
+    assert (info["hits"], info["misses"], info["bypass"]) == (1, 2, 1)
+
+
+def test_pde_grid_cache_answers_any_spot_from_one_solve():
+    grids = PDEGridCache()
+    spots = np.array([80.0, 95.0, 100.0, 117.0])
+    ref = crank_nicolson_bs_batch(spots, 100.0, 1.0, 0.02, 0.25, Smax=400.0)
+    for i, S in enumerate(spots):
+        out = grids.price(S, 100.0, 1.0, 0.02, 0.25)
+        assert np.isclose(out["price"], ref["price"][0, i], rtol=1e-10)
+        assert np.isclose(out["gamma"], ref["gamma"][0, i], rtol=1e-8)
+    assert grids.info()["misses"] == 1 and grids.info()["hits"] == 3
+    grids.price(450.0, 100.0, 1.0, 0.02, 0.25)    # hors grille : nouvelle résolution
+    assert grids.info()["size"] == 1
+
+
+def test_calibrate_model_cache_option():
+    calls = []
+
+    def objective(theta):
+        calls.append(1)
+        return float(np.sum((np.asarray(theta) - [1.0, -2.0]) ** 2))
+
+    theta, res = calibrate_model(objective, [0.0, 0.0], cache=True)
+    assert np.allclose(theta, [1.0, -2.0], atol=1e-3)
+    assert len(calls) == res.cache_info["misses"] <= res.nfev
@@ -0,0 +1,37 @@
+import numpy as np
+from models.heston import Heston
+from pricing.fourier import cos_price
+from calibration.surface import calibrate_heston_surface, heston_surface_prices
+from calibration.moments import moments_objective, empirical_moments
+
+
+def _surface(params):
+    K = np.tile(np.linspace(70.0, 130.0, 13), 4)
+    T = np.repeat([0.25, 0.5, 1.0, 2.0], 13)
+    model = Heston(*params, S0=100.0)
+    prices = np.concatenate([cos_price(model, K[T == t], t, 0.01, n_terms=256) for t in np.unique(T)])
+    return K, T, prices
+
+
+def test_heston_surface_jacobian_and_calibration():
+    true = np.array([1.8, 0.05, 0.6, -0.65, 0.03])
+    K, T, prices = _surface(true)
+
+    _, jac = heston_surface_prices(true, 100.0, K, T, 0.01)
+    h = 1e-5
+    up, dn = true.copy(), true.copy()
+    up[3] += h
+    dn[3] -= h
+    fd = (heston_surface_prices(up, 100.0, K, T, 0.01)[0] - heston_surface_prices(dn, 100.0, K, T, 0.01)[0]) / (2 * h)
+    assert np.max(np.abs(fd - jac[:, 3])) < 1e-2 * np.max(np.abs(fd))
+
+    theta_hat, res = calibrate_heston_surface(100.0, K, T, 0.01, prices)
+    assert res.success
+    assert np.allclose(theta_hat, true, rtol=1e-4)
+
+
+def test_moments_objective_uses_cached_moments():
+    lr = np.random.default_rng(0).normal(0.0, 0.01, 500)
+    theta = (2.0, 1e-4, 0.1, -0.5, 1e-4)
+    emp = np.array(empirical_moments(lr))
+    assert moments_objective(theta, lr) == moments_objective(theta, None, emp=emp)
@@ -0,0 +1,70 @@
+import numpy as np
+import pytest
+from calibration.likelihood import gbm_mle_from_prices
+from calibration.moments import empirical_moments
+from data_io import (PriceFile, append_prices, iter_log_returns, simulate_to_file, stream_gbm_mle,
+                     stream_log_return_moments, stream_moments, stream_var_cvar)
+from models.gbm import GBM
+from risk.var import var_cvar_from_prices
+from stats import log_return_moments
+
+
+def _prices(n=5000, d=3, seed=0):
+    rng = np.random.default_rng(seed)
+    return 100.0 * np.exp(np.cumsum(0.01 * rng.standard_t(4, (n, d)), axis=0))
+
+
+def test_price_files_and_lazy_returns(tmp_path):
+    P = _prices()
+    np.save(tmp_path / "p.npy", P)
+    np.save(tmp_path / "f.npy", np.asfortranarray(P))
+    for block in (P[:1234], P[1234:]):
+        append_prices(tmp_path / "p.bin", block)
+    expected = np.diff(np.log(P), n=1, axis=0)
+    for f in (PriceFile(tmp_path / "p.npy"), PriceFile(tmp_path / "f.npy"),
+              PriceFile(tmp_path / "p.bin", n_columns=3)):
+        assert f.shape == P.shape
+        assert np.allclose(np.concatenate(list(iter_log_returns(f, block_size=700))), expected)
+    lr5 = np.concatenate(list(iter_log_returns(P[:, 0], block_size=333, horizon=5)))
+    assert np.allclose(lr5, np.log(P[5:, 0] / P[:-5, 0]))
+
+
+def test_streamed_estimators_match_in_memory(tmp_path):
+    P = _prices()
+    P[4000:, 1] = np.nan                  # série plus courte
+    np.save(tmp_path / "p.npy", P)
+    accs = stream_moments(tmp_path / "p.npy", block_size=512)
+    for k in range(3):
+        lr = np.diff(np.log(P[:, k]))
+        assert np.allclose(accs[k].moments(), empirical_moments(lr[~np.isnan(lr)]))
+    assert np.allclose(stream_gbm_mle(tmp_path / "p.npy", 1 / 252, block_size=512),
+                       gbm_mle_from_prices(P.T, 1 / 252))
+
+    np.save(tmp_path / "s.npy", P[:, 0])
+    for horizon, alpha in ((1, 0.95), (10, 0.99)):
+        streamed = stream_var_cvar(tmp_path / "s.npy", horizon, alpha, block_size=600, bins=64)
+        assert np.allclose(streamed, var_cvar_from_prices(P[:, 0], horizon, alpha), rtol=1e-12)
+    with pytest.raises(ValueError):
+        stream_var_cvar(tmp_path / "p.npy")
+
+
+def test_stream_var_cvar_bounded_with_tick_ties(tmp_path):
+    # historique tick : prix sur une grille de 0.01, majorité de rendements nuls
+    rng = np.random.default_rng(5)
+    moves = rng.choice([-2, -1, 0, 0, 0, 0, 0, 0, 1, 2], size=20_000)
+    prices = np.round(100.0 + 0.01 * np.cumsum(moves), 2)
+    np.save(tmp_path / "ticks.npy", prices)
+    for alpha in (0.5, 0.95, 0.99):
+        streamed = stream_var_cvar(tmp_path / "ticks.npy", 1, alpha, block_size=1000, bins=16, max_kept=50)
+        assert np.allclose(streamed, var_cvar_from_prices(prices, 1, alpha), rtol=1e-12)
+
+
+def test_simulate_to_file_matches_chunks(tmp_path):
+    model = GBM(0.05, 0.2, 100.0)
+    t, f = simulate_to_file(model, tmp_path / "paths.npy", 1.0, 12, 1000, chunk_size=300, random_state=4)
+    S = np.concatenate([S for _, S in model.simulate_chunks(1.0, 12, 1000, chunk_size=300, random_state=4)])
+    assert f.shape == (1000, 13) and np.array_equal(f.memmap(), S)
+    assert np.allclose(stream_log_return_moments(f, 100.0, block_size=128), log_return_moments(S, 100.0))
+    _, f = simulate_to_file(GBM(0.05, [0.1, 0.2], 100.0), tmp_path / "st.npy", 1.0, 1, 500,
+                            chunk_size=200, random_state=4, terminal=True)
+    assert f.shape == (2, 500)
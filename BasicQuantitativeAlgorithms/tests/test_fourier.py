@@ -0,0 +1,28 @@
+import numpy as np
+from models.heston import Heston
+from models.variance_gamma import VarianceGamma
+from pricing.black_scholes import bs_call
+from pricing.fourier import cos_price, fft_price, _nodes_cache
+
+
+def test_heston_cos_matches_reference_and_black_scholes_limit():
+    model = Heston(kappa=1.5, theta=0.04, xi=0.9, rho=-0.7, v0=0.04, S0=100.0)
+    assert abs(cos_price(model, 100.0, 1.0, 0.0) - 5.98671) < 1e-4
+    assert abs(fft_price(model, 100.0, 1.0, 0.0) - 5.98671) < 5e-3
+
+    flat = Heston(kappa=1.0, theta=0.04, xi=1e-2, rho=0.0, v0=0.04, S0=100.0)
+    K = np.linspace(70.0, 130.0, 13)
+    assert np.max(np.abs(cos_price(flat, K, 1.0, 0.03) - bs_call(100.0, K, 1.0, 0.03, 0.2))) < 1e-3
+
+
+def test_variance_gamma_cos_vs_fft_and_parity_and_cache():
+    model = VarianceGamma(theta=-0.14, sigma=0.12, nu=0.2, S0=100.0)
+    K = np.array([90.0, 100.0, 110.0])
+    calls = cos_price(model, K, 1.0, 0.1)
+    puts = cos_price(model, K, 1.0, 0.1, option="put")
+    assert np.max(np.abs(calls - fft_price(model, K, 1.0, 0.1))) < 5e-3
+    assert np.allclose(calls - puts, 100.0 - K * np.exp(-0.1), atol=1e-10)
+
+    n_before = len(_nodes_cache)
+    cos_price(VarianceGamma(theta=-0.14, sigma=0.12, nu=0.2, S0=100.0), K, 1.0, 0.1)
+    assert len(_nodes_cache) == n_before
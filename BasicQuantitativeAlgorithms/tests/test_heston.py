@@ -0,0 +1,25 @@
+import numpy as np
+from models.heston import Heston
+
+PARAMS = dict(kappa=1.5, theta=0.04, xi=0.9, rho=-0.7, v0=0.04, S0=100.0)
+# Prix de référence (intégration de Gil-Pelaez de la fonction caractéristique), T=1, r=0, K=100
+REF_ATM_CALL = 5.98671
+
+
+def test_qe_scheme_large_steps_matches_reference_price():
+    model = Heston(**PARAMS, scheme="qe")
+    ST = model.simulate_terminal(T=1.0, N=4, M=200_000, random_state=2)
+    payoff = np.maximum(ST - 100.0, 0.0)
+    se = payoff.std() / np.sqrt(payoff.size)
+    assert abs(payoff.mean() - REF_ATM_CALL) < 3 * se
+    assert abs(ST.mean() - 100.0) < 3 * ST.std() / np.sqrt(ST.size)
+
+
+def test_variance_paths_optional_and_consistent():
+    model = Heston(**PARAMS, scheme="log_euler")
+    t, S = model.simulate(T=1.0, N=30, M=500, random_state=1)
+    t2, S2, v = model.simulate(T=1.0, N=30, M=500, random_state=1, return_variance=True,
+                               block_steps=7)
+    assert np.array_equal(S, S2)
+    assert v.shape == S.shape and (v >= 0).all()
+    assert np.array_equal(S[:, -1], model.simulate_terminal(T=1.0, N=30, M=500, random_state=1))
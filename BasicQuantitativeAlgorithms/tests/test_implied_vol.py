@@ -0,0 +1,34 @@
+import numpy as np
+from pricing.black_scholes import bs_call, bs_put
+from calibration.optimization import implied_vol, fit_bs_vol_to_call_price
+
+
+def test_implied_vol_recovers_surface():
+    rng = np.random.default_rng(0)
+    n = 2000
+    K = rng.uniform(50.0, 200.0, n)
+    T = rng.uniform(0.02, 3.0, n)
+    sigma = rng.uniform(0.05, 1.0, n)
+    is_call = rng.random(n) < 0.5
+    price = np.where(is_call, bs_call(100.0, K, T, 0.03, sigma), bs_put(100.0, K, T, 0.03, sigma))
+
+    iv, ok = implied_vol(price, 100.0, K, T, 0.03, option=is_call)
+    # seuls les contrats avec une valeur temps non nulle sont inversibles
+    intrinsic = np.where(is_call, 100.0 - K * np.exp(-0.03 * T), K * np.exp(-0.03 * T) - 100.0)
+    informative = price - np.maximum(intrinsic, 0.0) > 1e-6
+    assert ok[informative].all()
+    repriced = np.where(is_call, bs_call(100.0, K, T, 0.03, iv), bs_put(100.0, K, T, 0.03, iv))
+    assert np.max(np.abs(repriced - price)[informative]) < 1e-9
+    assert np.max(np.abs(iv - sigma)[informative & (T > 0.1)]) < 1e-4
+
+
+def test_implied_vol_flags_arbitrage_and_scalar_wrapper():
+    iv, ok = implied_vol(np.array([120.0, 10.0]), 100.0, 100.0, 1.0, 0.0)
+    assert np.isnan(iv[0]) and not ok[0]
+    assert ok[1]
+    sig, res = fit_bs_vol_to_call_price(100.0, 100.0, 1.0, 0.01, bs_call(100.0, 100.0, 1.0, 0.01, 0.3))
+    assert abs(sig - 0.3) < 1e-10 and res.success
+    sig, res = fit_bs_vol_to_call_price(100.0, 100.0, 1.0, 0.01, bs_call(100.0, 100.0, 1.0, 0.01, 0.3), sigma0=1.5)
+    assert abs(sig - 0.3) < 1e-10 and res.success
+    sig, res = fit_bs_vol_to_call_price(100.0, 100.0, 1.0, 0.0, 120.0, sigma0=0.25)
+    assert sig == 0.25 and not res.success
@@ -0,0 +1,33 @@
+import instrumentation
+from models.gbm import GBM
+from pricing.monte_carlo import mc_price_european
+from src.utils import timer
+
+
+def test_hooks_record_timings_and_counters_only_when_enabled():
+    model = GBM(0.02, 0.2, 100.0)
+    instrumentation.reset()
+    instrumentation.disable()
+    mc_price_european(model, 100.0, 1.0, 0.02, 1000, random_state=0)
+    assert instrumentation.report() == {"counters": {}, "timings": {}}
+
+    instrumentation.enable()
+    try:
+        for _ in range(3):
+            mc_price_european(model, 100.0, 1.0, 0.02, 1000, random_state=0)
+        with instrumentation.timed("bloc"):
+            instrumentation.count("evenements", 2)
+        rep = instrumentation.report()
+    finally:
+        instrumentation.disable()
+        instrumentation.reset()
+    assert rep["counters"] == {"mc.paths": 3000, "evenements": 2}
+    stats = rep["timings"]["pricing.mc_price_european"]
+    assert stats["calls"] == 3 and 0 < stats["min"] <= stats["mean"] <= stats["max"]
+    assert rep["timings"]["bloc"]["calls"] == 1
+
+
+def test_utils_timer(capsys):
+    with timer("simulation"):
+        pass
+    assert capsys.readouterr().out.startswith("[simulation] ")
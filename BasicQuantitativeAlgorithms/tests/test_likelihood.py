@@ -0,0 +1,80 @@
+from functools import partial
+
+import numpy as np
+import pytest
+from calibration.likelihood import gbm_mle_from_prices, log_likelihood, negative_log_likelihood
+from calibration.optimization import calibrate_model
+
+
+def _ragged_prices(n_series=20, seed=0):
+    rng = np.random.default_rng(seed)
+    lengths = rng.integers(50, 300, n_series)
+    prices = np.full((n_series, lengths.max()), np.nan)
+    for i, n in enumerate(lengths):
+        lr = rng.normal(0.0004, 0.005 + 0.01 * rng.random(), n - 1)
+        prices[i, :n] = 100.0 * np.exp(np.concatenate([[0.0], np.cumsum(lr)]))
+    return prices, lengths
+
+
+def test_batched_likelihood_and_mle_match_per_series():
+    prices, lengths = _ragged_prices()
+    R = np.diff(np.log(prices), axis=-1)
+    theta = np.column_stack([np.full(len(lengths), 1e-4), np.linspace(0.005, 0.02, len(lengths))])
+    ll = log_likelihood(theta, R)
+    mu, sigma = gbm_mle_from_prices(prices, 1 / 252)
+    for i, n in enumerate(lengths):
+        assert np.isclose(ll[i], log_likelihood(theta[i], R[i, :n - 1]))
+        assert np.allclose((mu[i], sigma[i]), gbm_mle_from_prices(prices[i, :n], 1 / 252))
+    # plusieurs theta sur une même série
+    grid = np.stack(np.meshgrid([0.0, 1e-3], [0.01, 0.02], indexing="ij"), axis=-1)
+    assert log_likelihood(grid, R[0]).shape == (2, 2)
+    assert log_likelihood((0.0, -1.0), R[0, :10]) == -np.inf
+
+
+def test_analytic_gradient_hessian_and_standard_errors():
+    R = np.random.default_rng(1).normal(1e-3, 0.02, 400)
+    theta = np.array([2e-3, 0.018])
+    _, grad, hess = log_likelihood(theta, R, derivatives=True)
+    h = 1e-6
+    for k in range(2):
+        e = np.zeros(2)
+        e[k] = h
+        fd = (log_likelihood(theta + e, R) - log_likelihood(theta - e, R)) / (2 * h)
+        fd_g = (log_likelihood(theta + e, R, True)[1] - log_likelihood(theta - e, R, True)[1]) / (2 * h)
+        assert np.isclose(grad[k], fd, rtol=1e-5)
+        assert np.allclose(hess[:, k], fd_g, rtol=1e-5)
+
+    prices = 100.0 * np.exp(np.concatenate([[0.0], np.cumsum(R)]))
+    mu, sigma, se_mu, se_sigma = gbm_mle_from_prices(prices, 1 / 252, return_se=True)
+    assert np.isclose(se_sigma, sigma / np.sqrt(2 * R.size))
+
+
+def test_calibrate_model_batch_mode_with_gradients():
+    prices, _ = _ragged_prices(50, seed=2)
+    R = np.diff(np.log(prices), axis=-1)
+    mu, sigma = gbm_mle_from_prices(prices, 1.0)
+    objective = partial(negative_log_likelihood, log_returns=R, jac=True)
+    theta, res = calibrate_model(objective, np.tile([0.0, 0.02], (50, 1)), jac=True, batch=True,
+                                 bounds=[(None, None), (1e-6, None)])
+    assert theta.shape == (50, 2) and res.fun_per_series.shape == (50,)
+    assert np.allclose(theta[:, 0], mu, atol=1e-6)
+    assert np.allclose(theta[:, 1], sigma, rtol=1e-5)
+    assert res.success and res.success_per_series.all()
+
+
+def test_calibrate_model_batch_excludes_empty_series_and_wraps_jac():
+    R = 0.01 * np.random.default_rng(3).standard_normal((5, 300))
+    R[2] = np.nan                                   # série entièrement vide
+    prices = np.exp(np.concatenate([np.zeros((5, 1)), np.cumsum(R, axis=1)], axis=1))
+    mu, sigma = gbm_mle_from_prices(prices, 1.0)
+    bounds = [(None, None), (1e-6, None)]
+    theta0 = np.tile([0.0, 0.02], (5, 1))
+    objective = partial(negative_log_likelihood, log_returns=R)
+    for jac in (None, lambda th: -log_likelihood(th, R, derivatives=True)[1]):
+        theta, res = calibrate_model(objective, theta0, jac=jac, batch=True, bounds=bounds)
+        assert res.success and list(res.excluded) == [False, False, True, False, False]
+        assert np.all(np.isnan(theta[2])) and np.isnan(res.fun_per_series[2])
+        keep = ~res.excluded
+        assert np.allclose(theta[keep], np.column_stack([mu, sigma])[keep], rtol=1e-5, atol=1e-6)
+    with pytest.raises(ValueError):
+        calibrate_model(objective, theta0, method="Nelder-Mead", batch=True)
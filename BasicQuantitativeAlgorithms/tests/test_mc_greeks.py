@@ -0,0 +1,53 @@
+import numpy as np
+from models.gbm import GBM
+from models.heston import Heston
+from models.variance_gamma import VarianceGamma
+from pricing.fourier import cos_price
+from pricing.greeks import bs_greeks, mc_greeks
+
+HESTON = dict(kappa=1.5, theta=0.04, xi=0.9, rho=-0.7, v0=0.04)
+
+
+def test_gbm_pathwise_and_lr_greeks_match_black_scholes():
+    for payoff in ("call", "put"):
+        g = mc_greeks(GBM(0.03, 0.2, 100.0), 105.0, 1.0, 0.03, 200_000, payoff=payoff,
+                      random_state=1, chunk_size=50_000)
+        ref = bs_greeks(100.0, 105.0, 1.0, 0.03, 0.2, payoff)
+        for name in ("delta", "gamma", "vega"):
+            assert abs(g[name] - ref[name]) < 4 * g["std_error"][name]
+
+
+def test_heston_conditional_greeks_match_cos_finite_differences():
+    model = Heston(**HESTON, S0=100.0, scheme="qe")
+    g = mc_greeks(model, 100.0, 1.0, 0.0, 50_000, N=100, random_state=2)
+    assert abs(g["price"] - cos_price(model, 100.0, 1.0, 0.0)) < 0.05
+    eps = 1e-2
+    delta = (cos_price(model, 100.0, 1.0, 0.0, S0=100.0 + eps)
+             - cos_price(model, 100.0, 1.0, 0.0, S0=100.0 - eps)) / (2 * eps)
+    assert abs(g["delta"] - delta) < 0.01
+    for name in ("kappa", "theta", "xi", "rho", "v0"):
+        up, dn = dict(HESTON), dict(HESTON)
+        up[name] *= 1 + 1e-4
+        dn[name] *= 1 - 1e-4
+        ref = (cos_price(Heston(**up, S0=100.0), 100.0, 1.0, 0.0)
+               - cos_price(Heston(**dn, S0=100.0), 100.0, 1.0, 0.0)) / (up[name] - dn[name])
+        assert abs(g["d_" + name] - ref) < 0.1 * abs(ref)
+    assert "kappa" not in g and "theta" not in g
+
+
+def test_variance_gamma_conditional_price_and_delta():
+    model = VarianceGamma(theta=-0.1, sigma=0.2, nu=0.3, S0=100.0)
+    g = mc_greeks(model, 100.0, 1.0, 0.02, 100_000, random_state=3)
+    # loi de simulate : S0 e^{X_T}, sans correction de martingale
+    ST = model.simulate_terminal(1.0, 1, 400_000, random_state=4)
+    assert abs(g["price"] - np.exp(-0.02) * np.maximum(ST - 100.0, 0.0).mean()) < 0.05
+    # prix homogène de degré 1 en (S0, K) : Delta = (V − K dV/dK) / S0
+    dV_dK = -np.exp(-0.02) * np.mean(ST > 100.0)
+    assert abs(g["delta"] - (g["price"] - 100.0 * dV_dK) / 100.0) < 0.01
+
+
+def test_dispatch_accepts_models_imported_through_src_package():
+    from src.models import GBM as PackageGBM
+    g = mc_greeks(PackageGBM(0.02, 0.2, 100.0), 100.0, 1.0, 0.02, 10_000, random_state=5)
+    ref = mc_greeks(GBM(0.02, 0.2, 100.0), 100.0, 1.0, 0.02, 10_000, random_state=5)
+    assert g["delta"] == ref["delta"]
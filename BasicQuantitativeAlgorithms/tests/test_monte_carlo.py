@@ -0,0 +1,100 @@
+import pytest
+import numpy as np
+from models.gbm import GBM
+from models.heston import Heston
+from models.variance_gamma import VarianceGamma
+from pricing.black_scholes import bs_call
+from pricing.fourier import cos_price
+from pricing.monte_carlo import mc_price_european
+from stats import RunningMoments
+
+
+def test_terminal_matches_full_paths():
+    model = Heston(kappa=2.0, theta=0.04, xi=0.5, rho=-0.7, v0=0.04, S0=100.0, mu=0.01)
+    _, S = model.simulate(T=1.0, N=50, M=1000, random_state=3)
+    ST = model.simulate_terminal(T=1.0, N=50, M=1000, random_state=3)
+    assert np.allclose(S[:, -1], ST, rtol=1e-12)
+
+    # VG : S_T tiré directement dans la loi à un pas, même loi que les chemins
+    model = VarianceGamma(theta=-0.1, sigma=0.2, nu=0.3, S0=100.0)
+    _, S = model.simulate(T=1.0, N=50, M=100_000, random_state=3)
+    ST = model.simulate_terminal(T=1.0, N=50, M=100_000, random_state=4)
+    for q in (0.05, 0.5, 0.95):
+        assert abs(np.quantile(S[:, -1], q) - np.quantile(ST, q)) < 0.5
+
+
+def test_running_moments_merge_matches_numpy():
+    x = np.random.default_rng(0).normal(3.0, 2.0, size=10_001)
+    acc = RunningMoments()
+    for block in np.array_split(x, 7):
+        acc.update(block)
+    assert acc.n == x.size
+    assert abs(acc.mean - x.mean()) < 1e-12
+    assert abs(acc.var(ddof=1) - x.var(ddof=1)) < 1e-10
+
+
+def test_chunked_mc_price_is_close_to_black_scholes():
+    model = GBM(mu=0.02, sigma=0.2, S0=100.0)
+    price, ci = mc_price_european(model, K=100.0, T=1.0, r=0.02, M=200_000,
+                                  random_state=1, chunk_size=30_000)
+    assert abs(price - bs_call(100.0, 100.0, 1.0, 0.02, 0.2)) < 2 * ci
+
+
+def test_antithetic_pairs_and_variance_reduction():
+    model = GBM(mu=0.03, sigma=0.25, S0=100.0)
+    _, S = model.simulate(T=1.0, N=10, M=6, random_state=0, antithetic=True)
+    log_incr = np.log(S[:, 1:] / S[:, :-1]) - (0.03 - 0.5 * 0.25 ** 2) * 0.1
+    assert np.allclose(log_incr[:3], -log_incr[3:])
+
+    ref = bs_call(100.0, 100.0, 1.0, 0.03, 0.25)
+    _, _, plain = mc_price_european(model, 100.0, 1.0, 0.03, 100_000, antithetic=False,
+                                    random_state=2, full_output=True)
+    price, ci, info = mc_price_european(model, 100.0, 1.0, 0.03, 100_000, antithetic=True,
+                                        control_variate=True, random_state=2, full_output=True,
+                                        chunk_size=25_000)
+    assert abs(plain["vr_factor"] - 1.0) < 1e-9
+    assert info["vr_factor"] > 4.0
+    assert abs(price - ref) < 3 * info["std_error"]
+
+
+def test_moment_matching_heston():
+    model = Heston(kappa=1.5, theta=0.04, xi=0.3, rho=-0.5, v0=0.04, S0=100.0, mu=0.02)
+    price, ci, info = mc_price_european(model, 100.0, 1.0, 0.02, 20_000, N=50, random_state=5,
+                                        moment_matching=True, control_variate=True,
+                                        full_output=True)
+    assert info["vr_factor"] > 1.0 and ci > 0
+
+
+def test_brownian_bridge_and_randomized_qmc():
+    from models.qmc import brownian_bridge, sobol_normal
+
+    t = np.linspace(0.0, 2.0, 11)
+    W = brownian_bridge(sobol_normal(4096, 10, random_state=0), t)
+    assert np.allclose(W.var(axis=0), t, atol=0.05)
+
+    model = GBM(mu=0.02, sigma=0.2, S0=100.0)
+    ref = bs_call(100.0, 100.0, 1.0, 0.02, 0.2)
+    price, ci, info = mc_price_european(model, 100.0, 1.0, 0.02, 2 ** 14, N=16, random_state=4,
+                                        sampler="sobol", full_output=True)
+    assert abs(price - ref) < 3 * info["std_error"]
+    assert info["vr_factor"] > 20.0
+
+
+def test_variance_gamma_samplers_and_martingale_drift():
+    r, T = 0.03, 1.0
+    for sampler in ("gamma", "dog"):
+        model = VarianceGamma(theta=-0.14, sigma=0.12, nu=0.2, S0=100.0, mu=r)
+        ST = model.simulate_terminal(T, 1, 400_000, random_state=5, sampler=sampler)
+        assert abs(ST.mean() / (100.0 * np.exp(r * T)) - 1.0) < 2e-3
+        lr = np.log(ST / 100.0) - model.drift * T
+        assert abs(lr.var() - (0.12 ** 2 + 0.14 ** 2 * 0.2) * T) < 2e-4
+        t, S = model.simulate(T, 20, 50_000, random_state=6, sampler=sampler)
+        assert abs(S[:, 10].mean() / (100.0 * np.exp(r * t[10])) - 1.0) < 3e-3
+    price, ci = mc_price_european(model, K=100.0, T=T, r=r, M=200_000, random_state=7)
+    assert abs(price - cos_price(model, 100.0, T, r)) < 2 * ci
+    # échantillonneur VG transmis au modèle, hors chemin QMC
+    price, ci, info = mc_price_european(model, K=100.0, T=T, r=r, M=200_000, random_state=7, sampler="dog",
+                                        antithetic=False, chunk_size=None, full_output=True)
+    assert info["n_paths"] == 200_000 and abs(price - cos_price(model, 100.0, T, r)) < 2 * ci
+    with pytest.raises(ValueError):
+        mc_price_european(model, K=100.0, T=T, r=r, M=1000, sampler="halton")
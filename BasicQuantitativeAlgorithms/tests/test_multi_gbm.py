@@ -0,0 +1,45 @@
+import numpy as np
+from scipy.stats import norm
+from models.multi_gbm import MultiAssetGBM
+from pricing.basket import mc_price_basket
+
+
+def test_multi_asset_paths_shapes_and_correlation():
+    corr = np.array([[1.0, 0.6, -0.2], [0.6, 1.0, 0.1], [-0.2, 0.1, 1.0]])
+    model = MultiAssetGBM([0.01, 0.02, 0.03], [0.2, 0.3, 0.1], [100.0, 50.0, 10.0], corr=corr,
+                          dtype=np.float32)
+    t, S = model.simulate(T=1.0, N=20, M=20_000, random_state=0)
+    assert S.shape == (20_000, 21, 3) and S.dtype == np.float32
+    assert np.allclose(S[:, 0], model.S0)
+    dlog = np.diff(np.log(S.astype(float)), axis=1).reshape(-1, 3)
+    assert np.allclose(np.corrcoef(dlog, rowvar=False), corr, atol=0.01)
+
+    B = np.random.default_rng(1).uniform(-0.5, 0.5, size=(200, 3))
+    factor = MultiAssetGBM(0.0, 0.2, np.full(200, 100.0), loadings=B)
+    ST = factor.simulate_terminal(T=1.0, N=1, M=50_000, random_state=2)
+    emp = np.corrcoef(np.log(ST[:, :5]), rowvar=False)
+    assert np.allclose(emp, factor.corr[:5, :5], atol=0.02)
+
+
+def test_spread_with_zero_strike_matches_margrabe():
+    s1, s2, rho, T, r = 0.25, 0.2, 0.4, 1.0, 0.03
+    model = MultiAssetGBM(r, [s1, s2], [100.0, 95.0], corr=[[1.0, rho], [rho, 1.0]])
+    price, ci = mc_price_basket(model, K=0.0, T=T, r=r, M=400_000, weights=[1.0, -1.0],
+                                random_state=3, chunk_size=50_000)
+    vol = np.sqrt(s1 ** 2 + s2 ** 2 - 2 * rho * s1 * s2)
+    d1 = (np.log(100.0 / 95.0) + 0.5 * vol ** 2 * T) / (vol * np.sqrt(T))
+    ref = 100.0 * norm.cdf(d1) - 95.0 * norm.cdf(d1 - vol * np.sqrt(T))
+    assert abs(price - ref) < max(2 * ci, 1e-3)
+
+
+def test_simulate_peak_memory_close_to_output():
+    import tracemalloc
+    d = 4
+    model = MultiAssetGBM(0.05, 0.2, np.full(d, 100.0), loadings=np.full((d, 2), 0.4))
+    tracemalloc.start()
+    try:
+        _, S = model.simulate(1.0, 100, 20_000, random_state=1)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    assert peak < 1.3 * S.nbytes
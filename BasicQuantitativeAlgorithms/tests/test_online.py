@@ -0,0 +1,83 @@
+import numpy as np
+from stats import RunningMoments, rolling_moments, var_cvar
+from calibration.likelihood import OnlineGBMMLE, gbm_mle_from_prices, rolling_gbm_mle
+from calibration.moments import empirical_moments
+from risk.var import RollingVaR, var_cvar_from_prices, rolling_var_cvar_from_prices
+
+
+def _prices(n=3000, seed=0):
+    rng = np.random.default_rng(seed)
+    return 100.0 * np.exp(np.cumsum(rng.standard_t(4, size=n) * 0.01))
+
+
+def test_running_moments_push_and_merge_match_batch():
+    x = np.diff(np.log(_prices()))
+    pushed = RunningMoments()
+    for xi in x:
+        pushed.push(xi)
+    merged = RunningMoments()
+    for block in np.array_split(x, 9):
+        merged.update(block)
+    ref = empirical_moments(x)
+    assert np.allclose(pushed.moments(), ref, rtol=1e-9, atol=1e-14)
+    assert np.allclose(merged.moments(), ref, rtol=1e-9, atol=1e-14)
+
+    mean, var, skew, kurt = rolling_moments(x, 250)
+    assert np.allclose([mean[-1], var[-1], skew[-1], kurt[-1]], empirical_moments(x[-250:]),
+                       rtol=1e-6, atol=1e-12)
+
+
+def test_online_and_rolling_gbm_mle():
+    prices = _prices()
+    online = OnlineGBMMLE(dt=1 / 252)
+    for p in prices[:1000]:
+        online.update(p)
+    online.update_many(prices[1000:])
+    assert np.allclose(online.estimate(), gbm_mle_from_prices(prices, 1 / 252), rtol=1e-9)
+
+    mu, sigma = rolling_gbm_mle(prices, 500, 1 / 252)
+    assert np.allclose((mu[10], sigma[10]), gbm_mle_from_prices(prices[10:511], 1 / 252), rtol=1e-6)
+
+
+def test_sliding_window_var_cvar():
+    prices = _prices(800)
+    window = 250
+    rolling = RollingVaR(window, alpha=0.99)
+    q_vec, c_vec = rolling_var_cvar_from_prices(prices, window, alpha=0.99)
+    for i, p in enumerate(prices):
+        rolling.update(p)
+        if i >= window and i % 97 == 0:
+            ref = var_cvar_from_prices(prices[i - window:i + 1], alpha=0.99)
+            assert np.allclose(rolling.var_cvar(), ref, rtol=1e-12)
+            assert np.allclose((q_vec[i - window], c_vec[i - window]), ref, rtol=1e-12)
+    rets = np.diff(np.log(prices))
+    assert np.allclose((q_vec[0], c_vec[0]), var_cvar(rets[:window], 0.99))
+
+    # nombreux ex aequo (rendements arrondis), fenêtre en cours de remplissage puis pleine
+    x = np.round(np.random.default_rng(1).standard_normal(1500), 1)
+    rolling = RollingVaR(120, alpha=0.95)
+    for i, xi in enumerate(x):
+        rolling.push_return(xi)
+        assert np.allclose(rolling.var_cvar(), var_cvar(x[max(0, i - 119):i + 1], 0.95), rtol=1e-12)
+
+
+def test_rolling_var_matches_var_cvar_on_random_windows_and_alphas():
+    rng = np.random.default_rng(7)
+    for seed in range(10):
+        r = np.random.default_rng(seed)
+        window = int(r.integers(2, 40))
+        alpha = float(r.uniform(0.5, 0.999))
+        # rendements arrondis au tick : nombreux ex aequo
+        x = np.round(r.standard_t(3, 400) * 0.01, int(rng.integers(2, 5)))
+        rolling = RollingVaR(window, alpha=alpha)
+        for i, xi in enumerate(x):
+            rolling.push_return(xi)
+            ref = var_cvar(x[max(0, i - window + 1):i + 1], alpha)
+            assert np.allclose(rolling.var_cvar(), ref, rtol=1e-12, atol=0.0)
+    # (n − 1)(1 − alpha) juste sous un entier (n = 6, 11, 16 pour alpha = 0.8)
+    for seed in range(10):
+        x = np.random.default_rng(seed).standard_normal(200)
+        rolling = RollingVaR(20, alpha=0.8)
+        for i, xi in enumerate(x):
+            rolling.push_return(xi)
+            assert np.allclose(rolling.var_cvar(), var_cvar(x[max(0, i - 19):i + 1], 0.8), rtol=1e-12)
@@ -0,0 +1,27 @@
+import numpy as np
+from models.gbm import GBM
+from models.heston import Heston
+from parallel import parallel_simulate
+from pricing.monte_carlo import mc_price_european
+from utils import RNG
+
+
+def test_results_independent_of_worker_count():
+    model = Heston(kappa=2.0, theta=0.04, xi=0.4, rho=-0.6, v0=0.04, S0=100.0)
+    ref = mc_price_european(model, 100.0, 1.0, 0.0, 4000, N=20, random_state=11, chunk_size=1000)
+    for n_workers in (2, 4):
+        assert mc_price_european(model, 100.0, 1.0, 0.0, 4000, N=20, random_state=11,
+                                 chunk_size=1000, n_workers=n_workers) == ref
+
+    gbm = GBM(mu=0.05, sigma=0.2, S0=100.0)
+    t, S1 = parallel_simulate(gbm, 1.0, 12, 5000, block_size=1500, random_state=3, n_workers=1)
+    _, S3 = parallel_simulate(gbm, 1.0, 12, 5000, block_size=1500, random_state=3, n_workers=3)
+    chunks = [S for _, S in gbm.simulate_chunks(1.0, 12, 5000, chunk_size=1500, random_state=3)]
+    assert np.array_equal(S1, S3) and np.array_equal(S1, np.concatenate(chunks))
+
+
+def test_rng_wrapper_spawns_independent_streams():
+    rng = RNG(7)
+    a, b = rng.spawn(2)
+    assert not np.allclose(a.normal(size=5), b.normal(size=5))
+    assert np.array_equal(RNG(7).normal(size=3), RNG(7).normal(size=3))
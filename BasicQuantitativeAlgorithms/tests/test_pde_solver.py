@@ -0,0 +1,27 @@
+import numpy as np
+from pricing.black_scholes import bs_call, bs_put
+from pricing.pde_solver import crank_nicolson_bs
+
+
+def test_crank_nicolson_matches_black_scholes():
+    for option, ref in (("call", bs_call), ("put", bs_put)):
+        S, V = crank_nicolson_bs(400.0, 100.0, 1.0, 0.02, 0.2, M_S=400, M_T=400, option=option)
+        assert abs(np.interp(100.0, S, V) - ref(100.0, 100.0, 1.0, 0.02, 0.2)) < 1e-2
+
+
+def test_batch_strike_ladder_matches_black_scholes():
+    from pricing.greeks import bs_greeks
+    from pricing.pde_solver import crank_nicolson_bs_batch
+
+    K = np.array([80.0, 90.0, 100.0, 110.0, 120.0, 100.0])
+    option = np.array(["call"] * 5 + ["put"])
+    spots = np.array([95.0, 100.0, 105.0])
+    out = crank_nicolson_bs_batch(spots, K, 1.0, 0.02, 0.2, option=option, M_S=300, M_T=100)
+    assert out["price"].shape == (6, 3)
+    for p in range(K.size):
+        payoff = option[p]
+        ref = (bs_call if payoff == "call" else bs_put)(spots, K[p], 1.0, 0.02, 0.2)
+        g = bs_greeks(spots, K[p], 1.0, 0.02, 0.2, payoff=payoff)
+        assert np.max(np.abs(out["price"][p] - ref)) < 5e-3
+        assert np.max(np.abs(out["delta"][p] - g["delta"])) < 1e-3
+        assert np.max(np.abs(out["gamma"][p] - g["gamma"])) < 1e-3
@@ -0,0 +1,44 @@
+import numpy as np
+from models.gbm import GBM
+from pricing.black_scholes import bs_call, bs_put
+from risk.portfolio import iman_conover, portfolio_var_cvar
+from scipy.stats import spearmanr
+
+
+def _book(n=300, seed=1):
+    rng = np.random.default_rng(seed)
+    return {"asset": rng.integers(0, 2, n), "K": rng.uniform(80, 120, n), "T": rng.uniform(0.2, 1.0, n),
+            "sigma": rng.uniform(0.15, 0.3, n), "quantity": rng.normal(0, 10, n),
+            "option": rng.choice(["call", "put"], n)}
+
+
+def test_iman_conover_keeps_marginals_and_sets_rank_correlation():
+    rng = np.random.default_rng(0)
+    X = np.column_stack([rng.lognormal(size=20_000), rng.exponential(size=20_000)])
+    corr = np.array([[1.0, 0.7], [0.7, 1.0]])
+    Y = iman_conover(X, corr, random_state=1)
+    assert np.array_equal(np.sort(Y, axis=0), np.sort(X, axis=0))
+    assert abs(spearmanr(Y[:, 0], Y[:, 1])[0] - 0.7) < 0.02
+
+
+def test_portfolio_var_cvar_full_revaluation():
+    models = [GBM(0.05, 0.2, 100.0), GBM(0.02, 0.3, 100.0)]
+    book, r, h = _book(), 0.01, 10 / 252
+    corr = np.array([[1.0, 0.5], [0.5, 1.0]])
+    res = portfolio_var_cvar(models, book, h, r, M=4000, corr=corr, random_state=3, max_elements=50_000)
+    assert res["cvar"] <= res["var"]
+    assert np.isclose(res["contributions"].sum(), res["cvar"])
+
+    # référence directe : revalorisation position par position, en une passe
+    S = res["scenarios"][:, book["asset"]]
+    S0 = 100.0
+    ref = np.zeros(4000)
+    for i in range(len(book["K"])):
+        f = bs_call if book["option"][i] == "call" else bs_put
+        args = (book["K"][i], book["T"][i], r, book["sigma"][i])
+        ref += book["quantity"][i] * (f(S[:, i], args[0], args[1] - h, r, args[3]) - f(S0, *args))
+    assert np.allclose(res["pnl"], ref)
+
+    dg = portfolio_var_cvar(models, book, h, r, M=4000, corr=corr, random_state=3, method="delta_gamma")
+    assert np.isclose(dg["contributions"].sum(), dg["cvar"])
+    assert abs(dg["var"] - res["var"]) < 0.1 * abs(res["var"])
@@ -0,0 +1,49 @@
+import numpy as np
+from src.simulation import simulate_gbm
+
+
+def test_seed_is_honored_in_every_branch():
+    for method in ("exact", "euler", "milstein"):
+        _, S1 = simulate_gbm(0.05, 0.2, 100.0, 1.0, 50, 100, method=method, random_state=7)
+        _, S2 = simulate_gbm(0.05, 0.2, 100.0, 1.0, 50, 100, method=method, random_state=7)
+        assert np.array_equal(S1, S2)
+
+
+def test_vectorized_euler_matches_step_loop_and_milstein_converges():
+    mu, sigma, S0, T, N, M = 0.05, 0.3, 100.0, 1.0, 64, 500
+    _, S = simulate_gbm(mu, sigma, S0, T, N, M, method="euler", random_state=3)
+    rng = np.random.default_rng(3)
+    ref = np.full(M, S0)
+    for k in range(N):
+        ref = ref * (1.0 + mu * T / N + sigma * rng.normal(0.0, np.sqrt(T / N), size=M))
+        assert np.allclose(S[:, k + 1], ref, rtol=1e-12)
+
+    # erreur forte contre la solution exacte sur le même brownien
+    dW = np.random.default_rng(3).normal(0.0, np.sqrt(T / N), size=(N, M)).T
+    exact = S0 * np.exp((mu - 0.5 * sigma ** 2) * T + sigma * dW.sum(axis=1))
+    _, S_mil = simulate_gbm(mu, sigma, S0, T, N, M, method="milstein", random_state=3)
+    err_euler = np.mean(np.abs(S[:, -1] - exact))
+    err_mil = np.mean(np.abs(S_mil[:, -1] - exact))
+    assert err_mil < 0.5 * err_euler
+
+    # float32 : normales tirées en float32, même schéma qu'en float64
+    _, S32 = simulate_gbm(mu, sigma, S0, T, N, M, method="milstein", random_state=3, dtype=np.float32)
+    Z = np.random.default_rng(3).standard_normal((N, M), dtype=np.float32).astype(float).T
+    dW = np.sqrt(T / N) * Z
+    ref = S0 * np.cumprod(1.0 + mu * T / N + sigma * dW + 0.5 * sigma ** 2 * (dW ** 2 - T / N), axis=1)
+    assert S32.dtype == np.float32 and np.allclose(S32[:, 1:], ref, rtol=1e-4)
+
+
+def test_float32_halves_peak_memory():
+    import tracemalloc
+    peaks = {}
+    for method in ("exact", "euler"):
+        for dtype in (np.float64, np.float32):
+            tracemalloc.start()
+            try:
+                _, S = simulate_gbm(0.05, 0.2, 100.0, 1.0, 252, 20_000, method=method, random_state=1, dtype=dtype)
+                peaks[method, dtype] = tracemalloc.get_traced_memory()[1]
+            finally:
+                tracemalloc.stop()
+            assert S.dtype == dtype and peaks[method, dtype] - S.nbytes < 2 ** 24   # blocs bornés
+        assert peaks[method, np.float32] < 0.65 * peaks[method, np.float64]